@@ -1,8 +1,8 @@
-from importlib import import_module
 from typing import Tuple, TypeVar
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser
+from django.utils.module_loading import import_string
 from django.utils.translation import gettext_lazy as _
 from oauth2_provider.contrib.rest_framework import OAuth2Authentication
 from oauth2_provider.oauth2_backends import get_oauthlib_core
@@ -27,7 +27,17 @@ class OAuth2Authentication(OAuth2Authentication, AuthMixin):
 
     def authenticate(self, request):
         """Returns two-tuple of (user, token) if authentication succeeds, or
-        None otherwise."""
+        None otherwise.
+
+        Tokens validated by oauthlib are cached for a short time, so
+        repeated calls with the same token skip the token and company
+        allowlist queries.
+        """
+        access_token = self.get_cached_token(request)
+        if access_token:
+            self.set_section(access_token.user, access_token)
+            return access_token.user, access_token
+
         oauthlib_core = get_oauthlib_core()
 
         # Adding default scope for
@@ -35,11 +45,23 @@ class OAuth2Authentication(OAuth2Authentication, AuthMixin):
             request, scopes=[settings.OAUTH2_PROVIDER_AUTH_SCOPE]
         )
         if valid:
+            r.access_token.cache_state()
             self.set_section(r.user, r.access_token)
             return r.user, r.access_token
         request.oauth2_error = getattr(r, "oauth2_error", {})
         return None
 
+    @staticmethod
+    def get_cached_token(request):
+        """Returns the cached access token of the bearer token in the
+        request, if any."""
+        from v1.oauth.models import ClientAccessToken
+
+        auth = authentication.get_authorization_header(request).split()
+        if len(auth) != 2 or auth[0].lower() != b"bearer":
+            return None
+        return ClientAccessToken.from_cache(auth[1].decode(errors="ignore"))
+
 
 class JWTAuthentication(JWTAuthentication, AuthMixin):
     """
@@ -62,6 +84,23 @@ class CustomDynamicAuthentication(authentication.BaseAuthentication):
     authentication mechanism based on the `Auth-Type` header in the request.
     """
 
+    _auth_classes = None
+
+    @classmethod
+    def get_auth_classes(cls):
+        """
+        Returns the authentication classes of `AUTH_TYPE_CLASSES` by auth
+        type. The classes are imported once per process, on first use.
+        """
+        if cls._auth_classes is None:
+            cls._auth_classes = {
+                auth_type: import_string(auth_class_path)
+                for auth_type, auth_class_path in (
+                    settings.AUTH_TYPE_CLASSES.items()
+                )
+            }
+        return cls._auth_classes
+
     def get_auth_class(self, auth_type):
         """
         Retrieves the authentication class based on the provided auth type.
@@ -75,19 +114,12 @@ class CustomDynamicAuthentication(authentication.BaseAuthentication):
         Raises:
             AuthenticationFailed: If the provided auth type is not supported.
         """
-
-        # Get the authentication class path from settings
-        auth_class_path = settings.AUTH_TYPE_CLASSES.get(auth_type)
-        if not auth_class_path:
+        auth_class = self.get_auth_classes().get(auth_type)
+        if not auth_class:
             raise exceptions.AuthenticationFailed(
                 f"Unsupported authentication type: {auth_type}"
             )
-        # Split the path into module path and class name
-        module_path, class_name = auth_class_path.rsplit(".", 1)
-
-        # Import the module and get the class
-        module = import_module(module_path)
-        return getattr(module, class_name)
+        return auth_class
 
     def authenticate(self, request):
         """
@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.utils.translation import gettext_lazy as _
 from sentry_sdk import set_tag
 
@@ -67,6 +68,50 @@ def get_session_device():
     return get_from_local("device", None)
 
 
+def membership_cache_key(user_id):
+    """Returns the cache key of the session membership of a user."""
+    return f"session_membership:{user_id}"
+
+
+def get_session_membership(user):
+    """Returns the default entity and member type of a user.
+
+    The result is cached until the membership of the user changes, and is
+    only used while it matches the default entity of the user.
+
+    Returns:
+        dict: "entity_id" hashid and "member_type" of the membership.
+    """
+    from base.sso.settings import sso_settings
+    from v1.supply_chains.models.company_models import CompanyMember
+
+    key = membership_cache_key(user.pk)
+    membership = cache.get(key)
+    if membership and membership["entity_id"] == str(user.default_entity_id):
+        return membership
+
+    entity = user.get_default_entity()
+    if not entity:
+        raise exceptions.AuthenticationFailed(
+            _("User does not have access any Entities")
+        )
+    try:
+        entity_member = CompanyMember.objects.get(
+            company=entity, user=user, is_active=True
+        )
+    except CompanyMember.DoesNotExist:
+        raise exceptions.AuthenticationFailed(
+            _("Invalid Entity or User does not have access."),
+            "invalid_entity",
+        )
+    membership = {
+        "entity_id": entity.id.hashid,
+        "member_type": entity_member.type,
+    }
+    cache.set(key, membership, sso_settings.CACHE_TIMEOUT)
+    return membership
+
+
 class AuthMixin:
 
     def set_section(self, user, validated_token):
@@ -93,26 +138,11 @@ class AuthMixin:
                 "entity_id": validated_token.company_id,
             }
         elif self.__class__.__name__ == "SSOJWTAuthentication":
-            from v1.supply_chains.models.company_models import CompanyMember
-
-            entity = user.get_default_entity()
-            if not entity:
-                raise exceptions.AuthenticationFailed(
-                    _("User does not have access any Entities")
-                )
-            try:
-                entity_member = CompanyMember.objects.get(
-                    company=entity, user=user, is_active=True
-                )
-            except CompanyMember.DoesNotExist:
-                raise exceptions.AuthenticationFailed(
-                    _("Invalid Entity or User does not have access."),
-                    "invalid_entity",
-                )
+            membership = get_session_membership(user)
             session_data = {
                 "user_id": user.id.hashid,
-                "entity_id": entity.id.hashid,
-                "member_type": entity_member.type,
+                "entity_id": membership["entity_id"],
+                "member_type": membership["member_type"],
                 "device": validated_token["device"]
             }
 
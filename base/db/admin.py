@@ -1,9 +1,71 @@
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.admin.views import main
 from django.contrib.postgres import fields
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
 from django_extensions.db.fields import json
 from django_json_widget.widgets import JSONEditorWidget
 
 
+def estimate_count(queryset):
+    """Returns the number of rows of a queryset estimated by the query
+    planner, or None if the database is not PostgreSQL."""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator counting large querysets with the estimate of the query
+    planner instead of a COUNT(*) over the whole result.
+
+    The estimate is only used when `estimate` is set, for unfiltered
+    querysets whose estimate is close to the real count. Querysets
+    estimated to have fewer than ADMIN_EXACT_COUNT_LIMIT rows are counted
+    exactly.
+    """
+
+    def __init__(self, *args, estimate=True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.estimate = estimate
+
+    @cached_property
+    def count(self):
+        """Returns the estimated number of objects."""
+        if self.estimate and isinstance(self.object_list, QuerySet):
+            estimate = estimate_count(self.object_list)
+            if estimate and estimate >= settings.ADMIN_EXACT_COUNT_LIMIT:
+                return estimate
+        return super().count
+
+
+class CachedLookupsMixin:
+    """Mixin for list filters caching their options in the shared cache for
+    ADMIN_FILTER_CACHE_TIMEOUT seconds."""
+
+    def lookups(self, request, model_admin):
+        """Returns the cached options of the filter."""
+        key = (
+            f"admin_filter:{model_admin.opts.label_lower}:"
+            f"{self.parameter_name}"
+        )
+        lookups = super().lookups
+        return cache.get_or_set(
+            key,
+            lambda: list(lookups(request, model_admin)),
+            settings.ADMIN_FILTER_CACHE_TIMEOUT,
+        )
+
+
 class BaseAdmin(admin.ModelAdmin):
     """Base admin class for all models.
 
@@ -43,6 +105,48 @@ class BaseAdmin(admin.ModelAdmin):
         return queryset, use_distinct
 
 
+class LargeTableAdmin(BaseAdmin):
+    """Base admin class for models with millions of rows.
+
+    Unfiltered changelists are counted with the estimates of the query
+    planner, and the unfiltered total is not counted when filtering.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    # Changelist parameters which do not filter the rows.
+    UNFILTERED_PARAMS = {
+        main.ALL_VAR,
+        main.ORDER_VAR,
+        main.PAGE_VAR,
+        main.ERROR_FLAG,
+        main.IS_POPUP_VAR,
+        main.TO_FIELD_VAR,
+    }
+
+    def get_paginator(
+        self,
+        request,
+        queryset,
+        per_page,
+        orphans=0,
+        allow_empty_first_page=True,
+    ):
+        """Estimate the count only when the changelist is not filtered,
+        since the estimates of filtered queries can be far off."""
+        filtered = any(
+            param not in self.UNFILTERED_PARAMS for param in request.GET
+        )
+        return self.paginator(
+            queryset,
+            per_page,
+            orphans,
+            allow_empty_first_page,
+            estimate=not filtered,
+        )
+
+
 class ReadOnlyAdmin(admin.ModelAdmin):
     """Admin class for creating read-only views in the Django admin.
 
@@ -168,15 +168,16 @@ class SerializableRelatedField(serializers.PrimaryKeyRelatedField):
         super().__init__(**kwargs)
 
     def use_pk_only_optimization(self):
-        """Disable the primary key optimization.
+        """Use the primary key optimization unless a serializer is set.
 
-        By default, this field uses primary key optimization, which may not be
-        suitable for custom serialization. So, we disable it here.
+        Without a serializer only the key is rendered, which is read from
+        the foreign key column without loading the related object. A
+        serializer needs the related object.
 
         Returns:
-            False to disable primary key optimization.
+            True if the related object is not serialized.
         """
-        return False
+        return self.serializer is None
 
     def single_to_representation(self, value):
         """Convert a single related object to its serialized representation.
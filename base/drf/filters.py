@@ -0,0 +1,127 @@
+"""Filter sets shared by the apps."""
+import math
+
+from django.db.models import F
+from django.db.models import Q
+from django.db.models.functions import ASin
+from django.db.models.functions import Cos
+from django.db.models.functions import Power
+from django.db.models.functions import Radians
+from django.db.models.functions import Sin
+from django.db.models.functions import Sqrt
+from django_filters import rest_framework as filters
+from rest_framework.serializers import ValidationError
+
+from utilities import geo
+
+
+class GeoFilterSet(filters.FilterSet):
+    """A filter set with geographic filters on an indexed location, and
+    optionally an indexed area.
+
+    Filters:
+    - bbox: "min_lat,min_lon,max_lat,max_lon", locations within, or areas
+        intersecting, the box.
+    - near: "latitude,longitude,radius_km", locations within the radius.
+    - polygon: GeoJSON polygon, or JSON list of [longitude, latitude],
+        locations within the polygon.
+
+    Attributes:
+        geo_point_fields: Names of the geohash, latitude and longitude
+            fields of the location.
+        geo_area_fields: Names of the geohash and min latitude, min
+            longitude, max latitude and max longitude fields of the area,
+            or None.
+    """
+
+    geo_point_fields = ("geohash", "latitude", "longitude")
+    geo_area_fields = None
+
+    bbox = filters.CharFilter(method="bbox_filter")
+    near = filters.CharFilter(method="near_filter")
+    polygon = filters.CharFilter(method="polygon_filter")
+
+    @staticmethod
+    def parse(name, parser, value):
+        """Parse a filter value, raising a validation error if invalid."""
+        try:
+            return parser(value)
+        except (TypeError, ValueError, KeyError, IndexError):
+            raise ValidationError({name: "Invalid value."})
+
+    def point_q(self, bbox):
+        """Returns the filter of the locations within a bounding box."""
+        geohash, latitude, longitude = self.geo_point_fields
+        min_lat, min_lon, max_lat, max_lon = bbox
+        return geo.point_q(geohash, bbox) & Q(
+            **{
+                f"{latitude}__range": (min_lat, max_lat),
+                f"{longitude}__range": (min_lon, max_lon),
+            }
+        )
+
+    def area_q(self, bbox):
+        """Returns the filter of the areas intersecting a bounding box."""
+        (
+            geohash,
+            min_lat_f,
+            min_lon_f,
+            max_lat_f,
+            max_lon_f,
+        ) = self.geo_area_fields
+        min_lat, min_lon, max_lat, max_lon = bbox
+        return geo.area_q(geohash, bbox) & Q(
+            **{
+                f"{min_lat_f}__lte": max_lat,
+                f"{max_lat_f}__gte": min_lat,
+                f"{min_lon_f}__lte": max_lon,
+                f"{max_lon_f}__gte": min_lon,
+            }
+        )
+
+    def bbox_filter(self, queryset, name, value):
+        """Return queryset."""
+        bbox = self.parse(name, geo.parse_bbox, value)
+        query = self.point_q(bbox)
+        if self.geo_area_fields:
+            query |= self.area_q(bbox)
+        return queryset.filter(query)
+
+    def near_filter(self, queryset, name, value):
+        """Return queryset."""
+        lat, lon, radius = self.parse(name, geo.parse_radius, value)
+        _, latitude, longitude = self.geo_point_fields
+        lat1, lon1 = Radians(F(latitude)), Radians(F(longitude))
+        lat2, lon2 = math.radians(lat), math.radians(lon)
+        distance = (
+            2
+            * geo.EARTH_RADIUS_KM
+            * ASin(
+                Sqrt(
+                    Power(Sin((lat1 - lat2) / 2), 2)
+                    + Cos(lat1)
+                    * math.cos(lat2)
+                    * Power(Sin((lon1 - lon2) / 2), 2)
+                )
+            )
+        )
+        bbox = geo.radius_bbox(lat, lon, radius)
+        return (
+            queryset.filter(self.point_q(bbox))
+            .alias(geo_distance=distance)
+            .filter(geo_distance__lte=radius)
+        )
+
+    def polygon_filter(self, queryset, name, value):
+        """Return queryset."""
+        ring = self.parse(name, geo.parse_polygon, value)
+        _, latitude, longitude = self.geo_point_fields
+        candidates = queryset.filter(
+            self.point_q(geo.polygon_bbox(ring))
+        ).values_list("pk", latitude, longitude)
+        ids = [
+            pk
+            for pk, lat, lon in candidates
+            if geo.point_in_polygon(lon, lat, ring)
+        ]
+        return queryset.filter(pk__in=ids)
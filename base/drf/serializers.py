@@ -1,6 +1,7 @@
 """custom used Serializers are declared here."""
 from collections import defaultdict
 
+from django.core.exceptions import FieldDoesNotExist
 from django.db import models
 from rest_framework import serializers
 
@@ -12,16 +13,11 @@ class HashIDModelSerializer(serializers.ModelSerializer):
 
     id = fields.SerializableRelatedField(read_only=True)
     serializer_related_field = fields.SerializableRelatedField
-
-    def build_standard_field(self, field_name, model_field):
-        """Override the default field builder to use our custom field."""
-        self.serializer_field_mapping[
-            models.DateTimeField
-        ] = fields.UnixDateTimeField
-        self.serializer_field_mapping[
-            models.DecimalField
-        ] = fields.RoundingDecimalField
-        return super().build_standard_field(field_name, model_field)
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.DateTimeField: fields.UnixDateTimeField,
+        models.DecimalField: fields.RoundingDecimalField,
+    }
 
 
 class CircularSerializer(serializers.Serializer):
@@ -120,14 +116,22 @@ class DynamicModelSerializer(HashIDModelSerializer):
         (e.g., 'related_field.name').
     - `exclude_nested`: Specify the nested fields to exclude
         (e.g., 'related_field.id').
-    - `optimize`: A placeholder for potential optimization with
-        select_related and prefetch_related fields.
+    - `optimize`: Mark the serializer for queryset optimization, see
+        `optimize_queryset`. Can also be enabled with `optimize = True` in
+        the Meta class.
 
     Note:
     - You cannot use both `fields` and `exclude_fields` simultaneously.
     - You cannot use both `include_nested` and `exclude_nested` simultaneously.
+
+    The options are compiled once per (serializer class, options) into a
+    field plan, kept in `_field_plans`. Fields dropped by the plan are never
+    built, instead of being built and popped on every instantiation.
     """
 
+    _field_plans = {}
+    _query_plans = {}
+
     def __init__(self, *args, **kwargs):
         fields = kwargs.pop("fields", None)
         exclude_fields = kwargs.pop("exclude_fields", None)
@@ -145,86 +149,225 @@ class DynamicModelSerializer(HashIDModelSerializer):
         # Instantiate the superclass normally
         super(DynamicModelSerializer, self).__init__(*args, **kwargs)
 
-        if include_nested:
-            self.include_nested_fields(include_nested)
-        if exclude_nested:
-            self.exclude_nested_fields(exclude_nested)
+        self._field_rules = []
+        self._field_plan = None
+        if fields or exclude_fields or include_nested or exclude_nested:
+            self._field_plan = self.get_field_plan(
+                fields, exclude_fields, include_nested, exclude_nested
+            )
+            self.apply_field_plan(self._field_plan)
+
+        self.optimize = optimize or getattr(self.Meta, "optimize", False)
+
+    @classmethod
+    def get_field_plan(
+        cls, fields, exclude_fields, include_nested, exclude_nested
+    ):
+        """Return the cached field plan for the given options.
+
+        The plan maps the path of each serializer to prune, `()` being this
+        serializer, to an `(include, exclude)` pair of field name sets.
+        """
+        key = (
+            cls,
+            frozenset(fields or ()),
+            frozenset(exclude_fields or ()),
+            frozenset(include_nested or ()),
+            frozenset(exclude_nested or ()),
+        )
+        plan = cls._field_plans.get(key)
+        if plan is not None:
+            return plan
+
+        includes = defaultdict(set)
+        excludes = defaultdict(set)
         if fields:
-            self.include_direct_fields(fields)
+            includes[()].update(fields)
         if exclude_fields:
-            self.exclude_direct_fields(exclude_fields)
-
-        if optimize:
-            # TODO: Optimize with select_related and prefetch_related fields.
-            pass
-
-    def find_nth_serializer(self, first_depth, nested_fields):
-        """To find the last nested serializer."""
-        last_serializer = self.fields.get(first_depth)
-        for _field in nested_fields:
-            last_serializer = last_serializer.fields.get(_field)
-        return last_serializer
-
-    def include_nested_fields(self, include_nested):
-        """To include the nested fields, dynamically modifying nested
-        serializer fields."""
-        serializer_list = defaultdict(list)
-
-        # Map fields and their serializers.
-        for items in include_nested:
-            nested_fields = items.split(".")
-
-            # The starting field
-            first_depth = nested_fields.pop(0)
-
-            nth_serializer = self.find_nth_serializer(
-                first_depth, nested_fields.copy()
+            excludes[()].update(exclude_fields)
+        for items in include_nested or ():
+            *path, field_name = items.split(".")
+            includes[tuple(path)].add(field_name)
+        for items in exclude_nested or ():
+            *path, field_name = items.split(".")
+            excludes[tuple(path)].add(field_name)
+
+        paths = sorted(set(includes) | set(excludes), key=len)
+        plan = tuple(
+            (
+                path,
+                frozenset(includes[path]) if path in includes else None,
+                frozenset(excludes.get(path, ())),
             )
-
-            # The nth field
-            nth_depth = nested_fields.pop(-1)
-            serializer_list[nth_serializer].append(nth_depth)
-
-        # Loop through all serializers and remove the excess fields
-        for serializer, field_list in serializer_list.items():
-            if serializer.fields:
-                all_fields = set(serializer.fields.keys())
-                inc_fields = set(field_list)
-                x_fields = all_fields - inc_fields
-                for field_name in x_fields:
-                    serializer.fields.pop(field_name)
-
-    def exclude_nested_fields(self, exclude_nested):
-        """To exclude the nested fields,dynamically modifying nested serializer
-        fields."""
-        for items in exclude_nested:
-            nested_fields = items.split(".")
-
-            # The starting field.
-            first_depth = nested_fields.pop(0)
-
-            # The nth field or the excluding field.
-            x_field = nested_fields.pop(-1)
-            nth_serializer = self.find_nth_serializer(
-                first_depth, nested_fields.copy()
+            for path in paths
+        )
+        cls._field_plans[key] = plan
+        return plan
+
+    def apply_field_plan(self, plan):
+        """Apply the rules of a field plan to this and nested serializers.
+
+        Paths are sorted by depth, so a serializer gets its rules before
+        its fields are built to reach deeper ones.
+        """
+        for path, include, exclude in plan:
+            serializer = self
+            for field_name in path:
+                serializer = serializer.fields.get(field_name)
+                if isinstance(serializer, serializers.ListSerializer):
+                    serializer = serializer.child
+                if serializer is None:
+                    break
+            else:
+                self.restrict_fields(serializer, include, exclude)
+
+    @staticmethod
+    def restrict_fields(serializer, include, exclude):
+        """Limit the fields of a serializer to `include` minus `exclude`.
+
+        If the fields are not built yet, the rule is stored to skip building
+        the dropped ones, otherwise the fields are popped.
+        """
+        if (
+            isinstance(serializer, DynamicModelSerializer)
+            and "fields" not in serializer.__dict__
+        ):
+            serializer._field_rules.append((include, exclude))
+            return
+        if not serializer.fields:
+            return
+        for field_name in list(serializer.fields.keys()):
+            if (include is not None and field_name not in include) or (
+                field_name in exclude
+            ):
+                serializer.fields.pop(field_name)
+
+    def is_allowed_field(self, field_name):
+        """Check a field name against the field rules of the serializer."""
+        for include, exclude in self._field_rules:
+            if include is not None and field_name not in include:
+                return False
+            if field_name in exclude:
+                return False
+        return True
+
+    def get_fields(self):
+        """Build only the fields allowed by the field rules."""
+        if not self._field_rules:
+            return super().get_fields()
+        self._declared_fields = {
+            field_name: field
+            for field_name, field in type(self)._declared_fields.items()
+            if self.is_allowed_field(field_name)
+        }
+        try:
+            return super().get_fields()
+        finally:
+            del self._declared_fields
+
+    def get_field_names(self, declared_fields, info):
+        """Drop the field names not allowed by the field rules."""
+        field_names = super().get_field_names(declared_fields, info)
+        if not self._field_rules:
+            return field_names
+        return [name for name in field_names if self.is_allowed_field(name)]
+
+    def get_query_plan(self):
+        """Return the select_related and prefetch_related lookups needed to
+        render the fields of the serializer.
+
+        The plan is cached per serializer class and field plan.
+
+        Returns:
+            tuple: sorted select_related and prefetch_related lookups.
+        """
+        key = (type(self), self._field_plan)
+        plan = self._query_plans.get(key)
+        if plan is None:
+            select, prefetch = set(), set()
+            self._collect_lookups(
+                self, self.Meta.model, "", False, select, prefetch
+            )
+            plan = (tuple(sorted(select)), tuple(sorted(prefetch)))
+            self._query_plans[key] = plan
+        return plan
+
+    def optimize_queryset(self, queryset):
+        """Apply the query plan of the serializer to a queryset.
+
+        `only()` is not applied, since SerializerMethodFields and
+        model properties can read any column and a deferred column
+        costs one query per row.
+        """
+        select, prefetch = self.get_query_plan()
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
+
+    @classmethod
+    def _collect_lookups(
+        cls, serializer, model, prefix, prefetching, select, prefetch
+    ):
+        """Walk the fields of a serializer and collect relation lookups.
+
+        Forward foreign keys and one-to-one relations are joined with
+        select_related, reverse and many-to-many relations are prefetched.
+        Every relation reached through a prefetched one is prefetched as
+        well. Nested serializers are followed with the related model.
+        Related fields rendering only the key of a foreign key read its
+        column, so the relation is not joined.
+        """
+        for field in serializer.fields.values():
+            if field.write_only:
+                continue
+            nested = field
+            if isinstance(field, serializers.ListSerializer):
+                nested = field.child
+            if field.source == "*":
+                if isinstance(nested, serializers.Serializer):
+                    cls._collect_lookups(
+                        nested, model, prefix, prefetching, select, prefetch
+                    )
+                continue
+
+            pk_only = (
+                isinstance(field, serializers.RelatedField)
+                and field.use_pk_only_optimization()
             )
-            if nth_serializer.fields:
-                nth_serializer.fields.pop(x_field)
-
-    def include_direct_fields(self, fields):
-        """To include the direct fields,dynamically modifying serializer
-        fields."""
-        allowed = set(fields)
-        existing = set(self.fields.keys())
-
-        # Drop any fields that are not specified in the `fields` argument.
-        for field_name in existing - allowed:
-            self.fields.pop(field_name)
-
-    def exclude_direct_fields(self, exclude_fields):
-        """To exclude the direct fields."""
-        exclude = set(exclude_fields)
-
-        # Drop specific fields
-        for field_name in exclude:
-            self.fields.pop(field_name)
+            attrs = field.source.split(".")
+            current_model, path, many = model, prefix, prefetching
+            for index, attr in enumerate(attrs):
+                try:
+                    model_field = current_model._meta.get_field(attr)
+                except FieldDoesNotExist:
+                    current_model = None
+                    break
+                if not model_field.is_relation or (
+                    pk_only
+                    and model_field.concrete
+                    and not model_field.many_to_many
+                    and index == len(attrs) - 1
+                ):
+                    current_model = None
+                    break
+                path = f"{path}__{attr}" if path else attr
+                current_model = model_field.related_model
+                many = (
+                    many
+                    or model_field.many_to_many
+                    or model_field.one_to_many
+                    or current_model is None
+                )
+                if many:
+                    prefetch.add(path)
+                else:
+                    select.add(path)
+                if current_model is None:
+                    break
+
+            if current_model and isinstance(nested, serializers.Serializer):
+                cls._collect_lookups(
+                    nested, current_model, path, many, select, prefetch
+                )
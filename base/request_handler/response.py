@@ -56,6 +56,17 @@ class ApiRenderer(JSONRenderer):
 
     def render(self, data, accepted_media_type=None, renderer_context=None):
         """Custom render function."""
+        response_data = self.wrap(data, renderer_context)
+        response = super(ApiRenderer, self).render(
+            response_data, accepted_media_type, renderer_context
+        )
+
+        return response
+
+    @staticmethod
+    def wrap(data, renderer_context):
+        """Wrap data in the standard success structure, unless it is already
+        wrapped."""
         response_data = data
         try:
             if not data["success"]:
@@ -67,12 +78,80 @@ class ApiRenderer(JSONRenderer):
                 "code": renderer_context["response"].status_code,
                 "data": data,
             }
+        return response_data
 
-        response = super(ApiRenderer, self).render(
+
+class ColumnarApiRenderer(ApiRenderer):
+    """Compact, column oriented renderer for list endpoints.
+
+    Selected with `?format=columnar` or with the
+    `application/vnd.connect.columnar+json` Accept header. A list of
+    objects (paginated or not) is rendered as,
+    ```
+    {
+        "columns": ["id", "quantity", "currency_details"],
+        "rows": [["Xa1", 10, "Kd3"], ["Pq7", 12, "Kd3"]],
+        "refs": {"currency_details": {"Kd3": {"id": "Kd3", ...}}}
+    }
+    ```
+    Nested objects having an `id` are replaced by that id and stored
+    once in `refs`, keyed by the field name they appeared under. Lists of
+    such objects become lists of ids. Responses that are not lists
+    (detail views, errors) are rendered exactly like `ApiRenderer`.
+    """
+
+    media_type = "application/vnd.connect.columnar+json"
+    format = "columnar"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render list payloads in columnar form."""
+        response_data = self.wrap(data, renderer_context)
+        if response_data.get("success"):
+            response_data = {
+                **response_data,
+                "data": self.compact(response_data["data"]),
+            }
+        return super(ApiRenderer, self).render(
             response_data, accepted_media_type, renderer_context
         )
 
-        return response
+    def compact(self, data):
+        """Convert list data, or the results of a paginated response, to
+        columns and rows."""
+        if isinstance(data, dict) and isinstance(data.get("results"), list):
+            return {**data, "results": self.compact(data["results"])}
+        if not isinstance(data, list) or not all(
+            isinstance(item, dict) for item in data
+        ):
+            return data
+
+        refs = {}
+        columns = {}
+        for item in data:
+            for key in item:
+                columns.setdefault(key, len(columns))
+        rows = []
+        for item in data:
+            row = [None] * len(columns)
+            for key, value in item.items():
+                row[columns[key]] = self._reference(key, value, refs)
+            rows.append(row)
+        return {"columns": list(columns), "rows": rows, "refs": refs}
+
+    def _reference(self, key, value, refs):
+        """Replace nested objects with their id, registering them in refs."""
+        if isinstance(value, list):
+            return [self._reference(key, item, refs) for item in value]
+        if not isinstance(value, dict):
+            return value
+        value = {
+            name: self._reference(name, item, refs)
+            for name, item in value.items()
+        }
+        if value.get("id") is None:
+            return value
+        refs.setdefault(key, {}).setdefault(str(value["id"]), value)
+        return value["id"]
 
 
 class SuccessResponse(Response):
@@ -5,8 +5,10 @@ from typing import Any
 
 from django.db import models
 from rest_framework import viewsets
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.views import APIView
 
+from base.drf.serializers import DynamicModelSerializer
 from base.request_handler.response import SuccessResponse
 
 
@@ -98,12 +100,40 @@ class IDDEcodeScopeViewset(
     This viewset inherits from `IDDecodeViewSetMixin` for ID decoding,
     `OAuthScopeViewSetMixin` for providing OAuth scope information, and
     `viewsets.ModelViewSet` for typical model viewset functionality.
+
+    On read requests, the queryset is optimized with the query plan of the
+    serializer, if the serializer opts in with `optimize = True`.
     """
 
     def __init__(self, **kwargs: Any) -> None:
         super().__init__(**kwargs)
         self.required_alternate_scopes = self.get_required_alternate_scopes()
 
+    def get_queryset(self):
+        """Return the queryset, optimized for the serializer."""
+        return self.optimize_queryset(super().get_queryset())
+
+    def optimize_queryset(self, queryset):
+        """Apply select_related and prefetch_related lookups of the
+        serializer to the queryset.
+
+        Args:
+            queryset (QuerySet): The queryset to optimize.
+
+        Returns:
+            QuerySet: The optimized queryset, or the same queryset if the
+                serializer does not opt in or the request is not a read.
+        """
+        request = getattr(self, "request", None)
+        if request is None or request.method not in SAFE_METHODS:
+            return queryset
+        if not issubclass(self.get_serializer_class(), DynamicModelSerializer):
+            return queryset
+        serializer = self.get_serializer()
+        if not serializer.optimize:
+            return queryset
+        return serializer.optimize_queryset(queryset)
+
 
 class Constants(APIView):
     """API to return configurations.
@@ -178,9 +178,7 @@ class SSOJWTAuthentication(JWTAuthentication, auth_utils.AuthMixin):
         # Fetch the session token using client_nonce and server_nonce
         from v1.apiauth.models import AuthSession
 
-        auth_session = AuthSession.objects.filter(
-            client_nonce=client_nonce, server_nonce=server_nonce
-        ).first()
+        auth_session = AuthSession.get_for_nonces(client_nonce, server_nonce)
 
         if not auth_session:
             raise AuthenticationFailed(
@@ -238,6 +236,10 @@ class SSOJWTAuthentication(JWTAuthentication, auth_utils.AuthMixin):
         if view and getattr(view, "exclude_device_validation", False):
             return
 
+        # Active devices are served from the cached device registry
+        if device_id in UserDevice.active_registration_ids(user.pk):
+            return
+
         # Retrieve the device associated with the user and device ID
         logged_device = UserDevice.get_device_with_device_id(device_id, user)
 
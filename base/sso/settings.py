@@ -26,7 +26,10 @@ DEFAULTS = {
     "JTI_CLAIM": "jti",
     "TOKEN_BLACKLIST_SERIALIZER": "rest_framework_simplejwt.serializers.TokenBlacklistSerializer",
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
-    "VERFIFICATION_FILE_PATH": None
+    "VERFIFICATION_FILE_PATH": None,
+    "CACHE_TIMEOUT": 300,
+    "LOCAL_CACHE_SIZE": 4096,
+    "LOCAL_CACHE_TIMEOUT": 10,
 
 }
 
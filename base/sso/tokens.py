@@ -3,6 +3,7 @@ from typing import Any, Dict, Optional, TypeVar
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser
+from django.core.cache import cache
 from django.utils.module_loading import import_string
 from django.utils.translation import gettext_lazy as _
 from rest_framework_simplejwt.backends import TokenBackend
@@ -17,6 +18,12 @@ from base.sso.settings import sso_settings
 
 AuthUser = TypeVar("AuthUser", AbstractBaseUser, TokenUser)
 
+
+def blacklist_cache_key(jti: str) -> str:
+    """Returns the cache key holding the blacklist state of a jti."""
+    return f"sso_blacklist:{jti}"
+
+
 class BlacklistMixin:
     """
     If the `rest_framework_simplejwt.token_blacklist` app was configured to be
@@ -36,11 +43,29 @@ class BlacklistMixin:
             """
             Checks if this token is present in the token blacklist.  Raises
             `TokenError` if so.
+
+            The result is cached per jti, `blacklist()` overwrites the
+            cached value when the token is blacklisted.
             """
             jti = self.payload[sso_settings.JTI_CLAIM]
-            if BlacklistedToken.objects.filter(token__jti=jti).exists():
+            key = blacklist_cache_key(jti)
+            blacklisted = cache.get(key)
+            if blacklisted is None:
+                blacklisted = BlacklistedToken.objects.filter(
+                    token__jti=jti
+                ).exists()
+                cache.set(key, blacklisted, self.blacklist_cache_timeout())
+            if blacklisted:
                 raise TokenError(_("Token is blacklisted"))
 
+        def blacklist_cache_timeout(self) -> int:
+            """
+            Returns the seconds the blacklist state of the token is cached,
+            capped at the expiry of the token.
+            """
+            remaining = int(self.payload["exp"] - aware_utcnow().timestamp())
+            return max(min(remaining, sso_settings.CACHE_TIMEOUT), 1)
+
         def blacklist(self) -> BlacklistedToken:
             """
             Ensures this token is included in the outstanding token list and
@@ -58,7 +83,10 @@ class BlacklistMixin:
                 },
             )
 
-            return BlacklistedToken.objects.get_or_create(token=token)
+            blacklisted = BlacklistedToken.objects.get_or_create(token=token)
+            remaining = int(exp - aware_utcnow().timestamp())
+            cache.set(blacklist_cache_key(jti), True, max(remaining, 1))
+            return blacklisted
 
         @classmethod
         def for_user(cls, user: AuthUser) -> Token:
@@ -0,0 +1,123 @@
+import math
+import timeit
+from collections import defaultdict
+
+from v1.supply_chains.validators import validate_coordinates
+from v1.supply_chains.validators import validate_geojson_polygon
+from v1.supply_chains.validators import validate_plot
+
+# Vertices of the plots: a hand drawn plot, a walked GPS track, a detailed
+# survey and a traced parcel boundary.
+SIZES = (12, 150, 1500, 5000)
+
+ITERATIONS = 20
+
+
+def plot(vertices):
+    """Returns a plot of about a hectare with a jagged, simple boundary."""
+    ring = []
+    for index in range(vertices):
+        angle = 2 * math.pi * index / vertices
+        radius = 0.0005 * (1 + 0.1 * math.sin(index * 7))
+        longitude = -0.1875 + radius * math.cos(angle)
+        latitude = 5.6037 + radius * math.sin(angle)
+        ring.append([longitude, latitude])
+    ring.append(ring[0])
+    return {
+        "type": "Feature",
+        "properties": {},
+        "geometry": {"type": "Polygon", "coordinates": [ring]},
+    }
+
+
+def validate_before(data):
+    """Run the validators used before validate_plot."""
+    validate_geojson_polygon(data)
+    validate_coordinates(data)
+
+
+def crossing_segments(ring):
+    """Returns the index pairs of the crossing segments of a closed ring.
+
+    The pure Python equivalent of the check of validate_plot: segments are
+    bucketed in the cells of a grid sized to the segments and only
+    segments sharing a cell are compared.
+    """
+    segments = list(zip(ring[:-1], ring[1:]))
+    count = len(segments)
+    size = sum(
+        max(abs(q[0] - p[0]), abs(q[1] - p[1])) for p, q in segments
+    ) / count
+    if not size > 0:
+        return []
+    origin_x = min(min(p[0], q[0]) for p, q in segments)
+    origin_y = min(min(p[1], q[1]) for p, q in segments)
+    cells = defaultdict(list)
+    for index, (p, q) in enumerate(segments):
+        x0 = int((min(p[0], q[0]) - origin_x) // size)
+        x1 = int((max(p[0], q[0]) - origin_x) // size)
+        y0 = int((min(p[1], q[1]) - origin_y) // size)
+        y1 = int((max(p[1], q[1]) - origin_y) // size)
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                cells[x, y].append(index)
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    pairs = set()
+    for members in cells.values():
+        for position, first in enumerate(members):
+            for second in members[position + 1 :]:
+                first, second = min(first, second), max(first, second)
+                if second - first <= 1 or (first, second) == (0, count - 1):
+                    continue
+                pairs.add((first, second))
+    hits = []
+    for first, second in sorted(pairs):
+        p1, p2 = segments[first]
+        q1, q2 = segments[second]
+        if (
+            cross(q1, q2, p1) * cross(q1, q2, p2) < 0
+            and cross(p1, p2, q1) * cross(p1, p2, q2) < 0
+        ):
+            hits.append((first, second))
+    return hits
+
+
+def validate_python(data):
+    """Run the checks of validate_plot in pure Python: coordinate ranges,
+    ring closure and crossing segments."""
+    for ring in data["geometry"]["coordinates"]:
+        for longitude, latitude in ring:
+            if abs(longitude) > 180 or abs(latitude) > 90:
+                raise ValueError("Invalid vertex")
+        if ring[0] != ring[-1]:
+            raise ValueError("Open ring")
+        if crossing_segments(ring):
+            raise ValueError("Crossing segments")
+
+
+def run():
+    """Compare the plot validators on plots of real-world sizes.
+
+    The legacy validators do not check closure or self-intersection.
+    validate_plot checks both with numpy, the pure Python check does the
+    same work with lists and dicts.
+
+    Usage: python manage.py runscript benchmark_plot_validation
+    """
+    for size in SIZES:
+        data = plot(size)
+        timings = [
+            timeit.timeit(lambda: validate(data), number=ITERATIONS)
+            * 1000
+            / ITERATIONS
+            for validate in (validate_before, validate_python, validate_plot)
+        ]
+        print(
+            f"{size} vertices: "
+            f"legacy {timings[0]:.3f} ms, "
+            f"pure Python {timings[1]:.3f} ms, "
+            f"validate_plot {timings[2]:.3f} ms"
+        )
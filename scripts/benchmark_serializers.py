@@ -0,0 +1,56 @@
+import timeit
+
+from v1.supply_chains.serializers import CompanySerializer
+from v1.supply_chains.serializers import FarmerSerializer
+from v1.transactions.serializers import ProductTransactionSerializer
+
+
+ITERATIONS = 500
+
+CASES = (
+    (FarmerSerializer, {"fields": ("id", "first_name", "last_name")}),
+    (CompanySerializer, {"exclude_fields": ("forms", "products")}),
+    (
+        ProductTransactionSerializer,
+        {"fields": ("id", "number", "quantity", "date")},
+    ),
+)
+
+
+def build_and_prune(serializer_class, options):
+    """Build every field and pop the dropped ones afterwards, the way the
+    serializer fields were pruned before the field plan cache."""
+    serializer = serializer_class()
+    include = options.get("fields")
+    exclude = options.get("exclude_fields", ())
+    for field_name in list(serializer.fields.keys()):
+        if (include and field_name not in include) or field_name in exclude:
+            serializer.fields.pop(field_name)
+    return serializer.fields
+
+
+def build_with_plan(serializer_class, options):
+    """Build the fields through the cached field plan."""
+    return serializer_class(**options).fields
+
+
+def run():
+    """Compare serializer construction time with and without the field plan.
+
+    Usage: python manage.py runscript benchmark_serializers
+    """
+    for serializer_class, options in CASES:
+        before = timeit.timeit(
+            lambda: build_and_prune(serializer_class, options),
+            number=ITERATIONS,
+        )
+        after = timeit.timeit(
+            lambda: build_with_plan(serializer_class, options),
+            number=ITERATIONS,
+        )
+        print(
+            f"{serializer_class.__name__} {options}: "
+            f"prune {before * 1000 / ITERATIONS:.3f} ms, "
+            f"plan {after * 1000 / ITERATIONS:.3f} ms, "
+            f"{before / after:.1f}x"
+        )
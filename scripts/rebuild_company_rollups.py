@@ -0,0 +1,62 @@
+from django.db import transaction
+from django.db.models import Case
+from django.db.models import Count
+from django.db.models import DateField
+from django.db.models import DecimalField
+from django.db.models import F
+from django.db.models import Q
+from django.db.models import Sum
+from django.db.models import Value
+from django.db.models import When
+from django.db.models.functions import Coalesce
+from django.db.models.functions import TruncMonth
+
+from v1.transactions import constants
+from v1.transactions.models.payment_models import PaymentTransaction
+from v1.transactions.models.transaction_models import CompanyRollup
+
+
+def run():
+    """Rebuild the company rollups from the payments.
+
+    Usage: python manage.py runscript rebuild_company_rollups
+    """
+    summary = (
+        PaymentTransaction.objects.filter(
+            Q(transaction__isnull=True) | Q(transaction__is_deleted=False)
+        )
+        .values(
+            "payment_type",
+            company_id=F("source_id"),
+            product_id=F("transaction__product_id"),
+            period=TruncMonth("date", output_field=DateField()),
+            source_type=Case(
+                When(
+                    destination__farmer__isnull=False,
+                    then=Value(constants.RollupSourceType.FARMER),
+                ),
+                default=Value(constants.RollupSourceType.COMPANY),
+            ),
+            currency_code=Coalesce("currency__code", Value("")),
+        )
+        .annotate(
+            transaction_count=Count("id"),
+            quantity=Coalesce(
+                Sum(
+                    "transaction__quantity",
+                    filter=Q(payment_type=constants.PaymentType.TRANSACTION),
+                ),
+                Value(0),
+                output_field=DecimalField(max_digits=25, decimal_places=3),
+            ),
+            amount=Coalesce(Sum("amount"), Value(0.0)),
+        )
+        .order_by()
+    )
+    with transaction.atomic():
+        CompanyRollup.objects.all().delete()
+        rollups = CompanyRollup.objects.bulk_create(
+            CompanyRollup(currency=row.pop("currency_code"), **row)
+            for row in summary.iterator()
+        )
+    print(f"Rebuilt {len(rollups)} company rollups.")
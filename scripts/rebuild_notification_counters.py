@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.db.models import Count
+from django.db.models import Q
+
+from v1.notifications.models import Notification
+from v1.notifications.models import NotificationCounter
+
+
+def run():
+    """Rebuild the notification counters from the notifications.
+
+    Usage: python manage.py runscript rebuild_notification_counters
+    """
+    summary = (
+        Notification.objects.filter(visibility=True)
+        .values("user_id", "target_entity_id")
+        .annotate(
+            count=Count("id"),
+            unread_count=Count("id", filter=Q(is_read=False)),
+        )
+        .order_by()
+    )
+    with transaction.atomic():
+        NotificationCounter.objects.all().delete()
+        counters = NotificationCounter.objects.bulk_create(
+            NotificationCounter(**row) for row in summary.iterator()
+        )
+    print(f"Rebuilt {len(counters)} notification counters.")
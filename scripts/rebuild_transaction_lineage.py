@@ -0,0 +1,13 @@
+from django.db import transaction
+
+from v1.transactions.models.transaction_models import TransactionLineage
+
+
+def run():
+    """Rebuild the transaction lineage from the parents of the transactions.
+
+    Usage: python manage.py runscript rebuild_transaction_lineage
+    """
+    with transaction.atomic():
+        TransactionLineage.rebuild()
+    print(f"Rebuilt {TransactionLineage.objects.count()} lineage rows.")
@@ -11,4 +11,8 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "trace_connect.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from v1.notifications.stream import NotificationStreamRouter  # noqa: E402
+
+application = NotificationStreamRouter(django_application)
@@ -113,7 +113,10 @@ REST_FRAMEWORK = {
     "DATETIME_FORMAT": "%s",
     "DEFAULT_PAGINATION_CLASS": ("rest_framework.pagination.LimitOffsetPagination"),
     "PAGE_SIZE": 10,
-    "DEFAULT_RENDERER_CLASSES": ("base.request_handler.response.ApiRenderer",),
+    "DEFAULT_RENDERER_CLASSES": (
+        "base.request_handler.response.ApiRenderer",
+        "base.request_handler.response.ColumnarApiRenderer",
+    ),
     "DEFAULT_FILTER_BACKENDS": ("django_filters.rest_framework.DjangoFilterBackend",),
     "DEFAULT_VERSIONING_CLASS": "rest_framework.versioning.URLPathVersioning",
     "DEFAULT_SCHEMA_CLASS": "rest_framework.schemas.coreapi.AutoSchema",
@@ -163,6 +166,28 @@ OAUTH2_PROVIDER = {
     },
 }
 
+# Seconds a validated OAuth2 access token is served from the cache.
+OAUTH2_TOKEN_CACHE_TIMEOUT = 60
+
+# Seconds a rendered form definition is cached, per form version.
+FORM_CACHE_TIMEOUT = 24 * 3600
+
+# Number of farmers fetched per query by the GeoJSON exports.
+GEOJSON_EXPORT_CHUNK_SIZE = 1000
+# Seconds the GeoJSON exports, and their signed URLs, are kept.
+GEOJSON_EXPORT_EXPIRY = 24 * 3600
+
+# Admin changelists count rows exactly only when the planner estimates fewer
+# rows than this, and cache the options of their list filters for
+# ADMIN_FILTER_CACHE_TIMEOUT seconds.
+ADMIN_EXACT_COUNT_LIMIT = 10000
+ADMIN_FILTER_CACHE_TIMEOUT = 600
+
+# Seconds the active devices of a user are kept in the shared cache, and
+# in the in-process cache of each worker.
+DEVICE_CACHE_TIMEOUT = 3600
+DEVICE_LOCAL_CACHE_TIMEOUT = 5
+
 
 REST_USE_JWT = True
 JWT_AUTH_COOKIE = "rightorigins-v3-auth"
@@ -246,6 +271,16 @@ CACHES = {
     }
 }
 
+# Channel layer new notifications are published to, and the path of the
+# server-sent events stream delivering them, served by the ASGI workers.
+NOTIFICATION_CHANNEL_LAYER = {
+    "BACKEND": "v1.notifications.channels.RedisChannelLayer",
+    "OPTIONS": {"url": f"{REDIS_URL}:{REDIS_PORT}/2"},
+}
+NOTIFICATION_STREAM_PATH = "/connect/v1/notifications/stream/"
+# Seconds between keep-alive comments on an idle stream.
+NOTIFICATION_STREAM_HEARTBEAT = 25
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -391,6 +426,29 @@ FROM_EMAIL = EMAIL_HOST_USER
 EMAIL_USE_TLS = True
 EMAIL_USE_SSL = False
 
+# Queued emails are sent in batches of EMAIL_BATCH_SIZE, at most
+# EMAIL_RATE_LIMITS emails per second per EMAIL_HOST ("default" applies to
+# hosts that are not listed).
+EMAIL_BATCH_SIZE = 50
+EMAIL_RATE_LIMITS = {"default": int(env.get("EMAIL_RATE_LIMIT", default=14))}
+
+# Maximum number of SMSs published to SNS at a time by send_bulk_sms.
+SMS_CONCURRENCY = 10
+
+# IP geolocation. The MaxMind City database at GEOIP_PATH is used when
+# installed, the remote IP_API_URL (formatted with the ip) is queried in
+# the background otherwise. Without GEOIP_PATH, the first lookup of an ip
+# returns "Unknown" and later ones the resolved location. Locations are
+# always "Unknown" when neither is set.
+GEOIP_PATH = env.get("GEOIP_PATH", default="")
+IP_API_URL = env.get("IP_API_URL", default="")
+IP_API_TIMEOUT = 2
+GEOLOCATION_CACHE_TIMEOUT = 7 * 24 * 3600
+
+# Device descriptions of the user agents of our apps, used instead of
+# parsing them.
+KNOWN_USER_AGENTS = {}
+
 
 # celery setup
 
@@ -400,6 +458,7 @@ CELERY_TIMEZONE = "UTC"
 CELERY_DEFAULT_QUEUE = "low"
 CELERY_ROUTES = {
     "send_email": {"queue": "high"},
+    "dispatch_emails": {"queue": "high"},
     "send_sms": {"queue": "high"},
 }
 CELERY_ACCEPT_CONTENT = ["json"]
@@ -0,0 +1,71 @@
+"""In-process caches used in front of the shared Redis cache."""
+import threading
+import time
+from collections import OrderedDict
+
+
+class LocalCache:
+    """A thread-safe in-process LRU cache with expiring entries.
+
+    Entries are local to the worker process and cannot be invalidated from
+    other processes, so the timeout should be short and the cache should
+    only hold values that are safe to serve slightly stale, or that never
+    change.
+
+    Args:
+        maxsize (int): Maximum number of entries kept.
+        timeout (int): Default number of seconds an entry is kept.
+    """
+
+    def __init__(self, maxsize=1024, timeout=60):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Returns the value of a key, or default if it is missing or
+        expired."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[1] < time.monotonic():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key, value, timeout=None):
+        """Stores a value, evicting the least recently used entry when the
+        cache is full."""
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + timeout)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """Removes a key from the cache."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Removes every entry and resets the statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """Returns the hit and miss counts and the hit rate."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -1,29 +1,225 @@
-"""Email Integrations."""
+"""Email Integrations.
+
+Emails are queued in Redis and sent in batches by the dispatch_emails task,
+over one connection per worker process, within the rate limit of the email
+provider. One dispatch runs at a time, holding a lock. A batch is moved to
+the processing list while it is sent and each email is removed once sent,
+so a failed dispatch, or the next one after a killed worker, puts the rest
+back in the queue.
+"""
+import json
 import logging
+import smtplib
+import time
 
 from celery import current_app as app
+from celery.signals import worker_process_shutdown
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMultiAlternatives
+from django.core.mail import get_connection
 from django.utils.html import strip_tags
+from django_redis import get_redis_connection
 from sentry_sdk import capture_exception
 
 logger = logging.getLogger(__name__)
 
+EMAIL_QUEUE_KEY = "trace_connect_email_queue"
+EMAIL_DISPATCH_KEY = "trace_connect_email_dispatch"
+EMAIL_PROCESSING_KEY = "trace_connect_email_processing"
+EMAIL_LOCK_KEY = "trace_connect_email_lock"
 
-@app.task(name="send_email")
-def send_email(subject, to_email, html):
-    """Function to create Validator email."""
+# Seconds a dispatch holds the lock without sending a batch, before another
+# dispatch takes over.
+EMAIL_LOCK_TIMEOUT = 120
+
+# Errors of a single message, which are not retried. A refused sender fails
+# every message, so it is retried with the connection errors.
+MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused,)
+
+_connection = None
+
+
+def get_mail_connection():
+    """Returns the open email connection of the worker process."""
+    global _connection
+    if _connection is None:
+        connection = get_connection()
+        connection.open()
+        _connection = connection
+    return _connection
+
+
+@worker_process_shutdown.connect
+def close_mail_connection(**kwargs):
+    """Closes the email connection of the worker process."""
+    global _connection
+    if _connection is not None:
+        try:
+            _connection.close()
+        except Exception:
+            pass
+        _connection = None
+
+
+def queue_email(subject, to_email, html):
+    """Queue an email to be sent with the next batch."""
+    redis = get_redis_connection("default")
+    redis.rpush(
+        EMAIL_QUEUE_KEY,
+        json.dumps({"subject": subject, "to_email": to_email, "html": html}),
+    )
+    # Only one dispatch is scheduled at a time, it drains the whole queue.
+    if redis.set(EMAIL_DISPATCH_KEY, 1, nx=True, ex=300):
+        dispatch_emails.delay()
+
+
+def build_message(subject, to_email, html):
+    """Returns the email message of a queued email."""
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=strip_tags(html),
+        from_email=settings.FROM_EMAIL,
+        to=[to_email],
+    )
+    message.attach_alternative(html, "text/html")
+    return message
+
+
+def get_rate_limit():
+    """Returns the number of emails per second allowed by the provider."""
+    limits = settings.EMAIL_RATE_LIMITS
+    return limits.get(settings.EMAIL_HOST, limits.get("default"))
+
+
+def throttle(redis, count):
+    """Waits until count emails can be sent within the rate limit.
+
+    The limit is shared by the workers, counting the emails sent per second
+    in Redis.
+    """
+    limit = get_rate_limit()
+    if not limit:
+        return
+    while True:
+        window = int(time.time())
+        key = f"trace_connect_email_rate:{settings.EMAIL_HOST}:{window}"
+        with redis.pipeline() as pipe:
+            pipe.incrby(key, count)
+            pipe.expire(key, 2)
+            used, _ = pipe.execute()
+        if used <= limit:
+            return
+        redis.decrby(key, count)
+        time.sleep(max(window + 1 - time.time(), 0))
 
+
+def claim_batch(redis, size):
+    """Moves the next batch of queued emails to the processing list and
+    returns it."""
+    with redis.pipeline() as pipe:
+        for _ in range(size):
+            pipe.lmove(EMAIL_QUEUE_KEY, EMAIL_PROCESSING_KEY, "LEFT", "RIGHT")
+        items = pipe.execute()
+    return [item for item in items if item is not None]
+
+
+def requeue(redis):
+    """Puts the emails of the processing list back in front of the queue,
+    in their order."""
+    while redis.lmove(EMAIL_PROCESSING_KEY, EMAIL_QUEUE_KEY, "RIGHT", "LEFT"):
+        pass
+
+
+def load_message(item):
+    """Returns the email message of a queued email, or None if invalid."""
     try:
-        send_mail(
-            subject=subject,
-            message=strip_tags(html),
-            from_email=settings.FROM_EMAIL,
-            recipient_list=[to_email],
-            html_message=html,
-        )
-        logger.info("Email sending success.")
-    except Exception as e:
+        message = build_message(**json.loads(item))
+        # Raises for invalid headers before the message is sent.
+        message.message()
+    except ValueError as e:
         capture_exception(e)
         logger.info("Email sending failed.")
+        return None
+    return message
+
+
+def send_batch(redis, items):
+    """Sends a batch of queued emails over the connection of the worker
+    process.
+
+    The emails are sent one at a time and removed from the processing list
+    once sent, or dropped when invalid or refused for their recipients.
+    When the connection fails, only the emails left to send are in the
+    processing list.
+
+    Returns:
+        int: Number of emails sent.
+    """
+    connection = get_mail_connection()
+    sent = 0
+    for item in items:
+        message = load_message(item)
+        if message:
+            try:
+                sent += connection.send_messages([message])
+            except MESSAGE_ERRORS as e:
+                capture_exception(e)
+                logger.info("Email sending failed.")
+        redis.lrem(EMAIL_PROCESSING_KEY, 1, item)
+    return sent
+
+
+@app.task(
+    name="dispatch_emails",
+    autoretry_for=(smtplib.SMTPException, OSError),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    max_retries=8,
+)
+def dispatch_emails():
+    """Send the queued emails in batches.
+
+    Returns:
+        int: Number of emails sent.
+    """
+    redis = get_redis_connection("default")
+    lock = redis.lock(EMAIL_LOCK_KEY, timeout=EMAIL_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        # The running dispatch may have drained the queue before the
+        # emails that scheduled this one were queued.
+        dispatch_emails.apply_async(countdown=10)
+        return 0
+    try:
+        redis.delete(EMAIL_DISPATCH_KEY)
+        # Emails left by a dispatch that stopped before sending them, or
+        # whose worker was killed, are sent first.
+        requeue(redis)
+        size = min(settings.EMAIL_BATCH_SIZE, get_rate_limit() or float("inf"))
+        sent = 0
+        while True:
+            lock.reacquire()
+            items = claim_batch(redis, size)
+            if not items:
+                return sent
+            throttle(redis, len(items))
+            try:
+                sent += send_batch(redis, items)
+            except Exception:
+                # Put the rest of the batch back and let the task retry
+                # with a new connection.
+                requeue(redis)
+                close_mail_connection()
+                raise
+    finally:
+        lock.release()
+
+
+@app.task(name="send_email")
+def send_email(subject, to_email, html):
+    """Function to create Validator email.
+
+    Kept for tasks queued before emails were batched, the email is queued
+    for dispatch_emails.
+    """
+    queue_email(subject, to_email, html)
     return True
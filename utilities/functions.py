@@ -8,7 +8,6 @@ from random import randint
 
 import phonenumbers
 import pytz
-import requests
 from django.conf import settings
 from django.contrib.auth import password_validation
 from django.utils.functional import Promise
@@ -20,6 +19,8 @@ from rest_framework.exceptions import ValidationError
 from ua_parser import user_agent_parser
 
 from base.exceptions.custom_exceptions import BadRequest
+from utilities import geolocation
+from utilities.cache import LocalCache
 
 
 def encode(value):
@@ -212,22 +213,17 @@ def get_ip_from_request(request):
 
 def get_location_from_ip(ip):
     """Function to get the location data from the IP address."""
-    try:
-        location_data = requests.get(settings.IP_API_URL.format(ip=ip)).json()
-        location_info = [
-            location_data.get(i)
-            for i in ["city", "region", "country_name"]
-            if location_data.get(i, None)
-        ]
-        return ", ".join(location_info)
-    except AttributeError:
-        return "Unknown"
+    return geolocation.get_location(ip)
 
 
-def device_name_from_request(request):
-    """Function to get the device details from the request."""
+# Parsed device descriptions, which never change. The hit rate is read
+# with user_agent_cache.stats().
+user_agent_cache = LocalCache(maxsize=1024, timeout=24 * 3600)
+
+
+def _parse_user_agent(user_agent_string):
+    """Describe the device of a user agent string with ua_parser."""
     try:
-        user_agent_string = request.headers["User-Agent"]
         user_agent = user_agent_parser.Parse(user_agent_string)
         brand = user_agent["device"].get("brand", "Unknown")
         model = user_agent["device"].get("model", "Device")
@@ -241,6 +237,31 @@ def device_name_from_request(request):
     return device_string
 
 
+def parse_user_agent(user_agent_string):
+    """Function to get the device description of a user agent string.
+
+    The user agents of our apps are looked up in KNOWN_USER_AGENTS, other
+    user agents are parsed once per worker and kept in user_agent_cache,
+    since clients send few distinct user agents and parsing them takes
+    milliseconds.
+    """
+    if not user_agent_string:
+        return "Unknown"
+    known = settings.KNOWN_USER_AGENTS.get(user_agent_string)
+    if known:
+        return known
+    device = user_agent_cache.get(user_agent_string)
+    if device is None:
+        device = _parse_user_agent(user_agent_string)
+        user_agent_cache.set(user_agent_string, device)
+    return device
+
+
+def device_name_from_request(request):
+    """Function to get the device details from the request."""
+    return parse_user_agent(request.headers.get("User-Agent"))
+
+
 def client_details(request):
     """Get IP, Location and device of requester."""
     ip = get_ip_from_request(request)
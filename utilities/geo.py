@@ -0,0 +1,280 @@
+"""Geohash indexing and geometry helpers for plots and locations.
+
+Locations are indexed with the geohash of the point, and plots with the
+geohash of the smallest cell containing their bounding box. Both are
+queried with prefix lookups on the cells covering the searched area, which
+use a B-tree index, and the candidates are refined with exact comparisons.
+"""
+import json
+import math
+
+from django.db.models import Q
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Precision of the geohash of a point, about 5 metres.
+POINT_PRECISION = 9
+
+# Maximum number of cells used to cover a searched area.
+MAX_COVER_CELLS = 32
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def geohash_encode(latitude, longitude, precision=POINT_PRECISION):
+    """Returns the geohash of a point."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    geohash = []
+    bits, bit, even = 0, 0, True
+    while len(geohash) < precision:
+        if even:
+            target, value = lon_range, longitude
+        else:
+            target, value = lat_range, latitude
+        mid = (target[0] + target[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            target[0] = mid
+        else:
+            bits <<= 1
+            target[1] = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            geohash.append(BASE32[bits])
+            bits, bit = 0, 0
+    return "".join(geohash)
+
+
+def cell_size(precision):
+    """Returns the height and width in degrees of the cells of a
+    precision."""
+    lon_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 // 2
+    return 180.0 / 2**lat_bits, 360.0 / 2**lon_bits
+
+
+def is_location(latitude, longitude):
+    """Whether a latitude and longitude are a valid, set location.
+
+    The default location 0, 0 is considered unset.
+    """
+    if latitude is None or longitude is None:
+        return False
+    if latitude == 0 and longitude == 0:
+        return False
+    return -90 <= latitude <= 90 and -180 <= longitude <= 180
+
+
+def point_geohash(latitude, longitude):
+    """Returns the geohash of a location, or None if it is not set."""
+    if not is_location(latitude, longitude):
+        return None
+    return geohash_encode(latitude, longitude)
+
+
+def geometry(geo_json):
+    """Returns the geometry of a GeoJSON feature or geometry."""
+    if isinstance(geo_json, str):
+        try:
+            geo_json = json.loads(geo_json)
+        except ValueError:
+            return None
+    if not isinstance(geo_json, dict):
+        return None
+    if geo_json.get("type") == "Feature":
+        return geometry(geo_json.get("geometry"))
+    return geo_json
+
+
+def coordinates(geo_json):
+    """Yields the (longitude, latitude) pairs of a GeoJSON geometry."""
+
+    def walk(value):
+        if (
+            isinstance(value, (list, tuple))
+            and len(value) >= 2
+            and all(isinstance(v, (int, float)) for v in value[:2])
+        ):
+            yield value[0], value[1]
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                yield from walk(item)
+
+    geom = geometry(geo_json)
+    if geom:
+        yield from walk(geom.get("coordinates") or [])
+
+
+def bounding_box(geo_json):
+    """Returns the (min_lat, min_lon, max_lat, max_lon) bounding box of a
+    GeoJSON geometry, or None if it has no coordinates."""
+    points = list(coordinates(geo_json))
+    if not points:
+        return None
+    lons = [lon for lon, _ in points]
+    lats = [lat for _, lat in points]
+    return min(lats), min(lons), max(lats), max(lons)
+
+
+def bbox_geohash(bbox):
+    """Returns the geohash of the smallest cell containing a bounding box.
+
+    The geohash is empty if the box spans cells of the first level.
+    """
+    min_lat, min_lon, max_lat, max_lon = bbox
+    low = geohash_encode(min_lat, min_lon)
+    high = geohash_encode(max_lat, max_lon)
+    length = 0
+    while length < len(low) and low[length] == high[length]:
+        length += 1
+    return low[:length]
+
+
+def parse_bbox(value):
+    """Parses a "min_lat,min_lon,max_lat,max_lon" bounding box.
+
+    Raises:
+        ValueError: If the value is not a valid bounding box.
+    """
+    bbox = tuple(float(part) for part in value.split(","))
+    if len(bbox) != 4:
+        raise ValueError("A bounding box has four coordinates.")
+    min_lat, min_lon, max_lat, max_lon = bbox
+    if not (-90 <= min_lat <= max_lat <= 90):
+        raise ValueError("Invalid latitudes.")
+    if not (-180 <= min_lon <= max_lon <= 180):
+        raise ValueError("Invalid longitudes.")
+    return bbox
+
+
+def parse_radius(value):
+    """Parses a "latitude,longitude,radius_km" circle.
+
+    Raises:
+        ValueError: If the value is not a valid circle.
+    """
+    latitude, longitude, radius = (float(part) for part in value.split(","))
+    if not is_location(latitude, longitude) or radius <= 0:
+        raise ValueError("Invalid circle.")
+    return latitude, longitude, radius
+
+
+def parse_polygon(value):
+    """Parses a polygon, given as a GeoJSON geometry or feature, or a JSON
+    list of [longitude, latitude] pairs.
+
+    Returns:
+        list: The (longitude, latitude) vertices of the outer ring.
+
+    Raises:
+        ValueError: If the value is not a valid polygon.
+    """
+    data = json.loads(value)
+    if isinstance(data, dict):
+        geom = geometry(data) or {}
+        if geom.get("type") != "Polygon":
+            raise ValueError("Only polygons are supported.")
+        data = geom["coordinates"][0]
+    ring = [(float(lon), float(lat)) for lon, lat in data]
+    if len(ring) < 3:
+        raise ValueError("A polygon has at least three vertices.")
+    return ring
+
+
+def polygon_bbox(ring):
+    """Returns the bounding box of a polygon ring."""
+    lons = [lon for lon, _ in ring]
+    lats = [lat for _, lat in ring]
+    return min(lats), min(lons), max(lats), max(lons)
+
+
+def radius_bbox(latitude, longitude, radius_km):
+    """Returns the bounding box of a circle."""
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(latitude))
+    lon_delta = 180.0 if cos_lat < 1e-6 else min(lat_delta / cos_lat, 180.0)
+    return (
+        max(latitude - lat_delta, -90.0),
+        max(longitude - lon_delta, -180.0),
+        min(latitude + lat_delta, 90.0),
+        min(longitude + lon_delta, 180.0),
+    )
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Returns the distance in kilometres between two points."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def point_in_polygon(longitude, latitude, ring):
+    """Whether a point is inside a polygon ring, by ray casting."""
+    inside = False
+    count = len(ring)
+    for index in range(count):
+        x1, y1 = ring[index]
+        x2, y2 = ring[(index + 1) % count]
+        if (y1 > latitude) != (y2 > latitude):
+            x = x1 + (latitude - y1) * (x2 - x1) / (y2 - y1)
+            if longitude < x:
+                inside = not inside
+    return inside
+
+
+def cover(bbox):
+    """Returns the geohash cells covering a bounding box, at the finest
+    precision that needs at most MAX_COVER_CELLS cells."""
+    min_lat, min_lon, max_lat, max_lon = bbox
+    cells = [""]
+    for precision in range(1, POINT_PRECISION + 1):
+        height, width = cell_size(precision)
+        rows = range(
+            int((min_lat + 90) // height),
+            min(int((max_lat + 90) // height), int(180 / height) - 1) + 1,
+        )
+        columns = range(
+            int((min_lon + 180) // width),
+            min(int((max_lon + 180) // width), int(360 / width) - 1) + 1,
+        )
+        if len(rows) * len(columns) > MAX_COVER_CELLS:
+            break
+        cells = [
+            geohash_encode(
+                (row + 0.5) * height - 90,
+                (column + 0.5) * width - 180,
+                precision,
+            )
+            for row in rows
+            for column in columns
+        ]
+    return cells
+
+
+def point_q(field, bbox):
+    """Returns the filter of the geohash field of points in a bounding
+    box, to be refined with the coordinates."""
+    query = Q()
+    for cell in cover(bbox):
+        query |= Q(**{f"{field}__startswith": cell})
+    return query
+
+
+def area_q(field, bbox):
+    """Returns the filter of the geohash field of areas which may intersect
+    a bounding box, to be refined with their bounding boxes.
+
+    An area intersecting the box is either within one of the covering
+    cells, or contains one of them, in which case its geohash is a prefix
+    of the cell.
+    """
+    cells = cover(bbox)
+    prefixes = {cell[:length] for cell in cells for length in range(len(cell))}
+    query = Q(**{f"{field}__in": prefixes})
+    for cell in cells:
+        query |= Q(**{f"{field}__startswith": cell})
+    return query
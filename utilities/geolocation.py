@@ -0,0 +1,134 @@
+"""IP geolocation of the clients, for the login and password reset
+emails.
+
+Locations are resolved from the local MaxMind database at GEOIP_PATH when
+it is installed. Otherwise the remote provider at IP_API_URL is queried in
+a Celery task, so that a slow provider never blocks a request. Without
+GEOIP_PATH the first lookup of an address, e.g. the first login from a new
+network, therefore returns "Unknown" while the location is resolved in the
+background, and later lookups return it. Resolved locations are cached in
+Redis and in an in-process LRU cache.
+"""
+import ipaddress
+import logging
+import os
+from functools import lru_cache
+
+import requests
+from celery import current_app as app
+from django.conf import settings
+from django.core.cache import cache
+
+from utilities.cache import LocalCache
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN = "Unknown"
+
+local_location_cache = LocalCache(maxsize=4096, timeout=3600)
+
+
+def location_cache_key(ip):
+    """Returns the cache key of the location of an IP address."""
+    return f"ip_location:{ip}"
+
+
+def format_location(city, region, country):
+    """Returns the location as "city, region, country", skipping blanks."""
+    return ", ".join(part for part in (city, region, country) if part)
+
+
+@lru_cache(maxsize=None)
+def get_reader():
+    """Returns the reader of the local MaxMind database, or None when it is
+    not installed."""
+    if not settings.GEOIP_PATH or not os.path.exists(settings.GEOIP_PATH):
+        return None
+    try:
+        import geoip2.database
+    except ImportError:
+        logger.warning("geoip2 is not installed, GEOIP_PATH is ignored.")
+        return None
+    return geoip2.database.Reader(settings.GEOIP_PATH)
+
+
+def lookup_local(reader, ip):
+    """Returns the location of an IP address in the local database."""
+    import geoip2.errors
+
+    try:
+        response = reader.city(ip)
+    except geoip2.errors.AddressNotFoundError:
+        return UNKNOWN
+    return (
+        format_location(
+            response.city.name,
+            response.subdivisions.most_specific.name,
+            response.country.name,
+        )
+        or UNKNOWN
+    )
+
+
+def lookup_remote(ip):
+    """Returns the location of an IP address from the remote provider."""
+    response = requests.get(
+        settings.IP_API_URL.format(ip=ip), timeout=settings.IP_API_TIMEOUT
+    )
+    data = response.json()
+    return (
+        format_location(
+            data.get("city"), data.get("region"), data.get("country_name")
+        )
+        or UNKNOWN
+    )
+
+
+def is_public(ip):
+    """Returns whether an IP address can be located."""
+    try:
+        return ipaddress.ip_address(ip).is_global
+    except ValueError:
+        return False
+
+
+def get_location(ip):
+    """Returns the location of an IP address.
+
+    The lookup never waits on the remote provider: on a cache miss without
+    a local database, the location is resolved in the background and
+    "Unknown" is returned.
+    """
+    if not ip or not is_public(ip):
+        return UNKNOWN
+    location = local_location_cache.get(ip)
+    if location:
+        return location
+    key = location_cache_key(ip)
+    location = cache.get(key)
+    if location is None:
+        reader = get_reader()
+        if not reader:
+            if settings.IP_API_URL and cache.add(f"{key}:pending", 1, 60):
+                resolve_location.delay(ip)
+            return UNKNOWN
+        location = lookup_local(reader, ip)
+        cache.set(key, location, settings.GEOLOCATION_CACHE_TIMEOUT)
+    local_location_cache.set(ip, location)
+    return location
+
+
+@app.task(name="resolve_location")
+def resolve_location(ip):
+    """Resolve the location of an IP address from the remote provider and
+    cache it."""
+    key = location_cache_key(ip)
+    try:
+        location = lookup_remote(ip)
+        timeout = settings.GEOLOCATION_CACHE_TIMEOUT
+    except (requests.RequestException, ValueError, AttributeError) as e:
+        logger.info(f"IP geolocation failed: {e}")
+        location, timeout = UNKNOWN, 600
+    cache.set(key, location, timeout)
+    cache.delete(f"{key}:pending")
+    return location
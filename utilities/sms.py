@@ -1,34 +1,78 @@
 """Celery function to send sms."""
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
 import boto3
 from celery import current_app as app
 from django.conf import settings
 from sentry_sdk import capture_exception
 
 
-@app.task(name="send_sms", queue="high")
-def send_sms(phone_number: str, message: str):
-    """Function to send SMS."""
-    if not phone_number:
-        return False
+@lru_cache(maxsize=None)
+def get_sns_client():
+    """Returns the SNS client of the worker process.
+
+    boto3 clients are thread safe, the client is shared by the threads
+    sending bulk SMSs.
+    """
+    session = boto3.session.Session(
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_DEFAULT_REGION,
+    )
+    return session.client("sns")
 
+
+def publish_sms(phone_number: str, message: str):
+    """Send an SMS.
+
+    Returns:
+        SMSAlerts: Unsaved record of the SMS, with the response of SNS or
+            the error.
+    """
     from v1.notifications.models import SMSAlerts
 
-    sms = SMSAlerts.objects.create(phone=phone_number, message=message)
+    sms = SMSAlerts(phone=phone_number, message=message)
     try:
-        session = boto3.session.Session(
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_DEFAULT_REGION,
-        )
-        sns = session.client("sns")
-
         # publish the message to the phone number
-        response = sns.publish(PhoneNumber=phone_number, Message=message)
-        sms.response = response
-        sms.save()
-        return response["MessageId"]
+        sms.response = get_sns_client().publish(
+            PhoneNumber=phone_number, Message=message
+        )
     except Exception as e:
         capture_exception(e)
         sms.response_text = str(e)
-        sms.save()
-        return None
+    return sms
+
+
+@app.task(name="send_sms", queue="high")
+def send_sms(phone_number: str, message: str):
+    """Function to send SMS."""
+    if not phone_number:
+        return False
+
+    sms = publish_sms(phone_number, message)
+    sms.save()
+    return sms.response["MessageId"] if sms.response else None
+
+
+@app.task(name="send_bulk_sms", queue="high")
+def send_bulk_sms(messages: list):
+    """Send SMSs concurrently, at most SMS_CONCURRENCY at a time.
+
+    Args:
+        messages: List of (phone number, message) pairs.
+
+    Returns:
+        list: The SNS message ids, None for the SMSs that failed.
+    """
+    from v1.notifications.models import SMSAlerts
+
+    messages = [(phone, message) for phone, message in messages if phone]
+    if not messages:
+        return []
+    with ThreadPoolExecutor(max_workers=settings.SMS_CONCURRENCY) as executor:
+        alerts = list(executor.map(lambda pair: publish_sms(*pair), messages))
+    SMSAlerts.objects.bulk_create(alerts)
+    return [
+        sms.response["MessageId"] if sms.response else None for sms in alerts
+    ]
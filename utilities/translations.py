@@ -4,16 +4,39 @@ from django.utils import translation
 from django.utils.translation import gettext_lazy as _
 
 
-def internationalize_attribute(obj, field_name, text, params=None):
-    """Function to set values for a field with localization enabled."""
+def translate_attribute(field_name, text, params=None):
+    """Render a text in every language of the project.
+
+    Args:
+        field_name(str): Name of the translated field.
+        text(str|callable): Text, or callable returning the text, rendered
+            with each language activated.
+        params(dict): Format parameters of the text.
+
+    Returns:
+        dict: The rendered text keyed by the localized field name, e.g.
+            ``{"title_en": ..., "title_nl": ...}``.
+    """
     curr_language = translation.get_language()
     params = params or {}
-    for language in settings.LANGUAGES:
-        lang_code = language[0]
-        field_suffix = lang_code.replace("-", "_")
-        locale_field_name = field_name + "_" + field_suffix
-        translation.activate(lang_code)
-        text_final = text() if callable(text) else text
-        locale_text = _(text_final).format(**params)
+    values = {}
+    try:
+        for language in settings.LANGUAGES:
+            lang_code = language[0]
+            field_suffix = lang_code.replace("-", "_")
+            translation.activate(lang_code)
+            text_final = text() if callable(text) else text
+            values[field_name + "_" + field_suffix] = _(text_final).format(
+                **params
+            )
+    finally:
+        translation.activate(curr_language)
+    return values
+
+
+def internationalize_attribute(obj, field_name, text, params=None):
+    """Function to set values for a field with localization enabled."""
+    for locale_field_name, locale_text in translate_attribute(
+        field_name, text, params
+    ).items():
         setattr(obj, locale_field_name, locale_text)
-    translation.activate(curr_language)
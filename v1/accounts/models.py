@@ -1,10 +1,13 @@
 """Models of the app Accounts."""
 import datetime
+import uuid
 
 import pendulum
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser as DjangoAbstractUser
+from django.core.cache import cache
 from django.db import models
+from django.db import transaction
 from django.utils import timezone
 from django.utils.crypto import get_random_string
 from django.utils.translation import gettext_lazy as _
@@ -12,9 +15,9 @@ from django.utils.translation import gettext_lazy as _
 from base.db import utilities as db_utils
 from base.db.models import AbstractBaseModel
 from utilities import functions as util_functions
+from utilities.cache import LocalCache
 from v1.accounts import constants as user_consts
 from v1.apiauth import notifications
-from v1.supply_chains import constants as sc_constants
 
 
 class CustomUser(DjangoAbstractUser, AbstractBaseModel):
@@ -147,22 +150,47 @@ class CustomUser(DjangoAbstractUser, AbstractBaseModel):
         return f"{self.get_full_name()}"
 
     def get_default_entity(self):
-        """Get the default entity."""
-        def_entity = self.default_entity
-        if not def_entity or def_entity not in self.entities.all():
-            self.default_entity = self.entities.all().first()
-            self.save()
+        """Get the default entity.
+
+        Falls back to the first entity of the user, when the default
+        entity is not set or the user is no longer a member of it.
+        """
+        entity = None
+        if self.default_entity_id:
+            entity = self.entities.filter(pk=self.default_entity_id).first()
+        if not entity:
+            entity = self.entities.all().first()
+            self.update_values(default_entity=entity)
+        self.default_entity = entity
         return self.default_entity
 
     def set_default_entity(self, entity):
         """Set the default entity."""
-        if self.status == user_consts.UserStatus.ACTIVE:
-            entity.status = sc_constants.EntityStatus.ACTIVE
-            entity.save()
-        self.default_entity = entity
-        self.save()
+        self.update_values(default_entity=entity)
         return self.default_entity
 
+    def update_values(self, **values):
+        """Write the given field values with a single UPDATE, skipped when
+        every value is already set on the instance.
+
+        Returns:
+            bool: True if the values were written.
+        """
+        changed = {
+            name: value
+            for name, value in values.items()
+            if getattr(self, self._meta.get_field(name).attname)
+            != getattr(value, "pk", value)
+        }
+        if not changed:
+            return False
+        for name, value in changed.items():
+            setattr(self, name, value)
+        CustomUser.objects.filter(pk=self.pk).update(
+            **changed, updated_on=timezone.now()
+        )
+        return True
+
     def reset_password(self, ip="", location="", device=""):
         """Function to set password."""
         token = ValidationToken.initialize(
@@ -180,19 +208,13 @@ class CustomUser(DjangoAbstractUser, AbstractBaseModel):
 
     def set_active(self):
         """Set status of the account."""
-        self.status = user_consts.UserStatus.ACTIVE
-        self.save()
-        def_entity = self.get_default_entity()
-        def_entity.status = sc_constants.EntityStatus.ACTIVE
-        def_entity.joined_on = pendulum.now()
-        def_entity.save()
+        self.update_values(status=user_consts.UserStatus.ACTIVE)
 
     @property
     def policy_accepted(self):
         """Return privacy info related to the user."""
-        if self.accepted_policy == PrivacyPolicy.current_privacy_policy():
-            return True
-        return False
+        policy = PrivacyPolicy.current_privacy_policy()
+        return self.accepted_policy_id == (policy.pk if policy else None)
 
     def make_force_logout(self):
         """Method makes force logout true."""
@@ -202,8 +224,7 @@ class CustomUser(DjangoAbstractUser, AbstractBaseModel):
 
     def disable_force_logout(self):
         """Method to make force logout false."""
-        self.force_logout = False
-        self.save()
+        self.update_values(force_logout=False)
         return True
 
     def get_notification_pref(self, notif_manager):
@@ -231,11 +252,7 @@ class CustomUser(DjangoAbstractUser, AbstractBaseModel):
 
     def is_device_active(self, registration_id):
         """Check if user has active device."""
-        return (
-            UserDevice.active_devices(self)
-            .filter(registration_id=registration_id)
-            .exists()
-        )
+        return registration_id in UserDevice.active_registration_ids(self.pk)
 
 
 class ValidationToken(AbstractBaseModel):
@@ -405,6 +422,13 @@ class ValidationToken(AbstractBaseModel):
         return True
 
 
+local_device_cache = LocalCache(
+    maxsize=4096, timeout=settings.DEVICE_LOCAL_CACHE_TIMEOUT
+)
+local_policy_cache = LocalCache(maxsize=8, timeout=300)
+PRIVACY_POLICY_VERSION_KEY = "privacy_policy_version"
+
+
 # class UserDevice(AbstractFCMDevice, AbstractBaseModel):
 class UserDevice(AbstractBaseModel):
     """Class for user devices.
@@ -468,11 +492,63 @@ class UserDevice(AbstractBaseModel):
         verbose_name = _("User device")
         verbose_name_plural = _("User devices")
 
+    def save(self, *args, **kwargs):
+        """Refresh the cached active devices of the user after saving."""
+        super().save(*args, **kwargs)
+        if self.user_id:
+            self.refresh_device_cache(self.user_id)
+
     def deactivate(self, types=user_consts.MOBILE_DEVICE_TYPES):
         """To deactivate this device."""
         self.active = False
         self.save()
 
+    @staticmethod
+    def device_cache_key(user_id):
+        """Returns the cache key of the active devices of a user."""
+        return f"active_devices:{user_id}"
+
+    @classmethod
+    def active_registration_ids(cls, user_id):
+        """Returns the registration ids of the active devices of a user.
+
+        The set is read from a short-lived in-process cache, then from the
+        shared cache, and is only loaded from the database on a miss.
+        """
+        key = cls.device_cache_key(user_id)
+        registration_ids = local_device_cache.get(key)
+        if registration_ids is None:
+            registration_ids = cache.get(key)
+            if registration_ids is None:
+                registration_ids = cls._load_registration_ids(user_id)
+            local_device_cache.set(key, registration_ids)
+        return registration_ids
+
+    @classmethod
+    def refresh_device_cache(cls, user_id):
+        """Drop the cached active devices of a user, and reload them once
+        the current transaction is committed."""
+        key = cls.device_cache_key(user_id)
+        local_device_cache.delete(key)
+        cache.delete(key)
+        transaction.on_commit(lambda: cls._load_registration_ids(user_id))
+
+    @classmethod
+    def _load_registration_ids(cls, user_id):
+        """Load the active devices of a user from the database into the
+        shared cache."""
+        registration_ids = frozenset(
+            cls.objects.filter(user_id=user_id, active=True).values_list(
+                "registration_id", flat=True
+            )
+        )
+        cache.set(
+            cls.device_cache_key(user_id),
+            registration_ids,
+            settings.DEVICE_CACHE_TIMEOUT,
+        )
+        return registration_ids
+
     @classmethod
     def active_devices(cls, user):
         """List users active devices."""
@@ -484,9 +560,10 @@ class UserDevice(AbstractBaseModel):
     @classmethod
     def deactivate_devices(cls, user):
         """Deactivate all devices of a user."""
-        devices = cls.active_devices(user)
-        for device in devices:
-            device.deactivate()
+        cls.active_devices(user).update(
+            active=False, updated_on=timezone.now()
+        )
+        cls.refresh_device_cache(user.pk)
 
     @classmethod
     def get_device_with_device_id(cls, device_id, user):
@@ -530,11 +607,50 @@ class PrivacyPolicy(AbstractBaseModel):
         """Return latest privacy policy."""
         return PrivacyPolicy.objects.latest("id")
 
+    def save(self, *args, **kwargs):
+        """Invalidate the cached current policy of every process once the
+        change is committed."""
+        super().save(*args, **kwargs)
+        transaction.on_commit(PrivacyPolicy.bump_cache_version)
+
+    def delete(self, *args, **kwargs):
+        """Invalidate the cached current policy of every process once the
+        deletion is committed."""
+        result = super().delete(*args, **kwargs)
+        transaction.on_commit(PrivacyPolicy.bump_cache_version)
+        return result
+
+    @staticmethod
+    def cache_version():
+        """Returns the version token of the cached policies, kept in the
+        shared cache."""
+        version = cache.get(PRIVACY_POLICY_VERSION_KEY)
+        if version is None:
+            cache.add(PRIVACY_POLICY_VERSION_KEY, uuid.uuid4().hex, None)
+            version = cache.get(PRIVACY_POLICY_VERSION_KEY)
+        return version
+
+    @staticmethod
+    def bump_cache_version():
+        """Invalidate the cached policies of every process."""
+        cache.delete(PRIVACY_POLICY_VERSION_KEY)
+
     @staticmethod
     def current_privacy_policy():
-        """Return current privacy policy."""
-        policies = PrivacyPolicy.objects.exclude(
-            since__gt=datetime.date.today()
-        )
-        if policies.exists():
-            return policies.latest("version")
+        """Return current privacy policy.
+
+        The policy is cached in-process for a few minutes, keyed by date
+        and by the version token in the shared cache, since it is read on
+        every login and token refresh.
+        """
+        today = datetime.date.today()
+        key = ("current_privacy_policy", today, PrivacyPolicy.cache_version())
+        policy = local_policy_cache.get(key, False)
+        if policy is False:
+            policy = (
+                PrivacyPolicy.objects.exclude(since__gt=today)
+                .order_by("-version")
+                .first()
+            )
+            local_policy_cache.set(key, policy)
+        return policy
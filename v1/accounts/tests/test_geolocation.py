@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import requests
+from django.core.cache import cache
+from django.test import TestCase
+from django.test import override_settings
+
+from utilities import geolocation
+
+
+@override_settings(IP_API_URL="https://ip.example.com/{ip}")
+class GeolocationTestCase(TestCase):
+    ip = "8.8.8.8"
+    location = "Amsterdam, North Holland, Netherlands"
+
+    def setUp(self):
+        key = geolocation.location_cache_key(self.ip)
+        cache.delete_many([key, f"{key}:pending"])
+        geolocation.local_location_cache.clear()
+        self.addCleanup(geolocation.local_location_cache.clear)
+
+    def test_private_addresses_are_unknown(self):
+        self.assertEqual(geolocation.get_location("10.0.0.1"), "Unknown")
+        self.assertEqual(geolocation.get_location(""), "Unknown")
+
+    @mock.patch.object(geolocation, "get_reader")
+    def test_local_database(self, get_reader):
+        reader = get_reader.return_value
+        reader.city.return_value = SimpleNamespace(
+            city=SimpleNamespace(name="Amsterdam"),
+            subdivisions=SimpleNamespace(
+                most_specific=SimpleNamespace(name="North Holland")
+            ),
+            country=SimpleNamespace(name="Netherlands"),
+        )
+
+        self.assertEqual(geolocation.get_location(self.ip), self.location)
+        self.assertEqual(geolocation.get_location(self.ip), self.location)
+        reader.city.assert_called_once_with(self.ip)
+
+    @mock.patch.object(geolocation, "get_reader", return_value=None)
+    @mock.patch.object(geolocation.resolve_location, "delay")
+    def test_remote_lookup_in_background(self, delay, get_reader):
+        # The first lookup does not wait for the provider.
+        self.assertEqual(geolocation.get_location(self.ip), "Unknown")
+        self.assertEqual(geolocation.get_location(self.ip), "Unknown")
+        delay.assert_called_once_with(self.ip)
+
+        with mock.patch.object(geolocation.requests, "get") as get:
+            get.return_value.json.return_value = {
+                "city": "Amsterdam",
+                "region": "North Holland",
+                "country_name": "Netherlands",
+            }
+            geolocation.resolve_location(self.ip)
+        get.assert_called_once_with(
+            "https://ip.example.com/8.8.8.8", timeout=mock.ANY
+        )
+        self.assertEqual(geolocation.get_location(self.ip), self.location)
+
+    @mock.patch.object(geolocation, "get_reader", return_value=None)
+    def test_failed_remote_lookup_is_unknown(self, get_reader):
+        with mock.patch.object(
+            geolocation.requests, "get", side_effect=requests.Timeout
+        ):
+            location = geolocation.resolve_location(self.ip)
+        self.assertEqual(location, "Unknown")
+        self.assertEqual(geolocation.get_location(self.ip), "Unknown")
@@ -12,6 +12,23 @@ class AuthTestCase(BaseTestCase):
         self.assertTrue(self.access_token)
         self.assertTrue(self.refresh_token)
 
+    def test_login_names_device_from_user_agent(self):
+        user_agent = (
+            "Mozilla/5.0 (iPhone; CPU iPhone OS 16_5 like Mac OS X) "
+            "AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148"
+        )
+        data = {
+            "username": self.email,
+            "password": self.password,
+            "device_id": self.device_id,
+        }
+        response = self.client.post(
+            reverse("login"), data, HTTP_USER_AGENT=user_agent
+        )
+        self.assertEqual(response.status_code, 200)
+        device = self.user.devices.get(registration_id=self.device_id)
+        self.assertIn("iPhone", device.device_name)
+
     def test_refresh(self):
         self.login()
         self.refresh()
@@ -39,6 +56,16 @@ class AuthTestCase(BaseTestCase):
         self.assertEqual(response.status_code, 200)
         self.password = new_passsword
 
+    def test_logout_deactivates_device(self):
+        url = reverse("farmers-list")
+        response = self.client.get(url, **self.headers)
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.post(reverse("logout"), **self.headers)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url, **self.headers)
+        self.assertEqual(response.status_code, 403)
+
     def test_reset_password(self):
         url = reverse("password_reset")
         data = {"email": self.email}
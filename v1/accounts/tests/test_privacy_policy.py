@@ -0,0 +1,45 @@
+import datetime
+
+from mixer.backend.django import mixer
+
+from v1.accounts.models import PrivacyPolicy
+from v1.accounts.models import local_policy_cache
+from v1.accounts.tests.base import BaseTestCase
+
+
+class PrivacyPolicyTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        local_policy_cache.clear()
+        self.addCleanup(local_policy_cache.clear)
+        self.yesterday = datetime.date.today() - datetime.timedelta(days=1)
+
+    def test_current_policy_follows_committed_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            policy = mixer.blend(
+                PrivacyPolicy, version=1001, since=self.yesterday
+            )
+        self.assertEqual(PrivacyPolicy.current_privacy_policy(), policy)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            newer = mixer.blend(
+                PrivacyPolicy, version=1002, since=self.yesterday
+            )
+            # Not visible to other processes before the commit.
+            self.assertEqual(PrivacyPolicy.current_privacy_policy(), policy)
+        self.assertEqual(PrivacyPolicy.current_privacy_policy(), newer)
+
+    def test_other_processes_see_the_new_version(self):
+        policy = mixer.blend(PrivacyPolicy, version=1001, since=self.yesterday)
+        PrivacyPolicy.bump_cache_version()
+        self.assertEqual(PrivacyPolicy.current_privacy_policy(), policy)
+
+        # A change committed by another process only replaces the version
+        # token in the shared cache.
+        PrivacyPolicy.objects.filter(pk=policy.pk).update(version=999)
+        newer = PrivacyPolicy.objects.create(
+            version=1000, since=self.yesterday
+        )
+        self.assertEqual(PrivacyPolicy.current_privacy_policy(), policy)
+        PrivacyPolicy.bump_cache_version()
+        self.assertEqual(PrivacyPolicy.current_privacy_policy(), newer)
@@ -10,3 +10,12 @@ class AuthConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "v1.apiauth"
+
+    def ready(self):
+        """Connect the signals of the app and resolve the authentication
+        classes, so requests do not import them."""
+        from base.authentication import CustomDynamicAuthentication
+
+        from . import signals  # noqa: F401
+
+        CustomDynamicAuthentication.get_auth_classes()
@@ -1,9 +1,20 @@
 import uuid
 from datetime import datetime
 
+from django.core.cache import cache
 from django.db import models
 
 from base.db.models import AbstractBaseModel
+from base.sso.settings import sso_settings
+from utilities.cache import LocalCache
+
+# A deleted session is only dropped from the local cache of the process
+# deleting it, other processes serve it for up to LOCAL_CACHE_TIMEOUT
+# seconds.
+local_session_cache = LocalCache(
+    maxsize=sso_settings.LOCAL_CACHE_SIZE,
+    timeout=sso_settings.LOCAL_CACHE_TIMEOUT,
+)
 
 
 class AuthSession(AbstractBaseModel):
@@ -27,6 +38,51 @@ class AuthSession(AbstractBaseModel):
     def __str__(self):
         return f"Session {self.session_token} (Valid until {self.expires_at})"
 
+    @staticmethod
+    def cache_key(client_nonce, server_nonce):
+        """Returns the cache key of the session of a nonce pair."""
+        return f"auth_session:{client_nonce}:{server_nonce}"
+
+    @classmethod
+    def get_for_nonces(cls, client_nonce, server_nonce):
+        """
+        Returns the session matching the nonces, or None.
+
+        Sessions do not change once created, so they are served from an
+        in-process LRU cache, then from the shared cache, before querying
+        the database. The returned instance is rebuilt from cached fields.
+        A deleted session is dropped from both caches, but other processes
+        keep serving it from their local cache for up to
+        LOCAL_CACHE_TIMEOUT seconds.
+        """
+        key = cls.cache_key(client_nonce, server_nonce)
+        state = local_session_cache.get(key)
+        if state is None:
+            state = cache.get(key)
+        if state is None:
+            session = cls.objects.filter(
+                client_nonce=client_nonce, server_nonce=server_nonce
+            ).first()
+            if not session:
+                return None
+            state = {
+                "id": session.id,
+                "session_token": session.session_token,
+                "client_nonce": session.client_nonce,
+                "server_nonce": session.server_nonce,
+                "device_id": session.device_id,
+                "expires_at": session.expires_at,
+            }
+            cache.set(key, state, sso_settings.CACHE_TIMEOUT)
+        local_session_cache.set(key, state)
+        return cls(**state)
+
+    def clear_cache(self):
+        """Removes the session from the local and shared caches."""
+        key = self.cache_key(self.client_nonce, self.server_nonce)
+        local_session_cache.delete(key)
+        cache.delete(key)
+
     def validate_session_token(session_token, client_nonce):
         """
         Validate that the session token is valid and matches the provided client_nonce.
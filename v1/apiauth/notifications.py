@@ -22,6 +22,8 @@ class PasswordResetNotificationManager(BaseNotificationManager):
     sms: dict = {"__all__": NotificationCondition.DISABLED}
 
     email_template: str = "reset_password.html"
+    personalized: bool = False
+    uses_token: bool = True
 
     def get_title(self) -> str:
         """Get the title for the password reset email notification.
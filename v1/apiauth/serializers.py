@@ -49,7 +49,7 @@ class APILoginSerializer(TokenObtainPairSerializer):
         and entity are added into the response."""
         self.device_id = attrs.get("device_id", None)
         force_logout = attrs.get("force_logout", False)
-        device_name = attrs.get("device_name", "")
+        device_name = attrs.get("device_name") or self.request_device_name()
         device_loc = attrs.get("device_loc", "")
         version = attrs.get("version", "")
 
@@ -71,6 +71,13 @@ class APILoginSerializer(TokenObtainPairSerializer):
 
         return data
 
+    def request_device_name(self):
+        """Describe the device from the user agent of the request."""
+        request = self.context.get("request")
+        if not request:
+            return ""
+        return util_functions.device_name_from_request(request)
+
     def get_token(self, user):
         """Get token for the user."""
         self.entity = user.get_default_entity()
@@ -100,22 +107,30 @@ class APILoginSerializer(TokenObtainPairSerializer):
         return token
 
     def _get_or_create_device(self, device_name, device_loc, version=None):
-        """Get or create device for user."""
-        device, created = self.user.devices.get_or_create(
-            registration_id=self.device_id, user=self.user
-        )
-        if not created:
-            device.active = True
-        device.device_name = device_name
-        device.device_loc = device_loc
+        """Get or create device for user.
+
+        An existing device is updated with a single conditional UPDATE,
+        which is skipped when the stored values are already current.
+        """
+        values = {
+            "active": True,
+            "device_name": device_name,
+            "device_loc": device_loc,
+        }
         if version:
-            device.version = version
-        device.save()
-        return device
+            values["version"] = version
+        devices = self.user.devices.filter(registration_id=self.device_id)
+        updated = devices.exclude(**values).update(
+            **values, updated_on=timezone.now()
+        )
+        if updated:
+            UserDevice.refresh_device_cache(self.user.pk)
+        elif not devices.exists():
+            self.user.devices.create(registration_id=self.device_id, **values)
 
     def check_multiple_login(self, data, force_logout):
         """Check if user is already logged in on another device."""
-        if not self.entity.company.allow_multiple_login:
+        if not self.entity.allow_multiple_login:
             if force_logout:
                 UserDevice.deactivate_devices(self.user)
 
@@ -172,8 +187,10 @@ class TokenRefreshSerializer(SJWTTokenRefreshSerializer):
         data["expires_in"] = int(expires_in if expires_in > 0 else 0)
 
         data["member_type"] = entity_member.type
-        data["policy_accepted"] = user.policy_accepted
         policy = PrivacyPolicy.current_privacy_policy()
+        data["policy_accepted"] = user.accepted_policy_id == (
+            policy.pk if policy else None
+        )
         data["current_policy"] = policy.id.hashid if policy else None
         return data
 
@@ -386,6 +403,7 @@ class AuthHandshakeSerializer(serializers.Serializer):
             "is_registered": False,
             "device_id": "",
             "type": "",
+            "device_name": "",
             "status": "not_registered",
         }
         device = UserDevice.objects.filter(
@@ -397,10 +415,16 @@ class AuthHandshakeSerializer(serializers.Serializer):
             device_info["is_registered"] = True
             device_info["device_id"] = device.registration_id
             device_info["type"] = device.type
+            device_info["device_name"] = device.device_name or ""
             device_info["status"] = "active" if device.active else "deactivated"
         else:
             device_info["device_id"] = validated_data["device_id"]
             device_info["type"] = validated_data["type"]
+            request = self.context.get("request")
+            if request:
+                device_info["device_name"] = (
+                    util_functions.device_name_from_request(request)
+                )
         return device_info
 
     def validate_nonce(self, value):
@@ -499,7 +523,7 @@ class AuthDeviceRegistrationSerializer(UserDeviceSerializer):
         if session_device != attrs["registration_id"]:
             raise serializers.ValidationError({"device_id": _("Invalid device_id.")})
         entity = attrs["user"].get_default_entity()
-        if not entity.company.allow_multiple_login:
+        if not entity.allow_multiple_login:
             if self.check_multiple_login(attrs):
                 raise serializers.ValidationError({"device_id": _("User is already logged in another device.")})
         return super().validate(attrs)
@@ -0,0 +1,30 @@
+"""Signals to keep the cached SSO session and blacklist state in sync.
+
+The blacklist cache is cleared once the change is committed. A request
+reading the token before the commit would otherwise cache the old state
+again.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from base.sso.tokens import blacklist_cache_key
+from v1.apiauth.models import AuthSession
+
+
+@receiver(post_delete, sender=AuthSession)
+def clear_session_cache(sender, instance, **kwargs):
+    """Drop a deleted session from the cache."""
+    instance.clear_cache()
+
+
+@receiver(post_save, sender=BlacklistedToken)
+@receiver(post_delete, sender=BlacklistedToken)
+def clear_blacklist_cache(sender, instance, **kwargs):
+    """Drop the cached blacklist state of a token, when it is blacklisted
+    or removed from the blacklist outside of `blacklist()`."""
+    key = blacklist_cache_key(instance.token.jti)
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,68 @@
+import uuid
+
+from django.core.cache import cache
+from mixer.backend.django import mixer
+
+from base.authentication.utilities import get_session_membership
+from base.authentication.utilities import membership_cache_key
+from base.exceptions import custom_exceptions as exceptions
+from v1.accounts.tests.base import BaseTestCase
+from v1.apiauth.models import AuthSession
+from v1.apiauth.models import local_session_cache
+from v1.supply_chains.models.company_models import CompanyMember
+
+
+class AuthSessionCacheTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        local_session_cache.clear()
+        self.addCleanup(local_session_cache.clear)
+        self.session = mixer.blend(
+            AuthSession, client_nonce=str(uuid.uuid4())
+        )
+        self.nonces = (self.session.client_nonce, self.session.server_nonce)
+
+    def test_sessions_are_cached(self):
+        with self.assertNumQueries(1):
+            AuthSession.get_for_nonces(*self.nonces)
+        with self.assertNumQueries(0):
+            session = AuthSession.get_for_nonces(*self.nonces)
+        self.assertEqual(session.session_token, self.session.session_token)
+
+        # Other processes read the shared cache.
+        local_session_cache.clear()
+        with self.assertNumQueries(0):
+            AuthSession.get_for_nonces(*self.nonces)
+
+    def test_revoked_session_is_dropped(self):
+        AuthSession.get_for_nonces(*self.nonces)
+        self.session.delete()
+
+        self.assertIsNone(AuthSession.get_for_nonces(*self.nonces))
+
+
+class SessionMembershipCacheTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.member = CompanyMember.objects.get(
+            company=self.company, user=self.user
+        )
+        self.member.is_active = True
+        self.member.save()
+        cache.delete(membership_cache_key(self.user.pk))
+
+    def test_membership_is_cached(self):
+        membership = get_session_membership(self.user)
+        self.assertEqual(membership["entity_id"], self.company.id.hashid)
+        self.assertEqual(membership["member_type"], self.member.type)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_session_membership(self.user), membership)
+
+    def test_removed_member_is_logged_out(self):
+        get_session_membership(self.user)
+        self.member.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.member.save()
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            get_session_membership(self.user)
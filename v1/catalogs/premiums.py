@@ -0,0 +1,212 @@
+"""Server-side calculation of the premiums of transactions.
+
+The active transaction premiums of a company are compiled into a
+PremiumEngine, which computes the premiums of any number of transactions
+in one call without further queries. Premium ranges are kept in sorted
+arrays searched with bisect and premium options in dicts.
+
+Compiled engines are cached in the worker process per company premium
+version. The version is a token in the shared cache, which is replaced
+when a change to a premium, option, range or company product of the company
+is committed, so that every process recompiles on its next call.
+"""
+import uuid
+from bisect import bisect_right
+
+from django.core.cache import cache
+
+from utilities.cache import LocalCache
+from v1.catalogs import constants
+from v1.catalogs.models.product_models import Premium
+from v1.supply_chains.models.company_models import CompanyProduct
+
+engine_cache = LocalCache(maxsize=128, timeout=3600)
+
+
+def premium_version_key(company_id):
+    """Returns the cache key of the premium version of a company."""
+    return f"premium_version:{company_id}"
+
+
+def get_premium_version(company_id):
+    """Returns the current premium version token of a company."""
+    key = premium_version_key(company_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def bump_premium_version(company_id):
+    """Invalidate the compiled premiums of a company.
+
+    Call it with transaction.on_commit, so that the premiums are not
+    recompiled from rows the change has not committed yet.
+    """
+    if company_id:
+        cache.delete(premium_version_key(company_id))
+
+
+def get_premium_engine(company_id):
+    """Returns the premium engine of a company, compiling it if the premiums
+    of the company changed since it was cached."""
+    key = (str(company_id), get_premium_version(company_id))
+    engine = engine_cache.get(key)
+    if engine is None:
+        engine = PremiumEngine.compile(company_id)
+        engine_cache.set(key, engine)
+    return engine
+
+
+class CompiledPremium:
+    """A premium with its options and ranges, ready for evaluation.
+
+    The ranges of a premium are expected not to overlap. A value matches
+    the range with the greatest start not above it, if the value is also
+    within the end of that range.
+    """
+
+    __slots__ = (
+        "id",
+        "type",
+        "calculation_type",
+        "amount",
+        "dependant_on_card",
+        "activity",
+        "options",
+        "starts",
+        "ends",
+        "amounts",
+    )
+
+    def __init__(self, premium):
+        self.id = premium.pk
+        self.type = premium.type
+        self.calculation_type = premium.calculation_type
+        self.amount = premium.amount or 0.0
+        self.dependant_on_card = premium.dependant_on_card
+        self.activity = premium.applicable_activity
+        self.options = {
+            option.pk: option.amount
+            for option in premium.options.all()
+            if option.is_active
+        }
+        ranges = sorted(premium.ranges.all(), key=lambda r: r.range_from)
+        self.starts = [r.range_from for r in ranges]
+        self.ends = [r.range_to for r in ranges]
+        self.amounts = [r.amount for r in ranges]
+
+    def rate(self, value, option=None):
+        """Returns the premium rate for a value, or None if the premium does
+        not apply."""
+        calculation = constants.PremiumCalculationType
+        if self.calculation_type == calculation.NORMAL:
+            return self.amount
+        if self.calculation_type == calculation.OPTIONS:
+            return self.options.get(option) if option else None
+        if self.calculation_type == calculation.RANGE:
+            index = bisect_right(self.starts, value) - 1
+            if index >= 0 and value <= self.ends[index]:
+                return self.amounts[index]
+        # Manual premiums are entered by the user.
+        return None
+
+    def calculate(self, quantity, amount, option=None):
+        """Returns the premium of a transaction, or None if the premium does
+        not apply.
+
+        Per unit currency premiums are rated on the transaction amount, the
+        other premium types on the quantity.
+        """
+        types = constants.PremiumType
+        if self.type == types.PER_UNIT_CURRENCY:
+            rate = self.rate(amount, option)
+            return None if rate is None else rate * amount
+        rate = self.rate(quantity, option)
+        if rate is None:
+            return None
+        if self.type == types.PER_KG:
+            return rate * quantity
+        return rate
+
+
+class PremiumEngine:
+    """The active transaction premiums of a company, by product."""
+
+    def __init__(self, products):
+        self.products = products
+
+    @classmethod
+    def compile(cls, company_id):
+        """Load and compile the premiums of a company, with three queries."""
+        premiums = {
+            premium.pk: CompiledPremium(premium)
+            for premium in Premium.objects.filter(
+                owner__pk=company_id,
+                is_active=True,
+                category=constants.PremiumCategory.TRANSACTION,
+            ).prefetch_related("options", "ranges")
+        }
+        products = {}
+        rows = CompanyProduct.objects.filter(
+            company__pk=company_id, is_active=True
+        ).values_list("product_id", "premiums__id")
+        for product_id, premium_id in rows:
+            premium = premiums.get(premium_id)
+            if premium:
+                products.setdefault(product_id, []).append(premium)
+        return cls(products)
+
+    def calculate(self, transactions):
+        """Calculate the premiums of transactions.
+
+        Args:
+            transactions: Iterable of dicts with the keys
+                - product: Id of the product.
+                - quantity: Quantity of the transaction.
+                - amount: Amount of the transaction, optional.
+                - card: Whether the transaction is verified with a card.
+                - activity: PremiumActivity of the transaction, BUY by
+                    default.
+                - source: Id of the farmer, optional. Per farmer premiums
+                    are paid once per source within the call, and on
+                    every transaction without a source.
+                - options: Dict of selected option ids by premium id.
+
+        Returns:
+            list: For each transaction, a list of dicts with the premium
+                id and the amount of every premium that applies.
+        """
+        paid_sources = set()
+        results = []
+        for item in transactions:
+            quantity = float(item.get("quantity") or 0)
+            amount = float(item.get("amount") or 0)
+            card = item.get("card", False)
+            activity = item.get("activity", constants.PremiumActivity.BUY)
+            options = item.get("options") or {}
+            source = item.get("source")
+            premiums = []
+            for premium in self.products.get(item["product"], ()):
+                if premium.activity != activity:
+                    continue
+                if premium.dependant_on_card and not card:
+                    continue
+                # Transactions without a source can't be told apart.
+                once_per_source = (
+                    premium.type == constants.PremiumType.PER_FARMER
+                    and source is not None
+                )
+                if once_per_source and (source, premium.id) in paid_sources:
+                    continue
+                value = premium.calculate(
+                    quantity, amount, options.get(premium.id)
+                )
+                if value is None:
+                    continue
+                if once_per_source:
+                    paid_sources.add((source, premium.id))
+                premiums.append({"premium": premium.id, "amount": value})
+            results.append(premiums)
+        return results
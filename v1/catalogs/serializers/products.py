@@ -1,16 +1,56 @@
 from typing import Any, Dict
 
 from django.db import transaction
-from rest_framework.serializers import (CharField, SerializerMethodField,
+from rest_framework.serializers import (BooleanField, CharField, ChoiceField,
+                                        DecimalField, DictField, FloatField,
+                                        Serializer, SerializerMethodField,
                                         ValidationError)
 
-from base.authentication import utilities as utils
+from base.authentication.session import get_from_local
 from base.drf import serializers
+from v1.catalogs.constants import PremiumActivity
 from v1.catalogs.models import product_models
+from v1.catalogs.premiums import get_premium_engine
 from v1.supply_chains.models.base_models import EntityCard
 from v1.supply_chains.models.company_models import CompanyProduct
 
 
+class CompanyProductMap:
+    """Company products of the current entity, by product id.
+
+    The company products and their premium ids are loaded with a single
+    query on the first lookup, and the map is kept in the serializer
+    context for the rest of the request.
+    """
+
+    def __init__(self, entity_id):
+        self.entity_id = entity_id
+        self._products = None
+
+    def _load(self):
+        """Load the company products of the entity."""
+        products = {}
+        if not self.entity_id:
+            return products
+        rows = CompanyProduct.objects.filter(
+            company__pk=self.entity_id
+        ).values_list("product_id", "is_active", "premiums__id")
+        for product_id, is_active, premium_id in rows:
+            item = products.setdefault(
+                product_id, {"is_active": is_active, "premiums": []}
+            )
+            if premium_id:
+                item["premiums"].append(premium_id)
+        return products
+
+    def get(self, product):
+        """Returns the is_active flag and premium ids of the company product
+        of a product, or None if the entity does not have the product."""
+        if self._products is None:
+            self._products = self._load()
+        return self._products.get(product.pk)
+
+
 class ProductSerializer(serializers.DynamicModelSerializer):
     """Serializer for the Product model."""
 
@@ -23,13 +63,12 @@ class ProductSerializer(serializers.DynamicModelSerializer):
 
     def _get_company_product(self, instance):
         """Get the company product associated with the product."""
-        entity = utils.get_current_entity()
-        if not entity:
-            return None
-        try:
-            return CompanyProduct.objects.get(company=entity, product=instance)
-        except CompanyProduct.DoesNotExist:
-            return None
+        context = self.context
+        if "company_products" not in context:
+            context["company_products"] = CompanyProductMap(
+                get_from_local("entity_id")
+            )
+        return context["company_products"].get(instance)
 
     def get_premiums(self, instance):
         """Get the premiums associated with the company product.
@@ -38,7 +77,7 @@ class ProductSerializer(serializers.DynamicModelSerializer):
             list: A list of premiums associated with the product.
         """
         c_product = self._get_company_product(instance)
-        return c_product.premiums.values_list("id", flat=True) if c_product else []
+        return c_product["premiums"] if c_product else []
 
     def get_is_active(self, instance):
         """Get the is_active associated with the company product.
@@ -47,7 +86,7 @@ class ProductSerializer(serializers.DynamicModelSerializer):
             list: A list of is_active associated with the product.
         """
         c_product = self._get_company_product(instance)
-        return c_product.is_active if c_product else False
+        return c_product["is_active"] if c_product else False
 
 
 class ConnectCardSerializer(serializers.DynamicModelSerializer):
@@ -234,3 +273,40 @@ class PremiumSerializer(serializers.DynamicModelSerializer):
         self.fields["options"].create(options)
         self.fields["ranges"].create(ranges)
         return instance
+
+
+class PremiumCalculationItemSerializer(Serializer):
+    """Serializer for a transaction to calculate the premiums of.
+
+    Per farmer premiums are paid once per source among the transactions
+    of a calculation. Transactions without a source are each paid them.
+    """
+
+    product = CharField()
+    quantity = DecimalField(max_digits=25, decimal_places=3)
+    amount = FloatField(required=False, default=0.0)
+    card = BooleanField(required=False, default=False)
+    activity = ChoiceField(
+        choices=PremiumActivity.choices, default=PremiumActivity.BUY
+    )
+    source = CharField(required=False)
+    options = DictField(child=CharField(), required=False, default=dict)
+
+
+class PremiumCalculationSerializer(Serializer):
+    """Serializer to calculate the premiums of transactions of the current
+    entity with its premium engine."""
+
+    transactions = PremiumCalculationItemSerializer(many=True)
+
+    def calculate(self):
+        """Returns the premiums of each transaction."""
+        engine = get_premium_engine(get_from_local("entity_id"))
+        results = engine.calculate(self.validated_data["transactions"])
+        return [
+            [
+                {"premium": str(item["premium"]), "amount": item["amount"]}
+                for item in premiums
+            ]
+            for premiums in results
+        ]
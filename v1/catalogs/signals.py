@@ -0,0 +1,61 @@
+"""Signals of the catalogs app.
+
+The premium version of a company is only bumped once the change is
+committed. Bumping it earlier lets a concurrent request compile the old
+premiums and cache them under the new version.
+"""
+from django.db import transaction
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from v1.catalogs.models.product_models import Premium
+from v1.catalogs.models.product_models import PremiumOption
+from v1.catalogs.models.product_models import PremiumRange
+from v1.catalogs.premiums import bump_premium_version
+from v1.supply_chains.models.company_models import CompanyProduct
+
+
+@receiver(post_save, sender=Premium)
+@receiver(post_delete, sender=Premium)
+def premium_changed(sender, instance, **kwargs):
+    """Invalidate the compiled premiums of the owner of a premium."""
+    owner_id = instance.owner_id
+    transaction.on_commit(lambda: bump_premium_version(owner_id))
+
+
+@receiver(post_save, sender=PremiumOption)
+@receiver(post_delete, sender=PremiumOption)
+@receiver(post_save, sender=PremiumRange)
+@receiver(post_delete, sender=PremiumRange)
+def premium_detail_changed(sender, instance, **kwargs):
+    """Invalidate the compiled premiums when an option or range of a premium
+    changes."""
+    owner_id = (
+        Premium.objects.filter(pk=instance.premium_id)
+        .values_list("owner_id", flat=True)
+        .first()
+    )
+    transaction.on_commit(lambda: bump_premium_version(owner_id))
+
+
+@receiver(post_save, sender=CompanyProduct)
+@receiver(post_delete, sender=CompanyProduct)
+def company_product_changed(sender, instance, **kwargs):
+    """Invalidate the compiled premiums of the company of a product."""
+    company_id = instance.company_id
+    transaction.on_commit(lambda: bump_premium_version(company_id))
+
+
+@receiver(m2m_changed, sender=CompanyProduct.premiums.through)
+def company_product_premiums_changed(sender, instance, action, **kwargs):
+    """Invalidate the compiled premiums when premiums are added to or removed
+    from company products."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if isinstance(instance, CompanyProduct):
+        company_id = instance.company_id
+    else:
+        company_id = instance.owner_id
+    transaction.on_commit(lambda: bump_premium_version(company_id))
@@ -1,12 +1,17 @@
 import json
 
 from django.urls import reverse
+from mixer.backend.django import mixer
 
 from v1.accounts.tests.base import BaseTestCase
 from v1.catalogs.constants import PremiumActivity
 from v1.catalogs.constants import PremiumCalculationType
 from v1.catalogs.constants import PremiumCategory
 from v1.catalogs.constants import PremiumType
+from v1.catalogs.premiums import PremiumEngine
+from v1.catalogs.premiums import get_premium_engine
+from v1.catalogs.premiums import get_premium_version
+from v1.catalogs.serializers.products import CompanyProductMap
 
 
 class CatalogTestCase(BaseTestCase):
@@ -20,6 +25,104 @@ class CatalogTestCase(BaseTestCase):
         response = self.client.get(url, **self.headers)
         self.assertEqual(response.status_code, 200)
 
+    def test_company_product_map(self):
+        products = mixer.cycle(3).blend("catalogs.Product")
+        premium = mixer.blend(
+            "catalogs.Premium",
+            owner=self.company,
+            category=PremiumCategory.TRANSACTION,
+        )
+        company_product = mixer.blend(
+            "supply_chains.CompanyProduct",
+            company=self.company,
+            product=products[0],
+            is_active=True,
+        )
+        company_product.premiums.add(premium)
+        company_products = CompanyProductMap(self.company.pk)
+        with self.assertNumQueries(1):
+            results = [company_products.get(p) for p in products]
+        self.assertEqual(
+            results[0], {"is_active": True, "premiums": [premium.pk]}
+        )
+        self.assertIsNone(results[1])
+
+    def test_premium_engine(self):
+        product = mixer.blend("catalogs.Product")
+        premium = mixer.blend(
+            "catalogs.Premium",
+            owner=self.company,
+            category=PremiumCategory.TRANSACTION,
+            type=PremiumType.PER_KG,
+            calculation_type=PremiumCalculationType.RANGE,
+            applicable_activity=PremiumActivity.BUY,
+            dependant_on_card=False,
+            is_active=True,
+        )
+        mixer.blend(
+            "catalogs.PremiumRange",
+            premium=premium,
+            range_from=0,
+            range_to=100,
+            amount=0.5,
+        )
+        company_product = mixer.blend(
+            "supply_chains.CompanyProduct",
+            company=self.company,
+            product=product,
+            is_active=True,
+        )
+        company_product.premiums.add(premium)
+        transactions = [
+            {"product": product.pk, "quantity": 10},
+            {"product": product.pk, "quantity": 200},
+        ]
+        results = get_premium_engine(self.company.pk).calculate(transactions)
+        self.assertEqual(
+            results, [[{"premium": premium.pk, "amount": 5.0}], []]
+        )
+        with self.assertNumQueries(0):
+            get_premium_engine(self.company.pk)
+
+    def test_per_farmer_premium_once_per_source(self):
+        product = mixer.blend("catalogs.Product")
+        premium = mixer.blend(
+            "catalogs.Premium",
+            owner=self.company,
+            category=PremiumCategory.TRANSACTION,
+            type=PremiumType.PER_FARMER,
+            calculation_type=PremiumCalculationType.NORMAL,
+            applicable_activity=PremiumActivity.BUY,
+            dependant_on_card=False,
+            is_active=True,
+            amount=10.0,
+        )
+        company_product = mixer.blend(
+            "supply_chains.CompanyProduct",
+            company=self.company,
+            product=product,
+            is_active=True,
+        )
+        company_product.premiums.add(premium)
+        transactions = [
+            {"product": product.pk, "quantity": 1, "source": "farmer"},
+            {"product": product.pk, "quantity": 1, "source": "farmer"},
+            {"product": product.pk, "quantity": 1},
+            {"product": product.pk, "quantity": 1},
+        ]
+        results = PremiumEngine.compile(self.company.pk).calculate(
+            transactions
+        )
+        paid = [{"premium": premium.pk, "amount": 10.0}]
+        self.assertEqual(results, [paid, [], paid, paid])
+
+    def test_premium_version_bumped_on_commit(self):
+        version = get_premium_version(self.company.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            mixer.blend("catalogs.Premium", owner=self.company)
+            self.assertEqual(get_premium_version(self.company.pk), version)
+        self.assertNotEqual(get_premium_version(self.company.pk), version)
+
     def test_premium(self):
         url = reverse("premiums-list")
         response = self.client.get(url, **self.headers)
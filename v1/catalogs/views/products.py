@@ -1,3 +1,6 @@
+from rest_framework.decorators import action
+
+from base.request_handler.response import SuccessResponse
 from base.request_handler.views import IDDEcodeScopeViewset
 from v1.catalogs.filters import PremiumFilterSet
 from v1.catalogs.filters import ProductFilterSet
@@ -5,6 +8,7 @@ from v1.catalogs.models.product_models import ConnectCard
 from v1.catalogs.models.product_models import Premium
 from v1.catalogs.models.product_models import Product
 from v1.catalogs.serializers.products import ConnectCardSerializer
+from v1.catalogs.serializers.products import PremiumCalculationSerializer
 from v1.catalogs.serializers.products import PremiumSerializer
 from v1.catalogs.serializers.products import ProductSerializer
 
@@ -36,6 +40,14 @@ class PremiumViewSet(IDDEcodeScopeViewset):
     resource_types = ["catalog"]
     filterset_class = PremiumFilterSet
 
+    @action(methods=("post",), detail=False, url_path="calculate")
+    def calculate(self, request):
+        """Calculate the premiums of transactions of the current entity from
+        their quantities and amounts."""
+        serializer = PremiumCalculationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return SuccessResponse(serializer.calculate())
+
 
 class ConnectCardViewSet(IDDEcodeScopeViewset):
     """A viewset for viewing and creating ConnectCard instances.
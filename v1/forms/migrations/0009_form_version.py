@@ -0,0 +1,18 @@
+# Generated by Django 4.0.4 on 2026-10-19 04:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forms', '0008_formfieldconfig_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='form',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name='Version'),
+        ),
+    ]
@@ -14,6 +14,9 @@ class Form(AbstractBaseModel):
     Attributes:
     - owner (models.ForeignKey): The Company that owns this Form.
     - form_type (models.CharField): The type of the Form.
+    - version (models.PositiveIntegerField): Version of the form definition,
+        bumped on any change of the form, its fields, field configs or
+        products. Rendered definitions are cached per version.
 
     Related Names:
     - reference_forms: A reverse relation to access Forms owned by a Company.
@@ -34,10 +37,40 @@ class Form(AbstractBaseModel):
         default=from_consts.FormType.TRANSACTION,
         verbose_name=_("Form Type"),
     )
+    version = models.PositiveIntegerField(
+        default=1, editable=False, verbose_name=_("Version")
+    )
 
     def __str__(self):
         return f"{self.owner} - {self.form_type}"
 
+    def save(self, *args, **kwargs):
+        """Bump the version of the form definition on changes.
+
+        The version is incremented in the database, so concurrent saves
+        can't bump it to the same value.
+        """
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "version"}
+        self.version = models.F("version") + 1
+        super().save(*args, **kwargs)
+        self.refresh_from_db(fields=["version"])
+
+    @staticmethod
+    def bump_versions(forms):
+        """Bump the version of the given forms, invalidating their cached
+        definitions.
+
+        Args:
+            forms: Queryset, or ids, of the forms.
+        """
+        if not isinstance(forms, models.QuerySet):
+            forms = Form.objects.filter(pk__in=forms)
+        forms.update(version=models.F("version") + 1)
+
     @property
     def products(self):
         """Get the associated product for this form.
@@ -1,6 +1,13 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
+from django.utils import translation
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from base.authentication import utilities as auth_utils
 from base.drf.serializers import DynamicModelSerializer
 from v1.catalogs.serializers.products import ProductSerializer
 from v1.forms.models import (Form, FormField, FormFieldConfig, Submission,
@@ -60,6 +67,52 @@ class FormSerializer(DynamicModelSerializer):
         model = Form
         fields = "__all__"
 
+    @staticmethod
+    def describe(serializer):
+        """Returns the names of the fields rendered by a serializer, nested
+        serializers included."""
+        if isinstance(serializer, serializers.ListSerializer):
+            serializer = serializer.child
+        return tuple(
+            (
+                name,
+                FormSerializer.describe(field)
+                if isinstance(field, serializers.BaseSerializer)
+                else None,
+            )
+            for name, field in serializer.fields.items()
+            if not field.write_only
+        )
+
+    def get_cache_key(self, instance):
+        """Returns the cache key of the rendered definition of a form.
+
+        The key changes with the version of the form, the active language
+        and the fields this serializer renders. The creation time keeps
+        keys apart when a recreated database reuses primary keys.
+        """
+        variant = self.__dict__.get("_variant")
+        if variant is None:
+            variant = hashlib.md5(
+                repr(self.describe(self)).encode()
+            ).hexdigest()
+            self._variant = variant
+        language = translation.get_language()
+        created = int(instance.created_on.timestamp() * 1e6)
+        return (
+            f"form:{instance.pk}:{created}:{instance.version}:"
+            f"{language}:{variant}"
+        )
+
+    def to_representation(self, instance):
+        """Render the form definition, cached per form version."""
+        key = self.get_cache_key(instance)
+        data = cache.get(key)
+        if data is None:
+            data = super().to_representation(instance)
+            cache.set(key, data, settings.FORM_CACHE_TIMEOUT)
+        return data
+
     def create(self, validated_data):
         """Custom creation method for creating Form and associated FormFields.
 
@@ -81,8 +134,8 @@ class FormSerializer(DynamicModelSerializer):
         if instance.form_type == from_consts.FormType.PRODUCT:
             company_products = CompanyProduct.objects.filter(
                 company=instance.owner
-            )
-            [product.forms.add(instance) for product in company_products]
+            ).only("id")
+            CompanyProduct.bulk_add_forms(company_products, [instance])
         return instance
 
 
@@ -103,26 +156,13 @@ class SubmissionValuesSerializer(DynamicModelSerializer):
         model = SubmissionValues
         fields = "__all__"
 
-    def create(self, validated_data):
-        """Create method for the serializer.
-
-        This method handles the creation of an instance, specifically for
-        associating a field with the instance.
 
-        Args:
-            validated_data (dict): The validated data for creating the
-            instance.
+class SubmissionListSerializer(serializers.ListSerializer):
+    """List serializer creating the submissions and their values in bulk."""
 
-        Returns:
-            object: The created instance.
-        """
-        field = validated_data.pop("field")
-        try:
-            field = FormField.objects.get(pk=field)
-        except FormField.DoesNotExist:
-            field = FormField.objects.get(key=field, form=validated_data["submission"].form)
-        validated_data["field"] = field
-        return super().create(validated_data)
+    def create(self, validated_data):
+        """Create the submissions with one insert per model."""
+        return self.child.bulk_create(validated_data)
 
 
 class SubmissionSerializer(DynamicModelSerializer):
@@ -147,6 +187,45 @@ class SubmissionSerializer(DynamicModelSerializer):
     class Meta:
         model = Submission
         fields = "__all__"
+        list_serializer_class = SubmissionListSerializer
+
+    def get_field_map(self, form):
+        """Returns the fields of a form by hashid, id and key.
+
+        The fields are loaded once per form and serializer, also when the
+        serializer validates a list of submissions.
+        """
+        field_maps = self.__dict__.setdefault("_field_maps", {})
+        if form.pk not in field_maps:
+            fields = list(FormField.objects.filter(form=form))
+            field_map = {field.key: field for field in fields if field.key}
+            for field in fields:
+                field_map[field.id.hashid] = field
+                field_map[str(field.id.id)] = field
+            field_maps[form.pk] = field_map
+        return field_maps[form.pk]
+
+    def validate(self, attrs):
+        """Resolve the fields of the values from the fields of the form.
+
+        Values refer to a field by its id or by its key.
+        """
+        attrs = super().validate(attrs)
+        if "form" not in attrs or "values" not in attrs:
+            return attrs
+        field_map = self.get_field_map(attrs["form"])
+        errors = {}
+        for index, value in enumerate(attrs["values"]):
+            field = field_map.get(str(value["field"]))
+            if not field:
+                errors[index] = {
+                    "field": _("Field does not belong to the form.")
+                }
+                continue
+            value["field"] = field
+        if errors:
+            raise serializers.ValidationError({"values": errors})
+        return attrs
 
     @transaction.atomic
     def create(self, validated_data):
@@ -160,9 +239,32 @@ class SubmissionSerializer(DynamicModelSerializer):
         Returns:
         Submission: The created Submission instance.
         """
-        values = validated_data.pop("values")
-        instance = super().create(validated_data)
-        for value in values:
-            value["submission"] = instance
-        self.fields["values"].create(values)
-        return instance
+        return self.bulk_create([validated_data])[0]
+
+    @transaction.atomic
+    def bulk_create(self, validated_data):
+        """Create submissions and their values with one insert each.
+
+        Args:
+        - validated_data (list): Validated data of the submissions, with
+            the fields of the values resolved by validate().
+
+        Returns:
+        list: The created Submission instances.
+        """
+        current_user = auth_utils.get_current_user()
+        stamp = {"creator": current_user, "updater": current_user}
+        submissions = []
+        values = []
+        for data in validated_data:
+            data = {**stamp, **data}
+            submission_values = data.pop("values", [])
+            submission = Submission(**data)
+            submissions.append(submission)
+            values += [
+                SubmissionValues(**{**stamp, **value}, submission=submission)
+                for value in submission_values
+            ]
+        Submission.objects.bulk_create(submissions)
+        SubmissionValues.objects.bulk_create(values)
+        return submissions
@@ -0,0 +1,51 @@
+"""Signals of the forms module, bumping the version of the form
+definitions they change."""
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from v1.catalogs.models.product_models import Product
+from v1.forms.models import Form
+from v1.forms.models import FormField
+from v1.forms.models import FormFieldConfig
+from v1.supply_chains.models.company_models import CompanyProduct
+
+
+@receiver(post_save, sender=FormField)
+@receiver(post_delete, sender=FormField)
+@receiver(post_save, sender=FormFieldConfig)
+@receiver(post_delete, sender=FormFieldConfig)
+def bump_field_form(sender, instance, **kwargs):
+    """Bump the form of a changed field or field config."""
+    Form.bump_versions([instance.form_id])
+
+
+@receiver(m2m_changed, sender=CompanyProduct.forms.through)
+def bump_company_product_forms(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Bump the forms added to or removed from company products."""
+    if action == "pre_clear" and not reverse:
+        Form.bump_versions(instance.forms.all())
+    elif action in ("post_add", "post_remove", "post_clear"):
+        if reverse:
+            Form.bump_versions([instance.pk])
+        elif pk_set:
+            Form.bump_versions(pk_set)
+
+
+@receiver(pre_delete, sender=CompanyProduct)
+def bump_deleted_company_product_forms(sender, instance, **kwargs):
+    """Bump the forms of a deleted company product."""
+    Form.bump_versions(instance.forms.all())
+
+
+@receiver(post_save, sender=Product)
+def bump_product_forms(sender, instance, created, **kwargs):
+    """Bump the forms listing a changed product."""
+    if not created:
+        Form.bump_versions(
+            Form.objects.filter(company_products__product=instance)
+        )
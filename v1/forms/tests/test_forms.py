@@ -1,10 +1,15 @@
 import json
 
 from django.urls import reverse
+from mixer.backend.django import mixer
 
 from v1.accounts.tests.base import BaseTestCase
 from v1.forms.constants import FormFieldType
 from v1.forms.constants import FormType
+from v1.forms.models import SubmissionValues
+from v1.forms.models import Form
+from v1.forms.serializers import FormSerializer
+from v1.forms.serializers import SubmissionSerializer
 
 
 class FormTestCase(BaseTestCase):
@@ -45,3 +50,55 @@ class FormTestCase(BaseTestCase):
             **self.headers
         )
         self.assertEqual(response.status_code, 201)
+
+    def test_create_submissions(self):
+        form = mixer.blend("forms.Form", owner=self.company)
+        fields = mixer.cycle(2).blend(
+            "forms.FormField", form=form, key=mixer.sequence("key_{0}")
+        )
+        other_field = mixer.blend("forms.FormField")
+        data = [
+            {
+                "form": form.id.hashid,
+                "values": [
+                    {"field": fields[0].id.hashid, "value": "a"},
+                    {"field": fields[1].key, "value": "b"},
+                ],
+            }
+            for _ in range(2)
+        ]
+        serializer = SubmissionSerializer(data=data, many=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        submissions = serializer.save()
+        self.assertEqual(
+            SubmissionValues.objects.filter(
+                submission__in=submissions
+            ).count(),
+            4,
+        )
+
+        data[0]["values"][0]["field"] = other_field.id.hashid
+        serializer = SubmissionSerializer(data=data, many=True)
+        self.assertFalse(serializer.is_valid())
+
+    def test_form_definition_cache_follows_changes(self):
+        form = mixer.blend("forms.Form", owner=self.company)
+        mixer.blend("forms.FormField", form=form)
+        data = FormSerializer(form).data
+        self.assertEqual(len(data["fields"]), 1)
+
+        mixer.blend("forms.FormField", form=form)
+        form = Form.objects.get(pk=form.pk)
+        self.assertEqual(len(FormSerializer(form).data["fields"]), 2)
+
+    def test_form_save_bumps_version_in_database(self):
+        form = mixer.blend("forms.Form", owner=self.company)
+        version = form.version
+        stale = Form.objects.get(pk=form.pk)
+
+        form.save()
+        stale.save()
+
+        self.assertEqual(stale.version, version + 2)
+        form.refresh_from_db()
+        self.assertEqual(form.version, version + 2)
@@ -19,6 +19,7 @@ class NotificationsConfig(AppConfig):
         Performs tasks that need to be executed when the app is ready,
         such as validating notifications.
         """
+        from . import signals  # noqa: F401
         from .manager import validate_notifications
 
         validate_notifications()
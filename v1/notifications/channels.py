@@ -0,0 +1,137 @@
+"""Channel layers used to push new notifications to connected clients.
+
+Notifications are published to a channel per user from any process, and
+read by the ASGI workers serving the notification stream. Subscriptions
+are async context managers:
+
+    async with get_channel_layer().subscribe(channel) as subscription:
+        message = await subscription.get(timeout=25)
+"""
+import asyncio
+import json
+import threading
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from base.request_handler.response import HashidJSONEncoder
+
+
+def user_channel(user_id):
+    """Returns the channel the notifications of a user are published to."""
+    return f"notifications:{user_id}"
+
+
+class RedisSubscription:
+    """Subscription to a Redis pub/sub channel."""
+
+    def __init__(self, url, channel):
+        self.url = url
+        self.channel = channel
+
+    async def __aenter__(self):
+        from redis import asyncio as aioredis
+
+        self.client = aioredis.Redis.from_url(self.url)
+        self.pubsub = self.client.pubsub()
+        await self.pubsub.subscribe(self.channel)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.pubsub.reset()
+        await self.client.close()
+
+    async def get(self, timeout):
+        """Returns the next message, or None if none was published within
+        timeout seconds."""
+        item = await self.pubsub.get_message(
+            ignore_subscribe_messages=True, timeout=timeout
+        )
+        return json.loads(item["data"]) if item else None
+
+
+class RedisChannelLayer:
+    """Channel layer on Redis pub/sub.
+
+    Messages are only delivered to subscribers connected at the time of
+    publishing; clients reload the notification list after reconnecting.
+
+    Args:
+        url(str): Redis connection URL.
+    """
+
+    def __init__(self, url):
+        import redis
+
+        self.url = url
+        self.client = redis.Redis.from_url(url)
+
+    def publish(self, channel, message):
+        """Publish a JSON serializable message to a channel. Hashids are
+        encoded as strings."""
+        self.client.publish(
+            channel, json.dumps(message, cls=HashidJSONEncoder)
+        )
+
+    def subscribe(self, channel):
+        """Returns a subscription to a channel."""
+        return RedisSubscription(self.url, channel)
+
+
+class InMemorySubscription:
+    """Subscription to a channel of the in-memory channel layer."""
+
+    def __init__(self, layer, channel):
+        self.layer = layer
+        self.channel = channel
+
+    async def __aenter__(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        with self.layer.lock:
+            self.layer.subscribers.setdefault(self.channel, []).append(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        with self.layer.lock:
+            self.layer.subscribers[self.channel].remove(self)
+
+    async def get(self, timeout):
+        """Returns the next message, or None if none was published within
+        timeout seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InMemoryChannelLayer:
+    """Channel layer within a single process, used in tests and local
+    development."""
+
+    def __init__(self):
+        self.subscribers = {}
+        self.lock = threading.Lock()
+
+    def publish(self, channel, message):
+        """Publish a JSON serializable message to a channel. Hashids are
+        encoded as strings."""
+        message = json.loads(json.dumps(message, cls=HashidJSONEncoder))
+        with self.lock:
+            subscriptions = list(self.subscribers.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.loop.call_soon_threadsafe(
+                subscription.queue.put_nowait, message
+            )
+
+    def subscribe(self, channel):
+        """Returns a subscription to a channel."""
+        return InMemorySubscription(self, channel)
+
+
+@lru_cache(maxsize=None)
+def get_channel_layer():
+    """Returns the channel layer configured in NOTIFICATION_CHANNEL_LAYER."""
+    config = settings.NOTIFICATION_CHANNEL_LAYER
+    return import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
@@ -1,9 +1,14 @@
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 
+from base.authentication import utilities as auth_utils
 from utilities.translations import internationalize_attribute
+from utilities.translations import translate_attribute
 from v1.notifications.constants import NotificationCondition
 from v1.notifications.models import Notification
+from v1.notifications.models import NotificationCounter
 
 NOTIFICATION_TYPES = {}
 
@@ -27,6 +32,16 @@ class BaseNotificationManager:
 
     email_template: str = "default.html"
 
+    # Whether the title and body depend on the recipient. Shared texts are
+    # rendered once per event when notifying a set of users, provided the
+    # manager overrides the default texts, which name the recipient.
+    personalized: bool = True
+
+    # Whether each notification carries its own validation token. The
+    # token is linked one to one, so such notifications can't be fanned
+    # out to a set of users.
+    uses_token: bool = False
+
     def __init__(self, user, action_object, token=None, context=None):
         """Initialize notification.
 
@@ -40,8 +55,7 @@ class BaseNotificationManager:
 
         # curr_language = translation.get_language()
         context = context or {}
-        self.user = user
-        self.action_object = action_object
+        self.bind(user, action_object, context)
         target_entity = self.get_target_entity()
         member = CompanyMember.objects.filter(
             company=target_entity, user=user
@@ -79,6 +93,172 @@ class BaseNotificationManager:
             notification.redirect_type = self.get_redirect_type()
             notification.save()
             self.notification_object = notification
+            if created:
+                transaction.on_commit(notification.publish)
+
+    def bind(self, user, action_object, context=None):
+        """Set the recipient and the event the texts are rendered for."""
+        self.user = user
+        self.action_object = action_object
+        self.context = context or {}
+        self.notification_object = None
+
+    @classmethod
+    def recipient(cls, user, action_object, context=None):
+        """Return a manager bound to a recipient, without creating the
+        notification."""
+        manager = cls.__new__(cls)
+        manager.bind(user, action_object, context)
+        return manager
+
+    def render_text(self) -> dict:
+        """Render the title and body in every language."""
+        return {
+            **translate_attribute("title", self.get_title),
+            **translate_attribute("body", self.get_body),
+        }
+
+    @classmethod
+    def shares_text(cls) -> bool:
+        """Whether the texts can be rendered once for every recipient."""
+        base = BaseNotificationManager
+        return (
+            not cls.personalized
+            and cls.get_title is not base.get_title
+            and cls.get_body is not base.get_body
+        )
+
+    @classmethod
+    def check_fan_out(cls):
+        """Raise ValueError if the notifications can't be fanned out."""
+        if cls.uses_token:
+            raise ValueError(
+                f"'{cls.notification_uid}' notifications carry a validation "
+                f"token and must be created per user."
+            )
+
+    @classmethod
+    def notify(cls, users, action_object, context=None):
+        """Queue the notification of an event for a set of users.
+
+        Args:
+            users: Users, or ids of the users, to notify.
+            action_object: The object associated with the notification.
+            context: Additional context for the notification.
+
+        Raises:
+            ValueError: If the notifications carry a validation token.
+        """
+        from v1.notifications.tasks import fan_out_notification
+
+        cls.check_fan_out()
+        event_type = ContentType.objects.get_for_model(action_object)
+        fan_out_notification.delay(
+            cls.notification_uid,
+            [str(getattr(user, "pk", user)) for user in users],
+            event_type.pk,
+            str(action_object.pk),
+            context,
+        )
+
+    @classmethod
+    def fan_out(cls, users, action_object, context=None):
+        """Create the notification of an event for a set of users.
+
+        Unlike initializing the manager per user, the memberships of the
+        recipients are resolved in one query, shared texts are rendered
+        once per language and the notifications are bulk created.
+        Recipients already notified of the event are skipped.
+
+        Args:
+            users: Users to notify.
+            action_object: The object associated with the notification.
+            context: Additional context for the notification.
+
+        Returns:
+            list: The created notifications.
+
+        Raises:
+            ValueError: If the notifications carry a validation token.
+        """
+        from v1.supply_chains.models.company_models import CompanyMember
+
+        cls.check_fan_out()
+        context = context or {}
+        event = cls.recipient(None, action_object, context)
+        target_entity = event.get_target_entity()
+        actor_entity = event.get_actor_entity()
+        event_type = ContentType.objects.get_for_model(action_object)
+        shared_text = event.render_text() if cls.shares_text() else None
+        current_user = auth_utils.get_current_user()
+
+        notified = set(
+            Notification.objects.filter(
+                type=cls.notification_uid,
+                event_type=event_type,
+                event_id=action_object.id,
+            ).values_list("user_id", flat=True)
+        )
+        users = [user for user in users if user.pk not in notified]
+        members = {}
+        if target_entity:
+            members = {
+                member.user_id: member
+                for member in CompanyMember.objects.filter(
+                    company=target_entity, user__in=users
+                )
+            }
+
+        recipients = []
+        for user in users:
+            member = members.get(user.pk)
+            if member:
+                member.user = user
+            prefs = (member or user).get_notification_pref(event)
+            if not any(prefs.values()):
+                continue
+            manager = cls.recipient(user, action_object, context)
+            notification = Notification(
+                user=user,
+                type=cls.notification_uid,
+                visibility=prefs["visibility"],
+                action_push=prefs["push"],
+                action_email=prefs["email"],
+                action_sms=prefs["sms"],
+                event_type=event_type,
+                event_id=action_object.id,
+                actor_entity=actor_entity,
+                target_entity=target_entity,
+                send_to=manager.get_send_to(),
+                context=context,
+                redirect_id=manager.get_redirect_id(),
+                redirect_type=manager.get_redirect_type(),
+                creator=current_user,
+                updater=current_user,
+                **(shared_text or manager.render_text()),
+            )
+            manager.notification_object = notification
+            recipients.append(manager)
+
+        with transaction.atomic():
+            notifications = Notification.objects.bulk_create(
+                [manager.notification_object for manager in recipients]
+            )
+            for notification in notifications:
+                notification._counted_state = notification.counted_state()
+            NotificationCounter.apply(
+                NotificationCounter.deltas(
+                    n._counted_state for n in notifications
+                )
+            )
+            # The action url refers to the notification id.
+            for manager in recipients:
+                notification = manager.notification_object
+                notification.action_url = manager.get_action_url()
+            Notification.objects.bulk_update(notifications, ["action_url"])
+            for notification in notifications:
+                transaction.on_commit(notification.publish)
+        return notifications
 
     def send_notification(self):
         """Send the notification."""
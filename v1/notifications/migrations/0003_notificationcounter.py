@@ -0,0 +1,53 @@
+# Generated by Django 4.0.4 on 2026-10-19 04:07
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_counters(apps, schema_editor):
+    Notification = apps.get_model("notifications", "Notification")
+    NotificationCounter = apps.get_model("notifications", "NotificationCounter")
+    summary = (
+        Notification.objects.filter(visibility=True)
+        .values("user_id", "target_entity_id")
+        .annotate(
+            count=models.Count("id"),
+            unread_count=models.Count("id", filter=models.Q(is_read=False)),
+        )
+        .order_by()
+    )
+    NotificationCounter.objects.bulk_create(
+        NotificationCounter(**row) for row in summary.iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('supply_chains', '0017_company_make_farmers_private'),
+        ('notifications', '0002_notification_body_ind_notification_title_ind'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(default=0, verbose_name='Count')),
+                ('unread_count', models.IntegerField(default=0, verbose_name='Unread Count')),
+                ('target_entity', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notification_counters', to='supply_chains.company', verbose_name='Target Entity')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_counters', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='notificationcounter',
+            constraint=models.UniqueConstraint(fields=('user', 'target_entity'), name='unique_notification_counter'),
+        ),
+        migrations.AddConstraint(
+            model_name='notificationcounter',
+            constraint=models.UniqueConstraint(condition=models.Q(('target_entity__isnull', True)), fields=('user',), name='unique_notification_counter_without_entity'),
+        ),
+        migrations.RunPython(build_counters, migrations.RunPython.noop),
+    ]
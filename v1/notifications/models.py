@@ -1,16 +1,25 @@
 """Notification Models."""
+import logging
+from collections import Counter
+
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError
 from django.db import models
+from django.db import transaction
+from django.db.models import F
 from django.template.loader import render_to_string
 from django.utils import translation
 from django.utils.translation import gettext_lazy as _
+from sentry_sdk import capture_exception
 
 from base.db.models import AbstractBaseModel
 from utilities import email
 from utilities import sms
 
+logger = logging.getLogger(__name__)
+
 
 class Notification(AbstractBaseModel):
     """A class for managing user notifications.
@@ -148,6 +157,36 @@ class Notification(AbstractBaseModel):
         """Function to return value in django admin."""
         return "%s - %s | %s" % (self.user.name, self.title, self.id)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the counted state of loaded notifications."""
+        instance = super().from_db(db, field_names, values)
+        instance._counted_state = instance.counted_state()
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Keep the notification counters in sync with the changes."""
+        previous = getattr(self, "_counted_state", None)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self._counted_state = self.counted_state()
+            deltas = NotificationCounter.deltas([self._counted_state])
+            deltas.subtract(NotificationCounter.deltas([previous]))
+            NotificationCounter.apply(deltas)
+
+    def counted_state(self):
+        """Return the state of the notification the counters depend on.
+
+        Returns:
+            tuple: (user_id, target_entity_id, visibility, is_read)
+        """
+        return (
+            self.user_id,
+            self.target_entity_id,
+            self.visibility,
+            self.is_read,
+        )
+
     def send_email(self):
         """Sends an email notification.
 
@@ -173,7 +212,7 @@ class Notification(AbstractBaseModel):
         html = render_to_string(
             template_name=template_name, context=render_context
         )
-        email.send_email.delay(
+        email.queue_email(
             subject=self.title, to_email=self.send_to, html=html
         )
         translation.activate(curr_language)
@@ -215,6 +254,28 @@ class Notification(AbstractBaseModel):
         self.send_sms()
         return True
 
+    def publish(self):
+        """Pushes the notification to the connected clients of the user.
+
+        Publishing is best effort, clients that missed it still find the
+        notification in the notification list.
+        """
+        from .channels import get_channel_layer
+        from .channels import user_channel
+        from .serializers import NotificationSerializer
+
+        if not self.visibility:
+            return False
+        try:
+            get_channel_layer().publish(
+                user_channel(self.user_id), NotificationSerializer(self).data
+            )
+        except Exception as e:
+            capture_exception(e)
+            logger.info("Notification publishing failed.")
+            return False
+        return True
+
     def read(self):
         """Marks the notification as read.
 
@@ -236,6 +297,121 @@ class Notification(AbstractBaseModel):
         return NOTIFICATION_TYPES[self.type]
 
 
+class NotificationCounter(models.Model):
+    """Number of visible and unread notifications of a user per target
+    entity.
+
+    The counters are updated along with the notifications, so that the
+    notification summary does not need to aggregate the notifications.
+    They can be rebuilt with the rebuild_notification_counters script.
+
+    Attributes:
+        user (UserModel): The user the notifications belong to.
+        target_entity (Company): The target entity of the notifications.
+        count (int): Number of visible notifications.
+        unread_count (int): Number of visible unread notifications.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="notification_counters",
+        verbose_name=_("User"),
+    )
+    target_entity = models.ForeignKey(
+        "supply_chains.Company",
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name="notification_counters",
+        verbose_name=_("Target Entity"),
+    )
+    count = models.IntegerField(default=0, verbose_name=_("Count"))
+    unread_count = models.IntegerField(
+        default=0, verbose_name=_("Unread Count")
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "target_entity"],
+                name="unique_notification_counter",
+            ),
+            models.UniqueConstraint(
+                fields=["user"],
+                condition=models.Q(target_entity__isnull=True),
+                name="unique_notification_counter_without_entity",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.target_entity_id} | {self.count}"
+
+    @staticmethod
+    def deltas(states):
+        """Return the counter increments of notifications.
+
+        Args:
+            states: Counted states of notifications, see
+                Notification.counted_state. None values are skipped.
+
+        Returns:
+            Counter: Increments keyed by (user_id, target_entity_id,
+                field name).
+        """
+        deltas = Counter()
+        for state in states:
+            if not state:
+                continue
+            user_id, target_entity_id, visibility, is_read = state
+            if not visibility:
+                continue
+            deltas[(user_id, target_entity_id, "count")] += 1
+            if not is_read:
+                deltas[(user_id, target_entity_id, "unread_count")] += 1
+        return deltas
+
+    @classmethod
+    def apply(cls, deltas):
+        """Atomically add increments to the counters, creating missing
+        counters.
+
+        Args:
+            deltas(Counter): Increments as returned by deltas(). Negative
+                increments are applied to existing counters, missing
+                counters are only created with the positive increments.
+        """
+        changes = {}
+        for (user_id, target_entity_id, field), delta in deltas.items():
+            if delta:
+                key = (user_id, target_entity_id)
+                changes.setdefault(key, {})[field] = delta
+        for (user_id, target_entity_id), values in changes.items():
+            counters = cls.objects.filter(
+                user_id=user_id, target_entity_id=target_entity_id
+            )
+            increments = {
+                field: F(field) + delta for field, delta in values.items()
+            }
+            if counters.update(**increments):
+                continue
+            values = {
+                field: delta for field, delta in values.items() if delta > 0
+            }
+            if not values:
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(
+                        user_id=user_id,
+                        target_entity_id=target_entity_id,
+                        **values,
+                    )
+            except IntegrityError:
+                # Created concurrently.
+                counters.update(**increments)
+
+
 class SMSAlerts(AbstractBaseModel):
     """Model to track all the SMSs sent and log the response.
 
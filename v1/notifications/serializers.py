@@ -1,10 +1,15 @@
 """Serializers for notifications."""
+from collections import Counter
+
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from base.authentication import session
 from base.drf import fields
 from v1.accounts.serializers import user as user_serializers
 from v1.notifications.models import Notification
+from v1.notifications.models import NotificationCounter
 
 
 class NotificationSerializer(serializers.ModelSerializer):
@@ -77,8 +82,8 @@ class ReadNotificationSerializer(serializers.Serializer):
     def create(self, validated_data):
         """Mark notifications as read.
 
-        This method marks notifications as read based on the provided 'ids' or
-        'all' flag.
+        This method marks notifications of the current user as read based on
+        the provided 'ids' or 'all' flag.
 
         Args:
             validated_data (dict): The validated data containing 'ids' and/or
@@ -91,10 +96,27 @@ class ReadNotificationSerializer(serializers.Serializer):
             This method does not create new notifications but updates the
             'is_read' status of existing ones.
         """
-        notifications = Notification.objects.all()
+        notifications = Notification.objects.filter(
+            user_id=session.get_from_local("user_id"), is_read=False
+        )
         if "ids" in validated_data and validated_data["ids"]:
             notifications = notifications.filter(id__in=validated_data["ids"])
-        notifications.update(is_read=True)
+        with transaction.atomic():
+            # Lock the rows, so concurrent requests do not uncount the same
+            # notifications twice.
+            rows = list(
+                notifications.select_for_update().values_list(
+                    "id", "user_id", "target_entity_id", "visibility"
+                )
+            )
+            deltas = Counter()
+            for _id, user_id, target_entity_id, visibility in rows:
+                if visibility:
+                    deltas[(user_id, target_entity_id, "unread_count")] -= 1
+            Notification.objects.filter(
+                id__in=[row[0] for row in rows]
+            ).update(is_read=True)
+            NotificationCounter.apply(deltas)
         return {}
 
     def to_representation(self, instance):
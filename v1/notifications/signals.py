@@ -0,0 +1,63 @@
+"""Signals of the notifications module."""
+import threading
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from v1.notifications.models import Notification
+from v1.notifications.models import NotificationCounter
+from v1.supply_chains.models.company_models import Company
+
+# Users and companies being deleted by the current thread. Their
+# notifications and counters are deleted by the same cascade.
+_deleting = threading.local()
+
+
+def owner_key(model, pk):
+    """Returns the key of a user or company in deleting_owners()."""
+    return model._meta.label, int(pk) if pk is not None else None
+
+
+def deleting_owners():
+    """Returns the (model label, pk) of the users and companies being
+    deleted by the current thread."""
+    if not hasattr(_deleting, "owners"):
+        _deleting.owners = set()
+    return _deleting.owners
+
+
+@receiver(pre_delete, sender=get_user_model())
+@receiver(pre_delete, sender=Company)
+def collect_owner(sender, instance, **kwargs):
+    """Remember a user or company being deleted."""
+    deleting_owners().add(owner_key(sender, instance.pk))
+
+
+@receiver(post_delete, sender=get_user_model())
+@receiver(post_delete, sender=Company)
+def release_owner(sender, instance, **kwargs):
+    """Forget a deleted user or company."""
+    deleting_owners().discard(owner_key(sender, instance.pk))
+
+
+@receiver(post_delete, sender=Notification)
+def uncount_notification(sender, instance, **kwargs):
+    """Remove a deleted notification from the counters.
+
+    The counters are left alone when the user or target company of the
+    notification is being deleted, since they are deleted with it.
+    """
+    state = getattr(instance, "_counted_state", None)
+    state = state or instance.counted_state()
+    owners = deleting_owners()
+    if (
+        owner_key(get_user_model(), state[0]) in owners
+        or owner_key(Company, state[1]) in owners
+    ):
+        return
+    deltas = Counter()
+    deltas.subtract(NotificationCounter.deltas([state]))
+    NotificationCounter.apply(deltas)
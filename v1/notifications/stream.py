@@ -0,0 +1,172 @@
+"""Server-sent events stream of new notifications.
+
+The stream is a plain ASGI application mounted in trace_connect/asgi.py,
+next to the Django application, so that the long-lived connections are
+served by the ASGI workers without blocking a request thread.
+
+The stream is served outside the Django handler, so the request_started
+and request_finished signals never close its database connections. The
+ORM work is run with database_sync_to_async instead, which closes them.
+"""
+import asyncio
+import io
+import json
+
+from asgiref.sync import sync_to_async
+from corsheaders.middleware import CorsMiddleware
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+from django.http import HttpResponse
+from rest_framework import exceptions
+from rest_framework.request import Request
+
+from base.authentication import CustomDynamicAuthentication
+from v1.notifications.channels import get_channel_layer
+from v1.notifications.channels import user_channel
+
+
+def database_sync_to_async(func):
+    """Returns an async version of a function doing ORM work, closing the
+    stale database connections before and after it."""
+
+    def wrapper(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(wrapper)
+
+
+def authenticate(request):
+    """Authenticate the stream request with the API authentication classes.
+
+    Returns:
+        The authenticated user, or None.
+    """
+    try:
+        result = CustomDynamicAuthentication().authenticate(Request(request))
+    except exceptions.APIException:
+        return None
+    return result[0] if result else None
+
+
+def cors_headers(request):
+    """Returns the CORS headers of the API for a request."""
+    response = CorsMiddleware(lambda request: None).process_response(
+        request, HttpResponse()
+    )
+    return [
+        (name.lower().encode(), value.encode())
+        for name, value in response.items()
+        if name.lower().startswith("access-control-")
+    ]
+
+
+class NotificationStream:
+    """ASGI application streaming the notifications of the authenticated
+    user as server-sent events.
+
+    Each new notification is sent as a `notification` event with the
+    serialized notification as data. Comments are sent as keep-alive
+    every NOTIFICATION_STREAM_HEARTBEAT seconds.
+    """
+
+    async def __call__(self, scope, receive, send):
+        request = ASGIRequest(scope, io.BytesIO())
+        headers = cors_headers(request)
+        user = await database_sync_to_async(authenticate)(request)
+        if not user:
+            await self.respond(send, 401, b"Authentication failed.", headers)
+            return
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),
+                    *headers,
+                ],
+            }
+        )
+        disconnect = asyncio.ensure_future(self.wait_disconnect(receive))
+        channel = user_channel(user.pk)
+        heartbeat = settings.NOTIFICATION_STREAM_HEARTBEAT
+        try:
+            async with get_channel_layer().subscribe(channel) as subscription:
+                await self.send_body(send, b": connected\n\n")
+                while True:
+                    message = asyncio.ensure_future(
+                        subscription.get(heartbeat)
+                    )
+                    await asyncio.wait(
+                        {message, disconnect},
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    if disconnect.done():
+                        message.cancel()
+                        break
+                    await self.send_body(send, self.format(message.result()))
+        finally:
+            disconnect.cancel()
+
+    @staticmethod
+    def format(message):
+        """Returns the event of a message, or a keep-alive comment."""
+        if message is None:
+            return b": keep-alive\n\n"
+        data = json.dumps(message)
+        return f"event: notification\ndata: {data}\n\n".encode()
+
+    @staticmethod
+    async def wait_disconnect(receive):
+        """Waits until the client disconnects."""
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    @staticmethod
+    async def send_body(send, body):
+        """Sends a chunk of the stream."""
+        await send(
+            {"type": "http.response.body", "body": body, "more_body": True}
+        )
+
+    @staticmethod
+    async def respond(send, status, body, headers=()):
+        """Sends a complete plain text response."""
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", b"text/plain"), *headers],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+class NotificationStreamRouter:
+    """ASGI application serving GET requests to NOTIFICATION_STREAM_PATH
+    with the notification stream and every other request, including CORS
+    preflight requests, with the Django application.
+
+    Args:
+        application: The Django ASGI application.
+    """
+
+    def __init__(self, application):
+        self.application = application
+        self.stream = NotificationStream()
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] == "http"
+            and scope["method"] == "GET"
+            and scope["path"] == settings.NOTIFICATION_STREAM_PATH
+        ):
+            return await self.stream(scope, receive, send)
+        return await self.application(scope, receive, send)
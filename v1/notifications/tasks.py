@@ -0,0 +1,30 @@
+"""Celery tasks of the notifications module."""
+from celery import current_app as app
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+
+from v1.notifications.manager import NOTIFICATION_TYPES
+
+
+@app.task(name="fan_out_notification")
+def fan_out_notification(
+    notification_uid, user_ids, event_type_id, event_id, context=None
+):
+    """Create the notification of an event for a set of users.
+
+    Args:
+        notification_uid(str): notification_uid of the manager.
+        user_ids(list): Hashids of the users to notify.
+        event_type_id(int): Content type id of the action object.
+        event_id(str): Hashid of the action object.
+        context(dict): Additional context for the notification.
+
+    Returns:
+        int: Number of notifications created.
+    """
+    manager_class = NOTIFICATION_TYPES[notification_uid]
+    event_type = ContentType.objects.get_for_id(event_type_id)
+    action_object = event_type.get_object_for_this_type(pk=event_id)
+    users = get_user_model().objects.filter(pk__in=user_ids)
+    notifications = manager_class.fan_out(users, action_object, context)
+    return len(notifications)
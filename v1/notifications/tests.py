@@ -1,2 +1,354 @@
-# from django.test import TestCase
-# Create your tests here.
+import asyncio
+import json
+import smtplib
+from collections import Counter
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import mail
+from django.test import TestCase
+from django.test import override_settings
+from django.urls import reverse
+from django_redis import get_redis_connection
+from mixer.backend.django import mixer
+
+from utilities import email
+from utilities import sms
+from v1.accounts import constants as acc_constants
+from v1.accounts.models import ValidationToken
+from v1.accounts.tests.base import BaseTestCase
+from v1.apiauth.notifications import PasswordResetNotificationManager
+from v1.notifications.manager import BaseNotificationManager
+from v1.notifications.models import Notification
+from v1.notifications.channels import get_channel_layer
+from v1.notifications.models import NotificationCounter
+from v1.notifications.models import SMSAlerts
+from v1.notifications.stream import NotificationStream
+
+
+class AnnouncementNotificationManager(BaseNotificationManager):
+    notification_uid = "test_announcement"
+    personalized = False
+
+    def get_title(self):
+        return f"Announcement from {self.action_object}."
+
+    def get_body(self):
+        return f"{self.action_object} has an announcement."
+
+    def get_actor_entity(self):
+        return None
+
+    def get_target_entity(self):
+        return None
+
+
+class DefaultTextNotificationManager(AnnouncementNotificationManager):
+    notification_uid = "test_default_text"
+    get_title = BaseNotificationManager.get_title
+    get_body = BaseNotificationManager.get_body
+
+
+class NotificationFanOutTestCase(BaseTestCase):
+    def test_fan_out_creates_one_notification_per_user(self):
+        users = [self.user, mixer.blend("accounts.CustomUser")]
+
+        notifications = AnnouncementNotificationManager.fan_out(
+            users, self.company
+        )
+
+        self.assertEqual(len(notifications), 2)
+        self.assertEqual(
+            {notification.user_id for notification in notifications},
+            {user.id for user in users},
+        )
+
+        # Recipients already notified of the event are skipped.
+        AnnouncementNotificationManager.fan_out(users, self.company)
+        self.assertEqual(
+            Notification.objects.filter(
+                type=AnnouncementNotificationManager.notification_uid
+            ).count(),
+            2,
+        )
+
+    def test_fan_out_renders_default_texts_per_user(self):
+        users = [self.user, mixer.blend("accounts.CustomUser")]
+
+        notifications = DefaultTextNotificationManager.fan_out(
+            users, self.company
+        )
+
+        self.assertEqual(
+            {notification.title for notification in notifications},
+            {
+                f"Notification for {user.username} for {self.company}."
+                for user in users
+            },
+        )
+
+    def test_fan_out_refuses_token_notifications(self):
+        token = ValidationToken.initialize(
+            self.user, acc_constants.ValidationTokenType.RESET_PASS
+        )
+        with self.assertRaises(ValueError):
+            PasswordResetNotificationManager.fan_out([self.user], token)
+        self.assertFalse(
+            Notification.objects.filter(event_id=token.id).exists()
+        )
+
+
+class NotificationListTestCase(BaseTestCase):
+    def test_columnar_format_stores_related_objects_once(self):
+        creator = mixer.blend("accounts.CustomUser")
+        mixer.cycle(2).blend(
+            Notification,
+            user=self.user,
+            creator=creator,
+            target_entity=self.company,
+            visibility=True,
+        )
+
+        response = self.client.get(
+            reverse("list_notification"),
+            {"format": "columnar"},
+            **self.headers,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]["results"]
+        self.assertIn("creator", data["columns"])
+        column = data["columns"].index("creator")
+        self.assertEqual(len(data["rows"]), 2)
+        self.assertEqual(
+            {row[column] for row in data["rows"]}, {creator.id.hashid}
+        )
+        self.assertEqual(list(data["refs"]["creator"]), [creator.id.hashid])
+        self.assertEqual(
+            data["refs"]["creator"][creator.id.hashid]["email"],
+            creator.email,
+        )
+
+
+class NotificationCounterTestCase(BaseTestCase):
+    def get_counter(self):
+        return NotificationCounter.objects.get(
+            user=self.user, target_entity=self.company
+        )
+
+    def test_counters_follow_notifications(self):
+        notifications = mixer.cycle(2).blend(
+            Notification,
+            user=self.user,
+            target_entity=self.company,
+            visibility=True,
+            is_read=False,
+        )
+        counter = self.get_counter()
+        self.assertEqual((counter.count, counter.unread_count), (2, 2))
+
+        notifications[0].read()
+        counter = self.get_counter()
+        self.assertEqual((counter.count, counter.unread_count), (2, 1))
+
+        notifications[1].delete()
+        counter = self.get_counter()
+        self.assertEqual((counter.count, counter.unread_count), (1, 0))
+
+    def test_counters_are_not_created_negative(self):
+        NotificationCounter.apply(
+            Counter({(self.user.id, self.company.id, "count"): -1})
+        )
+        self.assertFalse(NotificationCounter.objects.exists())
+
+    def test_counters_are_deleted_with_the_user(self):
+        user = mixer.blend("accounts.CustomUser")
+        mixer.blend(
+            Notification,
+            user=user,
+            target_entity=self.company,
+            visibility=True,
+        )
+        user.delete()
+        self.assertFalse(
+            NotificationCounter.objects.filter(user_id=user.id).exists()
+        )
+        self.assertFalse(Notification.objects.filter(user_id=user.id).exists())
+
+
+@override_settings(
+    NOTIFICATION_CHANNEL_LAYER={
+        "BACKEND": "v1.notifications.channels.InMemoryChannelLayer"
+    }
+)
+class NotificationStreamTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        get_channel_layer.cache_clear()
+        self.addCleanup(get_channel_layer.cache_clear)
+        # Keep the connection of the test transaction open, as the test
+        # client does for requests.
+        patcher = mock.patch("v1.notifications.stream.close_old_connections")
+        self.close_old_connections = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_notification(self):
+        self.notification = mixer.blend(
+            Notification, user=self.user, visibility=True
+        )
+        self.notification.publish()
+
+    async def stream(self, headers):
+        sent = []
+        disconnected = asyncio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            body = message.get("body", b"")
+            if body == b": connected\n\n":
+                await sync_to_async(self.create_notification)()
+            elif body.startswith(b"event: notification"):
+                disconnected.set()
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": settings.NOTIFICATION_STREAM_PATH,
+            "root_path": "",
+            "query_string": b"",
+            "headers": headers,
+        }
+        # A missing message fails the test instead of blocking the run.
+        await asyncio.wait_for(NotificationStream()(scope, receive, send), 5)
+        return sent
+
+    def test_publish_encodes_hashids(self):
+        notification = mixer.blend(
+            Notification, user=self.user, visibility=True
+        )
+        self.assertTrue(notification.publish())
+
+    def test_stream_requires_authentication(self):
+        sent = async_to_sync(self.stream)([])
+        self.assertEqual(sent[0]["status"], 401)
+
+    def test_stream_pushes_new_notifications(self):
+        headers = [(b"authorization", f"Bearer {self.access()}".encode())]
+        sent = async_to_sync(self.stream)(headers)
+
+        self.assertEqual(sent[0]["status"], 200)
+        self.assertIn(self.notification.id.hashid.encode(), sent[-1]["body"])
+        self.assertEqual(self.close_old_connections.call_count, 2)
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    EMAIL_BATCH_SIZE=2,
+)
+class EmailDispatchTestCase(TestCase):
+    def setUp(self):
+        get_redis_connection("default").delete(
+            email.EMAIL_QUEUE_KEY,
+            email.EMAIL_DISPATCH_KEY,
+            email.EMAIL_PROCESSING_KEY,
+            email.EMAIL_LOCK_KEY,
+        )
+        email.close_mail_connection()
+        self.addCleanup(email.close_mail_connection)
+
+    @mock.patch.object(email.dispatch_emails, "delay")
+    def test_queued_emails_are_sent_in_batches(self, delay):
+        recipients = [f"user{index}@example.com" for index in range(3)]
+        for recipient in recipients:
+            email.queue_email("Subject", recipient, "<p>Hello</p>")
+        delay.assert_called_once()
+
+        self.assertEqual(email.dispatch_emails(), 3)
+        self.assertEqual(
+            [message.to[0] for message in mail.outbox], recipients
+        )
+        self.assertEqual(mail.outbox[0].body, "Hello")
+        self.assertEqual(email.dispatch_emails(), 0)
+
+    @mock.patch.object(email.dispatch_emails, "delay")
+    def test_failed_batch_is_requeued(self, delay):
+        recipients = [f"user{index}@example.com" for index in range(3)]
+        for recipient in recipients:
+            email.queue_email("Subject", recipient, "<p>Hello</p>")
+
+        with mock.patch.object(email, "get_mail_connection") as connection:
+            connection.return_value.send_messages.side_effect = OSError
+            with self.assertRaises(OSError):
+                email.dispatch_emails()
+        redis = get_redis_connection("default")
+        self.assertEqual(redis.llen(email.EMAIL_QUEUE_KEY), 3)
+
+        self.assertEqual(email.dispatch_emails(), 3)
+        self.assertEqual(
+            [message.to[0] for message in mail.outbox], recipients
+        )
+
+    @mock.patch.object(email.dispatch_emails, "delay")
+    def test_refused_sender_requeues_unsent_emails(self, delay):
+        recipients = [f"user{index}@example.com" for index in range(3)]
+        for recipient in recipients:
+            email.queue_email("Subject", recipient, "<p>Hello</p>")
+
+        with mock.patch.object(email, "get_mail_connection") as connection:
+            connection.return_value.send_messages.side_effect = [
+                1,
+                smtplib.SMTPSenderRefused(451, b"Try again", "from@x.com"),
+            ]
+            with self.assertRaises(smtplib.SMTPSenderRefused):
+                email.dispatch_emails()
+
+        self.assertEqual(email.dispatch_emails(), 2)
+        self.assertEqual(
+            [message.to[0] for message in mail.outbox], recipients[1:]
+        )
+
+    def test_orphaned_batch_is_sent(self):
+        # Left in the processing list by a killed worker.
+        get_redis_connection("default").rpush(
+            email.EMAIL_PROCESSING_KEY,
+            json.dumps(
+                {
+                    "subject": "Subject",
+                    "to_email": "user@example.com",
+                    "html": "<p>Hello</p>",
+                }
+            ),
+        )
+
+        self.assertEqual(email.dispatch_emails(), 1)
+        self.assertEqual(mail.outbox[0].to, ["user@example.com"])
+
+
+class SMSDispatchTestCase(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(sms, "get_sns_client")
+        self.sns = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+    def test_bulk_sms_records_each_message_once(self):
+        self.sns.publish.side_effect = [
+            {"MessageId": "1"},
+            Exception("Invalid parameter: PhoneNumber"),
+        ]
+
+        message_ids = sms.send_bulk_sms(
+            [("+31600000001", "Hello"), ("", "Skipped")]
+        )
+        self.assertEqual(message_ids, ["1"])
+
+        message_ids = sms.send_bulk_sms([("+31600000002", "Hello")])
+        self.assertEqual(message_ids, [None])
+        alert = SMSAlerts.objects.get(phone="+31600000002")
+        self.assertEqual(alert.response_text, "Invalid parameter: PhoneNumber")
+        self.assertEqual(SMSAlerts.objects.count(), 2)
@@ -1,7 +1,5 @@
 """APIs for Notifications."""
 from django.conf import settings
-from django.db.models import Count
-from django.db.models import Q
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import filters
@@ -15,6 +13,7 @@ from utilities.functions import encode
 from v1.notifications import filters as noti_filters
 from v1.notifications import serializers
 from v1.notifications.models import Notification
+from v1.notifications.models import NotificationCounter
 
 # Create your views here.
 
@@ -24,7 +23,7 @@ class NotificationSummaryView(views.APIView):
 
     This view provides an API endpoint to retrieve a summary of
     notifications for a user, including counts of notifications and
-    unread notifications per entity.
+    unread notifications per entity, read from the notification counters.
     """
 
     http_method_names = ["get"]
@@ -32,15 +31,15 @@ class NotificationSummaryView(views.APIView):
     def get(self, request, *args, **kwargs):
         """Get the summary of notifications."""
         notif_summary = (
-            Notification.objects.filter(
-                user_id=session.get_from_local("user_id"), visibility=True
+            NotificationCounter.objects.filter(
+                user_id=session.get_from_local("user_id"), count__gt=0
             )
             .values(
-                "target_entity", "target_entity__name", "target_entity__image"
-            )
-            .annotate(
-                count=Count("id"),
-                unread_count=Count("id", filter=Q(is_read=False)),
+                "count",
+                "unread_count",
+                "target_entity",
+                "target_entity__name",
+                "target_entity__image",
             )
             .order_by("-count")
         )
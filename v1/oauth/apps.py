@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class OauthConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "v1.oauth"
+
+    def ready(self):
+        """Connect the signals of the app."""
+        from . import signals  # noqa: F401
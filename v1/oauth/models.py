@@ -1,6 +1,10 @@
+import hashlib
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from oauth2_provider.models import (AbstractAccessToken, AbstractApplication,
                                     AbstractIDToken, AbstractRefreshToken,
@@ -67,6 +71,10 @@ class ClientAccessToken(AbstractAccessToken):
             if the specified scopes are allowed.
         company_allowed(): Checks if the associated company is allowed
             based on the associated application's companies.
+        from_cache(token): Returns the validated token state from the
+            cache.
+        cache_state(): Caches the validated token state.
+        clear_cache(): Removes the token state from the cache.
     """
 
     company = models.ForeignKey(
@@ -75,6 +83,8 @@ class ClientAccessToken(AbstractAccessToken):
         verbose_name=_("Company"),
     )
 
+    _company_allowed = None
+
     def save(self, *args, **kwargs):
         """Overrides the save method to set the user based on the associated
         application's user if not provided.
@@ -129,7 +139,68 @@ class ClientAccessToken(AbstractAccessToken):
         Returns:
             bool: True if the associated company is allowed, False otherwise.
         """
-        return self.company in self.application.companies.all()
+        if self._company_allowed is None:
+            self._company_allowed = ClientServerCompany.objects.filter(
+                client_server_id=self.application_id,
+                company_id=self.company_id,
+            ).exists()
+        return self._company_allowed
+
+    @staticmethod
+    def cache_key(token):
+        """Returns the cache key of a token string.
+
+        The token is hashed, to keep bearer tokens out of the cache.
+        """
+        digest = hashlib.sha256(token.encode()).hexdigest()
+        return f"oauth2_token:{digest}"
+
+    @classmethod
+    def from_cache(cls, token):
+        """Returns the validated token from the cache.
+
+        The token is rebuilt from the cached state without querying the
+        database. Only tokens that passed `is_valid` are cached, so the
+        company allowlist check is not repeated.
+
+        Args:
+            token (str): The bearer token.
+
+        Returns:
+            ClientAccessToken: The token, or None if it is not cached or
+                has expired.
+        """
+        state = cache.get(cls.cache_key(token))
+        if not state:
+            return None
+        access_token = cls(token=token, **state)
+        if access_token.is_expired():
+            return None
+        access_token._company_allowed = True
+        return access_token
+
+    def cache_state(self):
+        """Caches the validated state of the token for
+        `OAUTH2_TOKEN_CACHE_TIMEOUT` seconds, or until it expires."""
+        timeout = min(
+            settings.OAUTH2_TOKEN_CACHE_TIMEOUT,
+            int((self.expires - timezone.now()).total_seconds()),
+        )
+        if timeout <= 0:
+            return
+        state = {
+            "id": self.id,
+            "scope": self.scope,
+            "expires": self.expires,
+            "user_id": self.user_id,
+            "company_id": self.company_id,
+            "application_id": self.application_id,
+        }
+        cache.set(self.cache_key(self.token), state, timeout)
+
+    def clear_cache(self):
+        """Removes the token state from the cache."""
+        cache.delete(self.cache_key(self.token))
 
 
 class ClientServerCompany(models.Model):
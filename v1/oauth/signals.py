@@ -0,0 +1,36 @@
+"""Signals to keep the cached OAuth2 token state in sync.
+
+The cache is cleared once the change is committed. A request reading the
+token before the commit would otherwise cache the old state again.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from v1.oauth.models import ClientAccessToken
+from v1.oauth.models import ClientServerCompany
+
+
+@receiver(post_save, sender=ClientAccessToken)
+@receiver(post_delete, sender=ClientAccessToken)
+def clear_token_cache(sender, instance, **kwargs):
+    """Drop the cached state of a token when it is changed or revoked."""
+    transaction.on_commit(instance.clear_cache)
+
+
+@receiver(post_delete, sender=ClientServerCompany)
+def clear_company_token_cache(sender, instance, **kwargs):
+    """Drop the cached state of the tokens issued for a company, when the
+    company is removed from the application."""
+    tokens = ClientAccessToken.objects.filter(
+        application_id=instance.client_server_id,
+        company_id=instance.company_id,
+    )
+    keys = [
+        ClientAccessToken.cache_key(token)
+        for token in tokens.values_list("token", flat=True)
+    ]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -10,6 +10,7 @@ from oauth2_provider.generators import generate_client_secret
 from oauth2_provider.scopes import get_scopes_backend
 from rest_framework.test import APITestCase
 
+from v1.oauth.models import ClientAccessToken
 from v1.oauth.models import ClientServer
 
 
@@ -74,6 +75,34 @@ class OAthTestCase(APITestCase):
         response_data = json.loads(response.content)
         self.assertTrue(response_data.get("access_token"))
 
+    def test_revoked_token_is_rejected(self):
+        url = reverse("token")
+        credential = f"{self.client_server.client_id}:{self.secret}"
+        token = base64.b64encode(credential.encode("utf-8"))
+        response = self.client.post(
+            url,
+            {"grant_type": "client_credentials"},
+            HTTP_AUTHORIZATION="Basic " + token.decode("utf-8"),
+            HTTP_X_ENTITY_ID=self.company.id,
+        )
+        access_token = json.loads(response.content)["access_token"]
+        headers = {
+            "HTTP_AUTHORIZATION": f"Bearer {access_token}",
+            "HTTP_AUTH_TYPE": "client_credentials",
+        }
+
+        url = reverse("farmers-list")
+        for _ in range(2):
+            response = self.client.get(url, **headers)
+            self.assertEqual(response.status_code, 200)
+
+        # The cached state is only dropped once the revocation commits.
+        with self.captureOnCommitCallbacks(execute=True):
+            ClientAccessToken.objects.get(token=access_token).revoke()
+            self.assertIsNotNone(ClientAccessToken.from_cache(access_token))
+        response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, 401)
+
     @property
     def headers(self):
         return {
@@ -2,14 +2,20 @@
 
 from django import forms
 from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.db.models import Exists
+from django.db.models import OuterRef
+from django.db.models import Subquery
 from django.utils.translation import gettext_lazy as _
 
 from base.db.admin import BaseAdmin
+from base.db.admin import CachedLookupsMixin
+from base.db.admin import LargeTableAdmin
 
 from .models import base_models, company_models, farmer_models
 
 
-class FarmerBuyerListFilter(admin.SimpleListFilter):
+class FarmerBuyerListFilter(CachedLookupsMixin, admin.SimpleListFilter):
     title = _("Buyer")
     # Parameter for the filter that will be used in the URL query.
     parameter_name = "buyer"
@@ -21,15 +27,22 @@ class FarmerBuyerListFilter(admin.SimpleListFilter):
         appear in the URL query. The second element is the
         human-readable name for the option that will appear
         in the right sidebar.
+
+        The latest companies are walked by id and probed for suppliers,
+        instead of reading the distinct buyers of all entities.
         """
-        return (
-            base_models.EntityBuyer.objects.values_list(
-                "buyer__id", "buyer__company__name"
+        buyers = (
+            company_models.Company.objects.filter(
+                Exists(
+                    base_models.EntityBuyer.objects.filter(
+                        buyer=OuterRef("pk")
+                    )
+                )
             )
-            .distinct("buyer__id")
-            .order_by("-buyer__id")
-            .all()[:10]
+            .order_by("-pk")
+            .values_list("pk", "name")[:10]
         )
+        return [(str(pk), name) for pk, name in buyers]
 
     def queryset(self, request, queryset):
         """
@@ -38,14 +51,14 @@ class FarmerBuyerListFilter(admin.SimpleListFilter):
         `self.value()`.
         """
         if self.value():
-            return farmer_models.Farmer.objects.filter(
-                id__in=base_models.EntityBuyer.objects.filter(
+            return queryset.filter(
+                pk__in=base_models.EntityBuyer.objects.filter(
                     buyer=self.value()
-                ).values_list("entity__id", flat=True)
+                ).values("entity_id")
             )
 
 
-class FarmerCreatorListFilter(admin.SimpleListFilter):
+class FarmerCreatorListFilter(CachedLookupsMixin, admin.SimpleListFilter):
     title = _("Creator")
     parameter_name = "creator"
 
@@ -56,16 +69,24 @@ class FarmerCreatorListFilter(admin.SimpleListFilter):
         appear in the URL query. The second element is the
         human-readable name for the option that will appear
         in the right sidebar.
+
+        The latest users are walked by id and probed for created
+        objects, instead of reading the distinct creators of all objects.
         """
         creators = (
-            model_admin.model.objects.filter(creator__id__isnull=False)
-            .values_list("creator__id", "creator__first_name", "creator__last_name")
-            .distinct("creator__id")
-            .order_by("-creator__id")
-            .all()[:10]
+            get_user_model()
+            .objects.filter(
+                Exists(
+                    model_admin.model.objects.filter(creator=OuterRef("pk"))
+                )
+            )
+            .order_by("-pk")
+            .values_list("pk", "first_name", "last_name")[:10]
         )
-
-        return [(creator[0], creator[1] + " " + creator[2]) for creator in creators]
+        return [
+            (str(pk), f"{first_name} {last_name}")
+            for pk, first_name, last_name in creators
+        ]
 
     def queryset(self, request, queryset):
         """
@@ -147,7 +168,31 @@ class EntityCardAdmin(BaseAdmin):
     ]
 
 
-class FarmerAdmin(BaseAdmin):
+class DefaultBuyerAdmin(LargeTableAdmin):
+    """Admin of entities listing the name of their default buyer, read in
+    the query of the changelist."""
+
+    def get_queryset(self, request):
+        """Annotate the name of the default buyer."""
+        buyers = base_models.EntityBuyer.objects.filter(
+            entity=OuterRef("pk"), is_default=True
+        ).order_by("-created_on")
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                default_buyer_name=Subquery(
+                    buyers.values("buyer__company__name")[:1]
+                )
+            )
+        )
+
+    @admin.display(description=_("Default buyer"))
+    def default_buyer(self, inst):
+        return inst.default_buyer_name
+
+
+class FarmerAdmin(DefaultBuyerAdmin):
     """Model representing a company entity."""
 
     list_display = (
@@ -170,16 +215,14 @@ class FarmerAdmin(BaseAdmin):
         FarmerBuyerListFilter,
         FarmerCreatorListFilter,
     ]
+    list_select_related = ("creator",)
     inlines = [EntiityBuyerAdminInline]
 
-    def default_buyer(self, inst):
-        return inst.buyer
-
 
-class EntityAdmin(BaseAdmin):
+class EntityAdmin(DefaultBuyerAdmin):
     """Model representing a company entity."""
 
-    list_display = ("id", "only_connect", "buyer")
+    list_display = ("id", "only_connect", "default_buyer")
 
 
 class EntityBuyerAdmin(BaseAdmin):
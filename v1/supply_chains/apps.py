@@ -10,3 +10,7 @@ class SupplyChainsConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "v1.supply_chains"
+
+    def ready(self):
+        """Connect the signals of the app."""
+        from . import signals  # noqa: F401
@@ -2,18 +2,28 @@ from django.db.models import Q
 from django_filters import rest_framework as filters
 
 from base.authentication import utilities as utils
+from base.drf.filters import GeoFilterSet
 from utilities.functions import decode, unix_to_datetime
 from v1.supply_chains.models.base_models import EntityBuyer, EntityCard
 from v1.supply_chains.models.company_models import Company
 from v1.supply_chains.models.farmer_models import Farmer
 
 
-class FarmerFilterSet(filters.FilterSet):
+class FarmerFilterSet(GeoFilterSet):
     """A filter set for the Farmer model.
 
-    This filter set allows filtering of Farmer objects.
+    This filter set allows filtering of Farmer objects, by location and
+    plot with the filters of GeoFilterSet.
     """
 
+    geo_area_fields = (
+        "plot_geohash",
+        "plot_min_latitude",
+        "plot_min_longitude",
+        "plot_max_latitude",
+        "plot_max_longitude",
+    )
+
     updated_after = filters.NumberFilter(
         method="after_date_time_filter", field_name="updated_on"
     )
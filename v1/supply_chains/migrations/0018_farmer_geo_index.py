@@ -0,0 +1,91 @@
+# Generated by Django 4.0.4 on 2026-10-19 04:22
+
+from django.db import migrations, models
+
+from utilities import geo
+
+
+def build_geo_index(apps, schema_editor):
+    Farmer = apps.get_model("supply_chains", "Farmer")
+    farmers = Farmer.objects.order_by("pk").only(
+        "latitude", "longitude", "geo_json"
+    )
+    last = 0
+    while True:
+        batch = list(farmers.filter(pk__gt=last)[:1000])
+        if not batch:
+            return
+        last = batch[-1].pk
+        for farmer in batch:
+            farmer.geohash = geo.point_geohash(
+                farmer.latitude, farmer.longitude
+            )
+            bbox = geo.bounding_box(farmer.geo_json)
+            if bbox:
+                farmer.plot_geohash = geo.bbox_geohash(bbox)
+                (
+                    farmer.plot_min_latitude,
+                    farmer.plot_min_longitude,
+                    farmer.plot_max_latitude,
+                    farmer.plot_max_longitude,
+                ) = bbox
+        Farmer.objects.bulk_update(
+            batch,
+            [
+                "geohash",
+                "plot_geohash",
+                "plot_min_latitude",
+                "plot_min_longitude",
+                "plot_max_latitude",
+                "plot_max_longitude",
+            ],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supply_chains', '0017_company_make_farmers_private'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='farmer',
+            name='geohash',
+            field=models.CharField(blank=True, editable=False, max_length=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='farmer',
+            name='plot_geohash',
+            field=models.CharField(blank=True, editable=False, max_length=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='farmer',
+            name='plot_max_latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='farmer',
+            name='plot_max_longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='farmer',
+            name='plot_min_latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='farmer',
+            name='plot_min_longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='farmer',
+            index=models.Index(fields=['geohash'], name='farmer_geohash_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='farmer',
+            index=models.Index(fields=['plot_geohash'], name='farmer_plot_geohash_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.RunPython(build_geo_index, migrations.RunPython.noop),
+    ]
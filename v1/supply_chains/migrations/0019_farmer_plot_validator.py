@@ -0,0 +1,19 @@
+# Generated by Django 4.0.4 on 2026-10-19 04:24
+
+from django.db import migrations, models
+import v1.supply_chains.validators
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supply_chains', '0018_farmer_geo_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='farmer',
+            name='geo_json',
+            field=models.JSONField(blank=True, null=True, validators=[v1.supply_chains.validators.validate_plot]),
+        ),
+    ]
@@ -9,7 +9,9 @@ from . import base_models
 from .. import constants as sc_consts
 from base.authentication import utilities as auth_utils
 from base.db import models as abstarct_models
+from v1.accounts import constants as acc_constants
 from v1.catalogs.models.product_models import Premium
+from v1.catalogs.models.product_models import Product
 from v1.forms import constants as form_consts
 from v1.forms.models import Form
 
@@ -180,28 +182,29 @@ class CompanyMember(abstarct_models.AbstractBaseModel):
     #     )
     #     notification_manager.send_notification()
 
-    # def get_notification_pref(self, notif_manager):
-    #     """Function to return notification preferences for a user."""
-    #     from v1.notifications.constants import NotificationCondition
-
-    #     def get_pref(config: dict) -> bool:
-    #         if self.type not in config.keys():
-    #             raise ValueError(_("Config not defined."))
-    #         if config[self.type] == NotificationCondition.ENABLED:
-    #             return True
-    #         elif config[self.type] == NotificationCondition.DISABLED:
-    #             return False
-    #         elif config[self.type] == NotificationCondition.IF_USER_ACTIVE:
-    #             return self.user.status == acc_constants.UserStatus.ACTIVE
-    #         return False
-
-    #     prefs = {
-    #         "visibility": get_pref(notif_manager.visibility),
-    #         "push": get_pref(notif_manager.push),
-    #         "email": get_pref(notif_manager.email),
-    #         "sms": get_pref(notif_manager.sms),
-    #     }
-    #     return prefs
+    def get_notification_pref(self, notif_manager):
+        """Function to return notification preferences for a user."""
+        from v1.notifications.constants import NotificationCondition
+
+        def get_pref(config: dict) -> bool:
+            condition = config.get(self.type, config.get("__all__"))
+            if condition is None:
+                raise ValueError(_("Config not defined."))
+            if condition == NotificationCondition.ENABLED:
+                return True
+            elif condition == NotificationCondition.DISABLED:
+                return False
+            elif condition == NotificationCondition.IF_USER_ACTIVE:
+                return self.user.status == acc_constants.UserStatus.ACTIVE
+            return False
+
+        prefs = {
+            "visibility": get_pref(notif_manager.visibility),
+            "push": get_pref(notif_manager.push),
+            "email": get_pref(notif_manager.email),
+            "sms": get_pref(notif_manager.sms),
+        }
+        return prefs
 
 
 class CompanyProduct(abstarct_models.AbstractBaseModel):
@@ -257,52 +260,106 @@ class CompanyProduct(abstarct_models.AbstractBaseModel):
     def save(self, *args, **kwargs):
         """Save method for the model.
 
-        This method performs atomic transactions and includes checks
-        related to premium removal, form validation, and premium check
-        before calling the parent class's save method.
+        This method performs atomic transactions and includes the form and
+        premium checks after calling the parent class's save method.
+        Changes of the premiums are tracked by the m2m_changed signal of
+        the premiums.
         """
-
-        self._check_premium_removal()
         super().save(*args, **kwargs)
         self._form_check()
         self._premium_check()
 
     def _form_check(self):
         """Check if the form is valid."""
-        if self.forms.exists():
-            for form in self.forms.all():
-                if form.form_type != form_consts.FormType.PRODUCT:
-                    raise ValueError(
-                        _("Invalid form type. Not a product form.")
-                    )
+        forms = self.forms.exclude(form_type=form_consts.FormType.PRODUCT)
+        if forms.exists():
+            raise ValueError(_("Invalid form type. Not a product form."))
 
     def _premium_check(self):
         """Check if the premium is valid."""
-        errors = []
-        for premium in self.premiums.all():
-            if premium not in self.company.owned_premiums.all():
-                errors.append(
-                    f"{premium.name} is not a premium of "
-                    f"{self.company.name}."
-                )
+        invalid = self.premiums.exclude(owner_id=self.company_id).values_list(
+            "name", flat=True
+        )
+        errors = [
+            f"{name} is not a premium of {self.company.name}."
+            for name in invalid
+        ]
         if errors:
             raise ValidationError(errors)
 
-    def _check_premium_removal(self):
-        """Check if the premium is valid."""
-        if self.pk:
-            old_premiums = self.__class__.objects.get(
-                pk=self.pk
-            ).premiums.only("id")
-            new_premiums = self.premiums.only("id")
-            removed_premiums = old_premiums.exclude(pk__in=new_premiums)
-            added_premiums = new_premiums.exclude(pk__in=old_premiums)
-            premuims_changed = (
-                removed_premiums.exists() or added_premiums.exists()
-            )
-            if premuims_changed:
-                self.product.updated_on = timezone.now()
-                self.product.save()
+    @classmethod
+    @transaction.atomic
+    def bulk_add_forms(cls, company_products, forms):
+        """Add forms to many company products with a single INSERT.
+
+        Args:
+            company_products: Company products, or a queryset of them.
+            forms: Forms to add to every company product.
+        """
+        forms = list(forms)
+        if any(f.form_type != form_consts.FormType.PRODUCT for f in forms):
+            raise ValueError(_("Invalid form type. Not a product form."))
+        through = cls.forms.through
+        through.objects.bulk_create(
+            [
+                through(companyproduct_id=company_product.pk, form_id=form.pk)
+                for company_product in company_products
+                for form in forms
+            ],
+            ignore_conflicts=True,
+        )
+        # bulk_create does not send m2m_changed.
+        Form.bump_versions([form.pk for form in forms])
+
+    @classmethod
+    @transaction.atomic
+    def bulk_add_premiums(cls, company_products, premiums):
+        """Add premiums to many company products with a single INSERT.
+
+        Args:
+            company_products: Company products, or a queryset of them.
+            premiums: Premiums to add to every company product.
+        """
+        from v1.catalogs.premiums import bump_premium_version
+
+        company_products = list(company_products)
+        errors = [
+            f"{premium.name} is not a premium of "
+            f"{company_product.company.name}."
+            for company_product in company_products
+            for premium in premiums
+            if premium.owner_id != company_product.company_id
+        ]
+        if errors:
+            raise ValidationError(errors)
+        through = cls.premiums.through
+        through.objects.bulk_create(
+            [
+                through(
+                    companyproduct_id=company_product.pk,
+                    premium_id=premium.pk,
+                )
+                for company_product in company_products
+                for premium in premiums
+            ],
+            ignore_conflicts=True,
+        )
+        # bulk_create does not send m2m_changed.
+        cls.touch_products([cp.product_id for cp in company_products])
+        company_ids = {cp.company_id for cp in company_products}
+
+        def bump_versions():
+            for company_id in company_ids:
+                bump_premium_version(company_id)
+
+        transaction.on_commit(bump_versions)
+
+    @staticmethod
+    def touch_products(product_ids):
+        """Mark the products as updated after their premiums changed."""
+        Product.objects.filter(pk__in=product_ids).update(
+            updated_on=timezone.now()
+        )
 
 
 class CompanyFieldVisibilty(abstarct_models.AbstractBaseModel):
@@ -8,12 +8,12 @@ from pyexpat import model
 from base.db import models as abstarct_models
 from base.db.models import AbstractBaseModel
 from base.db.utilities import get_file_path
+from utilities import geo
 from v1.catalogs.models.product_models import Premium
 from v1.forms.models import Submission
 from v1.supply_chains import constants as sc_consts
 from v1.supply_chains.models import base_models
-from v1.supply_chains.validators import (validate_coordinates,
-                                         validate_geojson_polygon)
+from v1.supply_chains.validators import validate_plot
 from v1.transactions.models.transaction_models import ProductTransaction
 
 
@@ -80,9 +80,41 @@ class Farmer(AbstractFarmerModel):
     geo_json = models.JSONField(
         null=True,
         blank=True,
-        validators=[validate_geojson_polygon, validate_coordinates],
+        validators=[validate_plot],
     )
     meta_data = models.JSONField(null=True, blank=True)
+    geohash = models.CharField(
+        max_length=12, null=True, blank=True, editable=False
+    )
+    plot_geohash = models.CharField(
+        max_length=12, null=True, blank=True, editable=False
+    )
+    plot_min_latitude = models.FloatField(
+        null=True, blank=True, editable=False
+    )
+    plot_min_longitude = models.FloatField(
+        null=True, blank=True, editable=False
+    )
+    plot_max_latitude = models.FloatField(
+        null=True, blank=True, editable=False
+    )
+    plot_max_longitude = models.FloatField(
+        null=True, blank=True, editable=False
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["geohash"],
+                name="farmer_geohash_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+            models.Index(
+                fields=["plot_geohash"],
+                name="farmer_plot_geohash_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -94,8 +126,26 @@ class Farmer(AbstractFarmerModel):
         """
         if self.last_name is None:
             self.last_name = ''
+        self.update_geo_index()
         super().save(*args, **kwargs)
 
+    def update_geo_index(self):
+        """Update the geohashes and the plot bounding box from the location
+        and the plot."""
+        self.geohash = geo.point_geohash(self.latitude, self.longitude)
+        bbox = geo.bounding_box(self.geo_json)
+        if bbox:
+            self.plot_geohash = geo.bbox_geohash(bbox)
+        else:
+            self.plot_geohash = None
+            bbox = (None, None, None, None)
+        (
+            self.plot_min_latitude,
+            self.plot_min_longitude,
+            self.plot_max_latitude,
+            self.plot_max_longitude,
+        ) = bbox
+
     @property
     def name(self):
         """Returns the full name of the farmer."""
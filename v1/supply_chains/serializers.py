@@ -23,8 +23,7 @@ from v1.supply_chains.models.company_models import (Company,
                                                     CompanyMember,
                                                     CompanyProduct)
 from v1.supply_chains.models.farmer_models import Farmer, FarmerService
-from v1.supply_chains.validators import (validate_coordinates,
-                                         validate_geojson_polygon)
+from v1.supply_chains.validators import validate_plot
 from v1.transactions.models.payment_models import PaymentTransaction
 from v1.transactions.models.transaction_models import ProductTransaction
 
@@ -348,7 +347,7 @@ class FarmerSerializer(DynamicModelSerializer):
     plots = serializers.JSONField(
         source="geo_json", 
         allow_null=True, 
-        validators=[validate_geojson_polygon, validate_coordinates], 
+        validators=[validate_plot],
         required=False
     )
     province = serializers.CharField(required=True)
@@ -362,6 +361,7 @@ class FarmerSerializer(DynamicModelSerializer):
     class Meta:
         model = Farmer
         fields = "__all__"
+        optimize = True
 
     def get_linked_services(self, obj):
         qs = FarmerService.objects.filter(farmer=obj, is_active=True, service__is_available=True).all()
@@ -0,0 +1,39 @@
+"""Signals of the supply chains app."""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from base.authentication.utilities import membership_cache_key
+from v1.supply_chains.models.company_models import CompanyMember
+from v1.supply_chains.models.company_models import CompanyProduct
+
+
+@receiver(post_save, sender=CompanyMember)
+@receiver(post_delete, sender=CompanyMember)
+def clear_membership_cache(sender, instance, **kwargs):
+    """Drop the cached session membership of the member user, once the
+    change is committed."""
+    key = membership_cache_key(instance.user_id)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+@receiver(m2m_changed, sender=CompanyProduct.premiums.through)
+def touch_premium_products(sender, instance, action, reverse, **kwargs):
+    """Mark the products as updated when premiums of company products are
+    added or removed."""
+    pk_set = kwargs["pk_set"]
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            CompanyProduct.touch_products([instance.product_id])
+    elif action == "pre_clear":
+        # The cleared company products are not known after the clear.
+        CompanyProduct.touch_products(
+            instance.company_products.values("product_id")
+        )
+    elif action in ("post_add", "post_remove") and pk_set:
+        CompanyProduct.touch_products(
+            CompanyProduct.objects.filter(pk__in=pk_set).values("product_id")
+        )
@@ -1,12 +1,21 @@
 import json
+import math
 
+from django.contrib import admin
+from django.forms import ValidationError
+from django.test import RequestFactory
 from django.urls import reverse
 from mixer.backend.django import mixer
 
+from base.db.admin import EstimatedCountPaginator
 from v1.accounts.tests.base import BaseTestCase
 from v1.catalogs.constants import PremiumCategory
 from v1.forms.constants import FormType
 from v1.supply_chains.constants import CompanyMemberType
+from v1.supply_chains.filters import FarmerFilterSet
+from v1.supply_chains.models.farmer_models import Farmer
+from v1.supply_chains.models.company_models import CompanyProduct
+from v1.supply_chains.validators import validate_plot
 
 
 class SupplyChainTestCase(BaseTestCase):
@@ -76,6 +85,110 @@ class SupplyChainTestCase(BaseTestCase):
         )
         self.assertEqual(response.status_code, 201)
 
+    def test_bulk_add_premiums(self):
+        company_products = mixer.cycle(2).blend(
+            "supply_chains.CompanyProduct", company=self.company
+        )
+        premium = mixer.blend(
+            "catalogs.Premium",
+            owner=self.company,
+            category=PremiumCategory.TRANSACTION,
+        )
+        foreign_premium = mixer.blend(
+            "catalogs.Premium", category=PremiumCategory.TRANSACTION
+        )
+        with self.assertRaises(ValidationError):
+            CompanyProduct.bulk_add_premiums(
+                company_products, [premium, foreign_premium]
+            )
+        with self.assertNumQueries(4):
+            CompanyProduct.bulk_add_premiums(company_products, [premium])
+        for company_product in company_products:
+            self.assertEqual(list(company_product.premiums.all()), [premium])
+
+    def test_farmer_geo_filters(self):
+        farmer = mixer.blend(
+            "supply_chains.Farmer",
+            latitude=45.5,
+            longitude=-122.7,
+            geo_json={
+                "type": "Polygon",
+                "coordinates": [
+                    [
+                        [-122.8, 45.48],
+                        [-122.8, 45.6],
+                        [-122.58, 45.6],
+                        [-122.8, 45.48],
+                    ]
+                ],
+            },
+        )
+        self.assertEqual(farmer.plot_min_latitude, 45.48)
+        self.assertTrue(farmer.geohash.startswith("c20"))
+        farmers = Farmer.objects.all()
+        filterset = FarmerFilterSet()
+        # Only the plot is within the box.
+        bbox = "45.59,-122.6,46,-122"
+        self.assertIn(farmer, filterset.bbox_filter(farmers, "bbox", bbox))
+        self.assertIn(
+            farmer, filterset.near_filter(farmers, "near", "45.51,-122.7,2")
+        )
+        self.assertNotIn(
+            farmer, filterset.near_filter(farmers, "near", "45.6,-122.7,2")
+        )
+        polygon = "[[-123, 45], [-122, 45], [-122, 46], [-123, 46]]"
+        self.assertIn(
+            farmer, filterset.polygon_filter(farmers, "polygon", polygon)
+        )
+
+    def test_farmer_admin_queryset(self):
+        farmer = mixer.blend("supply_chains.Farmer")
+        mixer.blend(
+            "supply_chains.EntityBuyer",
+            entity=farmer,
+            buyer=self.company,
+            is_default=True,
+        )
+        model_admin = admin.site._registry[Farmer]
+        farmers = model_admin.get_queryset(None)
+        self.assertEqual(
+            model_admin.default_buyer(farmers.get(pk=farmer.pk)),
+            self.company.name,
+        )
+        paginator = EstimatedCountPaginator(farmers, 10)
+        self.assertEqual(paginator.count, farmers.count())
+
+        # Only unfiltered changelists are estimated.
+        request = RequestFactory().get("/", {"p": "2", "o": "1"})
+        paginator = model_admin.get_paginator(request, farmers, 10)
+        self.assertTrue(paginator.estimate)
+        request = RequestFactory().get("/", {"q": "name", "p": "2"})
+        paginator = model_admin.get_paginator(request, farmers, 10)
+        self.assertFalse(paginator.estimate)
+
+    def test_validate_plot(self):
+        square = [[0.1, 0.1], [0.1, 1], [1, 1], [1, 0.1], [0.1, 0.1]]
+        plot = {"type": "Polygon", "coordinates": [square]}
+        self.assertEqual(validate_plot(plot), plot)
+        bowtie = [[0.1, 0.1], [1, 1], [1, 0.1], [0.1, 1], [0.1, 0.1]]
+        with self.assertRaisesMessage(ValidationError, "0 and 2 intersect"):
+            validate_plot({"type": "Polygon", "coordinates": [bowtie]})
+        square[2] = [1, 91]
+        with self.assertRaisesMessage(ValidationError, "Ring 0, vertex 2"):
+            validate_plot({"type": "Polygon", "coordinates": [square]})
+
+        # Large rings are checked as arrays.
+        circle = [
+            [math.cos(index / 20), math.sin(index / 20)]
+            for index in range(126)
+        ]
+        circle.append(circle[0])
+        plot = {"type": "Polygon", "coordinates": [circle]}
+        self.assertEqual(validate_plot(plot), plot)
+        circle[1], circle[2] = circle[2], circle[1]
+        with self.assertRaisesMessage(ValidationError, "0 and 2 intersect"):
+            validate_plot(plot)
+
     def test_create_company(self):
         url = reverse("companies-list")
         data = {
@@ -1,8 +1,12 @@
 import json
+import math
 
+import numpy as np
 from django.core.exceptions import ValidationError
 
 
+# validate_geojson_polygon and validate_coordinates are superseded by
+# validate_plot, and kept for the migrations referring to them.
 def validate_geojson_polygon(json_data):
 	"""
 	Validate GeoJSON Polygon.
@@ -106,4 +110,266 @@ def validate_coordinates(json_data):
                 f"Latitude must be between -90 and 90. "
             )
     if errors:
-        raise ValidationError(errors)
\ No newline at end of file
+        raise ValidationError(errors)
+
+# Number of invalid vertices reported per plot, the rest are counted.
+MAX_VERTEX_ERRORS = 20
+
+# Segments covering more grid cells than this are compared with every other
+# segment in the self-intersection check, instead of through the grid.
+MAX_SEGMENT_CELLS = 64
+
+# Rings with fewer vertices than this are checked in pure Python. Below it,
+# converting the ring to arrays costs more than comparing every segment.
+SMALL_RING_VERTICES = 64
+
+STRUCTURE_ERROR = "Each coordinate should be a list of length 2"
+LENGTH_ERROR = "A ring needs at least 4 positions"
+CLOSURE_ERROR = "The first and last positions should be equal"
+
+
+def _cross(u, v):
+    """Returns the cross products of two arrays of 2D vectors."""
+    return u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+
+
+def _group_pairs(keys):
+    """Returns the (i, j) index pairs, i < j, of the equal items of a sorted
+    array."""
+    ends = np.searchsorted(keys, keys, side="right")
+    counts = ends - np.arange(len(keys)) - 1
+    rows = np.repeat(np.arange(len(keys)), counts)
+    steps = np.arange(len(rows)) - np.repeat(
+        np.cumsum(counts) - counts, counts
+    )
+    return rows, rows + 1 + steps
+
+
+def _candidate_pairs(start, end):
+    """Returns the (low, high) index arrays of the segments whose bounding
+    boxes share a cell of a grid sized to the segments.
+
+    Each segment is only paired with the segments near it, so for plots the
+    number of pairs grows linearly with the number of vertices.
+    """
+    count = len(start)
+    low, high = np.minimum(start, end), np.maximum(start, end)
+    size = (high - low).max(axis=1).mean()
+    if not size > 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    origin = low.min(axis=0)
+    first = ((low - origin) // size).astype(np.int64)
+    last = ((high - origin) // size).astype(np.int64)
+    spans = last - first + 1
+    cells = spans[:, 0] * spans[:, 1]
+    big = np.flatnonzero(cells > MAX_SEGMENT_CELLS)
+    small = np.flatnonzero(cells <= MAX_SEGMENT_CELLS)
+
+    # One entry per segment and cell it covers, grouped by cell.
+    repeats = cells[small]
+    segments = np.repeat(small, repeats)
+    offsets = np.arange(len(segments)) - np.repeat(
+        np.cumsum(repeats) - repeats, repeats
+    )
+    rows = first[segments, 0] + offsets // spans[segments, 1]
+    columns = first[segments, 1] + offsets % spans[segments, 1]
+    keys = rows * (last[:, 1].max() + 1) + columns
+    order = np.argsort(keys, kind="stable")
+    i, j = _group_pairs(keys[order])
+    a, b = segments[order][i], segments[order][j]
+
+    if len(big):
+        a = np.concatenate([a, np.repeat(big, count)])
+        b = np.concatenate([b, np.tile(np.arange(count), len(big))])
+    pairs = np.unique(np.minimum(a, b) * count + np.maximum(a, b))
+    pairs = pairs[pairs // count != pairs % count]
+    return pairs // count, pairs % count
+
+
+def _segments_intersect(ring):
+    """Returns the index pairs of the segments of a closed ring which cross
+    each other.
+
+    Only segments near each other are compared, with array operations.
+    Adjacent segments share a vertex and are skipped; segments which only
+    touch are not reported.
+    """
+    start, end = ring[:-1], ring[1:]
+    count = len(start)
+    first, second = _candidate_pairs(start, end)
+    # Adjacent segments, including the first and the last segment, share a
+    # vertex.
+    keep = (second - first > 1) & ~((first == 0) & (second == count - 1))
+    first, second = first[keep], second[keep]
+    p1, p2, q1, q2 = start[first], end[first], start[second], end[second]
+    p_dir, q_dir = p2 - p1, q2 - q1
+    hits = (_cross(q_dir, p1 - q1) * _cross(q_dir, p2 - q1) < 0) & (
+        _cross(p_dir, q1 - p1) * _cross(p_dir, q2 - p1) < 0
+    )
+    return list(zip(first[hits].tolist(), second[hits].tolist()))
+
+
+def _small_segments_intersect(ring):
+    """Returns the index pairs of the segments of a closed ring which cross
+    each other, comparing every pair of segments whose bounding boxes
+    overlap."""
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    segments = list(zip(ring[:-1], ring[1:]))
+    boxes = [
+        (min(p[0], q[0]), min(p[1], q[1]), max(p[0], q[0]), max(p[1], q[1]))
+        for p, q in segments
+    ]
+    count = len(segments)
+    hits = []
+    for first in range(count):
+        p1, p2 = segments[first]
+        box = boxes[first]
+        # Adjacent segments, including the first and the last segment,
+        # share a vertex.
+        for second in range(first + 2, count - (first == 0)):
+            other = boxes[second]
+            if (
+                other[0] > box[2]
+                or other[2] < box[0]
+                or other[1] > box[3]
+                or other[3] < box[1]
+            ):
+                continue
+            q1, q2 = segments[second]
+            if (
+                cross(q1, q2, p1) * cross(q1, q2, p2) < 0
+                and cross(p1, p2, q1) * cross(p1, p2, q2) < 0
+            ):
+                hits.append((first, second))
+    return hits
+
+
+def _check_small_ring(ring):
+    """Checks a ring of a few vertices with lists.
+
+    Returns:
+        tuple: The error of the ring, the (index, longitude, latitude) of
+            its invalid vertices and its crossing segments.
+    """
+    try:
+        points = [(float(lon), float(lat)) for lon, lat in ring]
+    except (TypeError, ValueError):
+        return STRUCTURE_ERROR, [], []
+    if not points:
+        return STRUCTURE_ERROR, [], []
+    if len(points) < 4:
+        return LENGTH_ERROR, [], []
+    invalid = [
+        (index, lon, lat)
+        for index, (lon, lat) in enumerate(points)
+        if not (math.isfinite(lon) and math.isfinite(lat))
+        or abs(lon) > 180
+        or abs(lat) > 90
+    ]
+    if invalid:
+        return None, invalid, []
+    if points[0] != points[-1]:
+        return CLOSURE_ERROR, [], []
+    return None, [], _small_segments_intersect(points)
+
+
+def _check_ring(ring):
+    """Checks a ring with array operations.
+
+    Returns:
+        tuple: The error of the ring, the (index, longitude, latitude) of
+            its invalid vertices and its crossing segments.
+    """
+    try:
+        points = np.asarray(ring, dtype=float)
+    except (TypeError, ValueError):
+        points = None
+    if points is None or points.ndim != 2 or points.shape[1] != 2:
+        return STRUCTURE_ERROR, [], []
+    if len(points) < 4:
+        return LENGTH_ERROR, [], []
+    invalid = (
+        ~np.isfinite(points).all(axis=1)
+        | (np.abs(points[:, 0]) > 180)
+        | (np.abs(points[:, 1]) > 90)
+    )
+    if invalid.any():
+        indexes = np.flatnonzero(invalid)
+        return (
+            None,
+            [
+                (index, *point)
+                for index, point in zip(
+                    indexes.tolist(), points[indexes].tolist()
+                )
+            ],
+            [],
+        )
+    if not np.array_equal(points[0], points[-1]):
+        return CLOSURE_ERROR, [], []
+    return None, [], _segments_intersect(points)
+
+
+def validate_plot(json_data):
+    """Validate the GeoJSON polygon of a plot.
+
+    Accepts a Feature with a Polygon geometry, or a Polygon geometry. The
+    coordinates of each ring are checked for their structure, the
+    longitude and latitude ranges, the closure of the ring and crossing
+    segments, as arrays for large rings. Invalid vertices are reported
+    with their ring and index.
+    """
+    if not json_data:
+        return json_data
+    if isinstance(json_data, str):
+        try:
+            json_data = json.loads(json_data)
+        except json.JSONDecodeError:
+            raise ValidationError("Invalid JSON")
+    if not isinstance(json_data, dict):
+        raise ValidationError("JSON data should be a dictionary")
+
+    geometry = json_data
+    if json_data.get("type") == "Feature":
+        geometry = json_data.get("geometry")
+        if not isinstance(geometry, dict):
+            raise ValidationError("Missing 'geometry' key")
+    if geometry.get("type") != "Polygon":
+        raise ValidationError(
+            "Invalid type within 'geometry'. It should be 'Polygon'"
+        )
+    rings = geometry.get("coordinates")
+    if not isinstance(rings, list) or not rings:
+        raise ValidationError("'coordinates' should be a list of lists")
+
+    errors = []
+    vertex_errors = 0
+    for number, ring in enumerate(rings):
+        small = isinstance(ring, list) and len(ring) < SMALL_RING_VERTICES
+        check = _check_small_ring if small else _check_ring
+        error, invalid, crossings = check(ring)
+        if error:
+            errors.append(f"Ring {number}: {error}")
+        for index, lon, lat in invalid:
+            vertex_errors += 1
+            if vertex_errors <= MAX_VERTEX_ERRORS:
+                errors.append(
+                    f"Ring {number}, vertex {index} "
+                    f"[{lon}, {lat}]: Longitude must be between"
+                    f" -180 and 180. Latitude must be between -90 and 90."
+                )
+        for first, second in crossings[:MAX_VERTEX_ERRORS]:
+            errors.append(
+                f"Ring {number}: Segments {first} and {second} intersect"
+            )
+
+    if vertex_errors > MAX_VERTEX_ERRORS:
+        errors.append(
+            f"{vertex_errors - MAX_VERTEX_ERRORS} more invalid vertices"
+        )
+    if errors:
+        raise ValidationError(errors)
+    return json_data
@@ -1,12 +1,12 @@
 from django.contrib import admin
 
-from base.db.admin import BaseAdmin
+from base.db.admin import LargeTableAdmin
 from v1.transactions.models.payment_models import PaymentTransaction
 from v1.transactions.models.transaction_models import ProductTransaction
 
 
 @admin.register(ProductTransaction)
-class ProductTransactionAdmin(BaseAdmin):
+class ProductTransactionAdmin(LargeTableAdmin):
     """Admin class for managing ProductTransaction instances.
 
     Attributes:
@@ -22,6 +22,14 @@ class ProductTransactionAdmin(BaseAdmin):
         "quantity",
         "creator_email",
     ]
+    # The names of the entities are read from their company or farmer.
+    list_select_related = (
+        "source__company",
+        "source__farmer",
+        "destination__company",
+        "destination__farmer",
+        "creator",
+    )
     autocomplete_fields = ['product', "source", "destination", "card","parents",]
 
     def creator_email(self, obj):
@@ -30,7 +38,7 @@ class ProductTransactionAdmin(BaseAdmin):
 
 
 @admin.register(PaymentTransaction)
-class PaymentTransactionAdmin(BaseAdmin):
+class PaymentTransactionAdmin(LargeTableAdmin):
     """Admin class for managing ProductTransaction instances.
 
     Attributes:
@@ -47,6 +55,14 @@ class PaymentTransactionAdmin(BaseAdmin):
         "creator_email",
         "premium_name",
     ]
+    list_select_related = (
+        "source__company",
+        "source__farmer",
+        "destination__company",
+        "destination__farmer",
+        "creator",
+        "premium",
+    )
     autocomplete_fields = ['premium', "currency", "transaction", "source", "destination", "card",]
 
     def creator_email(self, obj):
@@ -10,3 +10,8 @@ class TransactionConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "v1.transactions"
+
+    def ready(self):
+        """Connect the signals of the app and register its tasks."""
+        from . import exports  # noqa: F401
+        from . import signals  # noqa: F401
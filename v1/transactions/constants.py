@@ -34,3 +34,16 @@ class VerificationMethodType(models.TextChoices):
     CARD = "CARD", _("Card")
     INVOICE = "INVOICE", _("Invoice")
     NONE = "NONE", _("None")
+
+
+class RollupSourceType(models.TextChoices):
+    """A class to define text choices for the kind of entity a company
+    paid, in the company rollups.
+
+    Choices:
+    - FARMER: Payments to farmers.
+    - COMPANY: Payments to companies.
+    """
+
+    FARMER = "FARMER", _("Farmer")
+    COMPANY = "COMPANY", _("Company")
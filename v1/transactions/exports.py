@@ -0,0 +1,175 @@
+"""GeoJSON exports of the farmers behind a batch, for due diligence.
+
+The upstream farmers of a transaction are read from the transaction lineage
+in chunks with keyset pagination, and the FeatureCollection is written one
+feature at a time. Server-side cursors are disabled for the connection
+pooler, so chunks of GEOJSON_EXPORT_CHUNK_SIZE rows keep the memory used by
+an export constant instead.
+
+Exports hold the plots of farmers, so on S3 they are stored private and
+served with signed URLs. They are deleted after GEOJSON_EXPORT_EXPIRY
+seconds.
+"""
+import json
+import tempfile
+
+from celery import current_app as app
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.files.storage import get_storage_class
+from django.db.models import Sum
+from django.utils import timezone
+from storages.backends.s3boto3 import S3Boto3Storage
+
+from v1.supply_chains.models.farmer_models import Farmer
+from v1.transactions.models.transaction_models import ProductTransaction
+from v1.transactions.models.transaction_models import TransactionLineage
+
+
+def export_cache_key(transaction_id):
+    """Returns the cache key of the latest export of a transaction."""
+    return f"geojson_export:{transaction_id}"
+
+
+def export_storage():
+    """Returns the storage of the exports, private with expiring signed
+    URLs on S3."""
+    storage_class = get_storage_class()
+    if issubclass(storage_class, S3Boto3Storage):
+        return storage_class(
+            default_acl="private",
+            querystring_auth=True,
+            querystring_expire=settings.GEOJSON_EXPORT_EXPIRY,
+        )
+    return default_storage
+
+
+def export_url(transaction_id):
+    """Returns the URL of the latest export of a transaction, or None if
+    there is no export ready."""
+    name = cache.get(export_cache_key(transaction_id))
+    return export_storage().url(name) if name else None
+
+
+def upstream_supplies(transaction_id):
+    """Returns the quantity supplied by each farmer upstream of a
+    transaction, including the transaction itself, ordered by farmer."""
+    transaction_id = int(transaction_id)
+    if not TransactionLineage.objects.filter(
+        ancestor_id=transaction_id, descendant_id=transaction_id
+    ).exists():
+        TransactionLineage.rebuild([transaction_id])
+    return (
+        ProductTransaction.objects.filter(
+            descendant_links__descendant_id=transaction_id,
+            is_deleted=False,
+            source__farmer__isnull=False,
+        )
+        .values("source_id")
+        .annotate(quantity=Sum("quantity"))
+        .order_by("source_id")
+    )
+
+
+def iter_farmers(transaction_id, chunk_size=None):
+    """Yields the upstream farmers of a transaction with the quantity they
+    supplied, fetching chunk_size farmers per query."""
+    chunk_size = chunk_size or settings.GEOJSON_EXPORT_CHUNK_SIZE
+    supplies = upstream_supplies(transaction_id)
+    last = None
+    while True:
+        rows = supplies
+        if last is not None:
+            rows = supplies.filter(source_id__gt=last)
+        chunk = list(rows[:chunk_size])
+        if not chunk:
+            return
+        last = chunk[-1]["source_id"]
+        farmers = Farmer.objects.only(
+            "first_name", "last_name", "reference_number", "geo_json"
+        ).in_bulk([row["source_id"] for row in chunk])
+        for row in chunk:
+            farmer = farmers.get(row["source_id"])
+            if farmer:
+                yield farmer, row["quantity"] or 0
+
+
+def feature(farmer, quantity, total):
+    """Returns the GeoJSON feature of the plot of a farmer."""
+    geo_json = farmer.geo_json
+    if isinstance(geo_json, str):
+        geo_json = json.loads(geo_json)
+    if isinstance(geo_json, dict) and geo_json.get("type") == "Feature":
+        geo_json = geo_json.get("geometry")
+    return {
+        "type": "Feature",
+        "geometry": geo_json or None,
+        "properties": {
+            "farmer_id": str(farmer.pk),
+            "name": farmer.name,
+            "reference_number": farmer.reference_number,
+            "quantity": float(quantity),
+            "share": float(quantity / total) if total else 0.0,
+        },
+    }
+
+
+def stream_geojson(transaction):
+    """Yields the FeatureCollection of the upstream plots of a transaction
+    in chunks of text."""
+    total = (
+        upstream_supplies(transaction.pk)
+        .order_by()
+        .aggregate(total=Sum("quantity"))["total"]
+        or 0
+    )
+    properties = {
+        "transaction_id": str(transaction.pk),
+        "number": transaction.number,
+        "quantity": float(transaction.quantity or 0),
+        "upstream_quantity": float(total),
+    }
+    yield (
+        '{"type": "FeatureCollection", '
+        f'"properties": {json.dumps(properties)}, "features": ['
+    )
+    separator = "\n"
+    for farmer, quantity in iter_farmers(transaction.pk):
+        yield separator + json.dumps(feature(farmer, quantity, total))
+        separator = ",\n"
+    yield "\n]}\n"
+
+
+@app.task(name="export_upstream_geojson")
+def export_upstream_geojson(transaction_id):
+    """Export the upstream plots of a transaction to the export storage.
+
+    Returns:
+        str: Name of the exported file.
+    """
+    transaction = ProductTransaction.objects.get(pk=transaction_id)
+    storage = export_storage()
+    with tempfile.TemporaryFile() as file:
+        for chunk in stream_geojson(transaction):
+            file.write(chunk.encode())
+        file.seek(0)
+        timestamp = timezone.now().strftime("%Y%m%d%H%M%S")
+        name = storage.save(
+            f"exports/geojson/{transaction.pk}-{timestamp}.geojson",
+            File(file),
+        )
+    cache.set(
+        export_cache_key(transaction.pk), name, settings.GEOJSON_EXPORT_EXPIRY
+    )
+    delete_export.apply_async(
+        (name,), countdown=settings.GEOJSON_EXPORT_EXPIRY
+    )
+    return name
+
+
+@app.task(name="delete_geojson_export")
+def delete_export(name):
+    """Delete an expired export."""
+    export_storage().delete(name)
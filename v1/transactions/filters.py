@@ -2,18 +2,26 @@ from django.db.models import Count, Q
 from django_filters import rest_framework as filters
 
 from base.authentication import utilities as auth_utils
+from base.drf.filters import GeoFilterSet
 from utilities.functions import decode, unix_to_datetime
 from v1.supply_chains.models.base_models import Entity
 from v1.transactions.constants import PaymentType
 from v1.transactions.models import payment_models, transaction_models
 
 
-class ProductTransactionFilterSet(filters.FilterSet):
+class ProductTransactionFilterSet(GeoFilterSet):
     """A filter set for the Farmer model.
 
-    This filter set allows filtering of Product Transaction objects.
+    This filter set allows filtering of Product Transaction objects, by
+    verification location with the filters of GeoFilterSet.
     """
 
+    geo_point_fields = (
+        "verification_geohash",
+        "verification_latitude",
+        "verification_longitude",
+    )
+
     # TODO: Change this filter after informing the frontend.
     updated_after = filters.NumberFilter(
         method="updated_after_filter", field_name="updated_on"
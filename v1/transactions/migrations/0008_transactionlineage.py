@@ -0,0 +1,54 @@
+# Generated by Django 4.0.4 on 2026-10-19 04:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_lineage(apps, schema_editor):
+    ProductTransaction = apps.get_model("transactions", "ProductTransaction")
+    TransactionLineage = apps.get_model("transactions", "TransactionLineage")
+    tables = {
+        "lineage": TransactionLineage._meta.db_table,
+        "transactions": ProductTransaction._meta.db_table,
+        "pk": ProductTransaction._meta.pk.column,
+        "parents": ProductTransaction.parents.through._meta.db_table,
+    }
+    schema_editor.execute(
+        """
+        WITH RECURSIVE up (descendant_id, ancestor_id, depth) AS (
+            SELECT {pk}, {pk}, 0 FROM {transactions}
+            UNION ALL
+            SELECT up.descendant_id, link.to_producttransaction_id,
+                   up.depth + 1
+            FROM up JOIN {parents} link
+              ON link.from_producttransaction_id = up.ancestor_id
+        )
+        INSERT INTO {lineage} (ancestor_id, descendant_id, depth)
+        SELECT ancestor_id, descendant_id, MIN(depth) FROM up
+        GROUP BY ancestor_id, descendant_id
+        """.format(**tables)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0007_paymenttransaction_comment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransactionLineage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField(default=0, verbose_name='Depth')),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='transactions.producttransaction', verbose_name='Ancestor')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='transactions.producttransaction', verbose_name='Descendant')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='transactionlineage',
+            constraint=models.UniqueConstraint(fields=('ancestor', 'descendant'), name='unique_transaction_lineage'),
+        ),
+        migrations.RunPython(build_lineage, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.0.4 on 2026-10-19 04:22
+
+from django.db import migrations, models
+
+from utilities import geo
+
+
+def build_geo_index(apps, schema_editor):
+    BaseTransaction = apps.get_model("transactions", "BaseTransaction")
+    transactions = BaseTransaction.objects.order_by("pk").only(
+        "verification_latitude", "verification_longitude"
+    )
+    last = 0
+    while True:
+        batch = list(transactions.filter(pk__gt=last)[:1000])
+        if not batch:
+            return
+        last = batch[-1].pk
+        for transaction in batch:
+            transaction.verification_geohash = geo.point_geohash(
+                transaction.verification_latitude,
+                transaction.verification_longitude,
+            )
+        BaseTransaction.objects.bulk_update(batch, ["verification_geohash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0008_transactionlineage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='basetransaction',
+            name='verification_geohash',
+            field=models.CharField(blank=True, editable=False, max_length=12, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='basetransaction',
+            index=models.Index(fields=['verification_geohash'], name='transaction_geohash_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.RunPython(build_geo_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 4.0.4 on 2026-10-19 04:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models.functions import Coalesce, TruncMonth
+
+
+def build_rollups(apps, schema_editor):
+    PaymentTransaction = apps.get_model("transactions", "PaymentTransaction")
+    CompanyRollup = apps.get_model("transactions", "CompanyRollup")
+    summary = (
+        PaymentTransaction.objects.filter(
+            models.Q(transaction__isnull=True)
+            | models.Q(transaction__is_deleted=False)
+        )
+        .values(
+            "payment_type",
+            company_id=models.F("source_id"),
+            product_id=models.F("transaction__product_id"),
+            period=TruncMonth("date", output_field=models.DateField()),
+            source_type=models.Case(
+                models.When(
+                    destination__farmer__isnull=False,
+                    then=models.Value("FARMER"),
+                ),
+                default=models.Value("COMPANY"),
+            ),
+            currency_code=Coalesce("currency__code", models.Value("")),
+        )
+        .annotate(
+            transaction_count=models.Count("id"),
+            quantity=Coalesce(
+                models.Sum(
+                    "transaction__quantity",
+                    filter=models.Q(payment_type="TRANSACTION"),
+                ),
+                models.Value(0),
+                output_field=models.DecimalField(
+                    max_digits=25, decimal_places=3
+                ),
+            ),
+            amount=Coalesce(models.Sum("amount"), models.Value(0.0)),
+        )
+        .order_by()
+    )
+    CompanyRollup.objects.bulk_create(
+        CompanyRollup(currency=row.pop("currency_code"), **row)
+        for row in summary.iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supply_chains', '0019_farmer_plot_validator'),
+        ('catalogs', '0007_alter_connectcard_card_id'),
+        ('transactions', '0009_basetransaction_verification_geohash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(verbose_name='Period')),
+                ('payment_type', models.CharField(choices=[('TRANSACTION', 'Transaction'), ('PREMIUM', 'Premium'), ('TRANSACTION_PREMIUM', 'Transaction Premium')], max_length=20, verbose_name='Payment Type')),
+                ('source_type', models.CharField(choices=[('FARMER', 'Farmer'), ('COMPANY', 'Company')], max_length=10, verbose_name='Source Type')),
+                ('currency', models.CharField(blank=True, default='', max_length=100, verbose_name='Currency')),
+                ('transaction_count', models.IntegerField(default=0, verbose_name='Transaction Count')),
+                ('quantity', models.DecimalField(decimal_places=3, default=0, max_digits=25, verbose_name='Quantity')),
+                ('amount', models.FloatField(default=0.0, verbose_name='Amount')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='supply_chains.entity', verbose_name='Company')),
+                ('product', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='catalogs.product', verbose_name='Product')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='companyrollup',
+            index=models.Index(fields=['company', 'period'], name='company_rollup_period_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='companyrollup',
+            constraint=models.UniqueConstraint(fields=('company', 'product', 'period', 'payment_type', 'source_type', 'currency'), name='unique_company_rollup'),
+        ),
+        migrations.AddConstraint(
+            model_name='companyrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('product__isnull', True)), fields=('company', 'period', 'payment_type', 'source_type', 'currency'), name='unique_company_rollup_without_product'),
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
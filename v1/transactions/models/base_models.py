@@ -6,6 +6,7 @@ from .. import constants
 from base.db.models import AbstractBaseModel
 from base.db.models import AbstractNumberedModel
 from base.db.utilities import get_file_path
+from utilities import geo
 from v1.catalogs.models.product_models import ConnectCard
 from v1.forms.models import Submission
 from v1.supply_chains.models.base_models import Entity
@@ -67,6 +68,9 @@ class BaseTransaction(AbstractBaseModel, AbstractNumberedModel):
     verification_longitude = models.FloatField(
         default=0.0, verbose_name=_("Verification Longitude")
     )
+    verification_geohash = models.CharField(
+        max_length=12, null=True, blank=True, editable=False
+    )
     method = models.CharField(
         max_length=15,
         null=True,
@@ -77,5 +81,21 @@ class BaseTransaction(AbstractBaseModel, AbstractNumberedModel):
         Submission, blank=True, verbose_name=_("Submissions")
     )
 
+    class Meta(AbstractBaseModel.Meta):
+        indexes = [
+            models.Index(
+                fields=["verification_geohash"],
+                name="transaction_geohash_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ]
+
     def __str__(self):
         return f"{self.source} -> {self.destination}"
+
+    def save(self, *args, **kwargs):
+        """Update the geohash of the verification location before saving."""
+        self.verification_geohash = geo.point_geohash(
+            self.verification_latitude, self.verification_longitude
+        )
+        super().save(*args, **kwargs)
@@ -1,10 +1,12 @@
 from django.db import models
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 
 from .. import constants
 from v1.catalogs.models.common_models import Currency
 from v1.catalogs.models.product_models import Premium
 from v1.transactions.models.base_models import BaseTransaction
+from v1.transactions.models.transaction_models import CompanyRollup
 from v1.transactions.models.transaction_models import ProductTransaction
 
 
@@ -74,12 +76,57 @@ class PaymentTransaction(BaseTransaction):
         verbose_name=_("Comment"),
     )
 
+    ROLLUP_FIELDS = (
+        "source_id",
+        "destination_id",
+        "transaction_id",
+        "payment_type",
+        "currency_id",
+        "date",
+        "amount",
+    )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the rolled up state of loaded payments."""
+        instance = super().from_db(db, field_names, values)
+        if set(cls.ROLLUP_FIELDS) <= set(field_names):
+            instance._rollup_state = instance.rollup_state()
+        return instance
+
     def save(self, **kwargs):
-        """save() override to pre and post save functions."""
+        """save() override to pre and post save functions.
+
+        The company rollups are updated with the changes of the payment in
+        the same database transaction.
+        """
         self._update_from_transaction()
         self._update_payment_status()
         self._update_verification_method()
-        super().save(**kwargs)
+        previous = None
+        if not self._state.adding:
+            previous = getattr(self, "_rollup_state", None)
+            if previous is None:
+                previous = (
+                    PaymentTransaction.objects.filter(pk=self.pk)
+                    .values_list(*self.ROLLUP_FIELDS)
+                    .first()
+                )
+        with transaction.atomic():
+            super().save(**kwargs)
+            self._rollup_state = self.rollup_state()
+            if self._rollup_state != previous:
+                deltas = CompanyRollup.deltas([self._rollup_state])
+                deltas.subtract(CompanyRollup.deltas([previous]))
+                CompanyRollup.apply(deltas)
+
+    def rollup_state(self):
+        """Return the state of the payment the company rollups depend on.
+
+        Returns:
+            tuple: The values of the ROLLUP_FIELDS.
+        """
+        return tuple(getattr(self, field) for field in self.ROLLUP_FIELDS)
 
     def _update_from_transaction(self):
         """To update payment_from and payment_to from the available
@@ -1,7 +1,16 @@
+from collections import Counter
+
+from django.db import IntegrityError
+from django.db import connection
 from django.db import models
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from v1.catalogs.models.common_models import Currency
 from v1.catalogs.models.product_models import Product
+from v1.supply_chains.models.base_models import Entity
 from v1.transactions import constants
 from v1.transactions.models.base_models import BaseTransaction
 
@@ -72,18 +81,76 @@ class ProductTransaction(BaseTransaction):
         default=False, verbose_name=_("Send seperately")
     )
 
+    ROLLUP_FIELDS = ("product_id", "quantity", "date", "is_deleted")
+
     def __str__(self):
         return f"{self.number}: {self.source} -> {self.destination}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the rolled up state of loaded transactions."""
+        instance = super().from_db(db, field_names, values)
+        if set(cls.ROLLUP_FIELDS) <= set(field_names):
+            instance._rollup_state = instance.rollup_state()
+        return instance
+
     def save(self, *args, **kwargs):
         """Save method for the model.
 
         This method updates the verification method before calling the
-        parent class's save method.
+        parent class's save method. The payments of the transaction are
+        moved in the company rollups when its product, quantity or date
+        changes, and removed or added back when it is soft deleted or
+        restored.
         """
         self._update_verification_method()
         self._set_base_price()
-        super().save(*args, **kwargs)
+        previous = getattr(self, "_rollup_state", None)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            current = self.rollup_state()
+            if previous is not None and previous != current:
+                self._update_rollups(previous, current)
+            self._rollup_state = current
+
+    def rollup_state(self):
+        """Return the state of the transaction the company rollups depend
+        on.
+
+        Returns:
+            tuple: The values of the ROLLUP_FIELDS.
+        """
+        return tuple(getattr(self, field) for field in self.ROLLUP_FIELDS)
+
+    def _update_rollups(self, previous, current):
+        """Move the payments of the transaction in the company rollups from
+        the previous state of the transaction to the current one.
+
+        The payments take the date of the transaction, as when they are
+        created.
+        """
+        old_states = [
+            payment.rollup_state()
+            for payment in self.transaction_payments.all()
+        ]
+        new_states = old_states
+        if previous[2] != current[2]:
+            self.transaction_payments.update(date=self.date)
+            new_states = [
+                state[:5] + (self.date,) + state[6:] for state in old_states
+            ]
+        pk = int(self.pk)
+        deltas = CompanyRollup.deltas(
+            new_states,
+            transactions={pk: (current[0], current[1], current[3])},
+        )
+        deltas.subtract(
+            CompanyRollup.deltas(
+                old_states,
+                transactions={pk: (previous[0], previous[1], previous[3])},
+            )
+        )
+        CompanyRollup.apply(deltas)
 
     def base_payment(self):
         """Base payment without any premium."""
@@ -136,3 +203,393 @@ class ProductTransaction(BaseTransaction):
         # if self.base_price == 0.0:
         #     self.base_price = self.amount / float(self.quantity)
         pass
+
+
+class TransactionLineage(models.Model):
+    """Transitive closure of the parents of product transactions.
+
+    There is a row for every transaction and each of its ancestors, with the
+    length of the shortest path between them, and a row of depth 0 for
+    every transaction and itself. The rows are maintained by the signals
+    of the transactions app when transactions are created, linked or
+    deleted, so that the whole lineage of a batch is read with a single
+    query regardless of its depth.
+
+    Attributes:
+        ancestor (ProductTransaction): The upstream transaction.
+        descendant (ProductTransaction): The downstream transaction.
+        depth (int): Number of links between the transactions.
+    """
+
+    ancestor = models.ForeignKey(
+        ProductTransaction,
+        on_delete=models.CASCADE,
+        related_name="descendant_links",
+        verbose_name=_("Ancestor"),
+    )
+    descendant = models.ForeignKey(
+        ProductTransaction,
+        on_delete=models.CASCADE,
+        related_name="ancestor_links",
+        verbose_name=_("Descendant"),
+    )
+    depth = models.PositiveIntegerField(default=0, verbose_name=_("Depth"))
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ancestor", "descendant"],
+                name="unique_transaction_lineage",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} -> {self.descendant_id} ({self.depth})"
+
+    @staticmethod
+    def _tables():
+        """Returns the table names used in the lineage queries."""
+        parents = ProductTransaction.parents.through._meta.db_table
+        return {
+            "lineage": TransactionLineage._meta.db_table,
+            "transactions": ProductTransaction._meta.db_table,
+            "pk": ProductTransaction._meta.pk.column,
+            "parents": parents,
+        }
+
+    @classmethod
+    def add_transactions(cls, transaction_ids):
+        """Add the rows of transactions to themselves."""
+        cls.objects.bulk_create(
+            [cls(ancestor_id=pk, descendant_id=pk) for pk in transaction_ids],
+            ignore_conflicts=True,
+        )
+
+    @classmethod
+    def link(cls, child_ids, parent_ids):
+        """Add the paths created by linking children to parents.
+
+        Every ancestor of the parents becomes an ancestor of every
+        descendant of the children, with a single INSERT.
+        """
+        child_ids = [int(pk) for pk in child_ids]
+        parent_ids = [int(pk) for pk in parent_ids]
+        cls.add_transactions(child_ids + parent_ids)
+        query = """
+            INSERT INTO {lineage} (ancestor_id, descendant_id, depth)
+            SELECT up.ancestor_id, down.descendant_id,
+                   MIN(up.depth + down.depth + 1)
+            FROM {lineage} up, {lineage} down
+            WHERE up.descendant_id = ANY(%s)
+              AND down.ancestor_id = ANY(%s)
+            GROUP BY up.ancestor_id, down.descendant_id
+            ON CONFLICT (ancestor_id, descendant_id)
+            DO UPDATE SET depth = LEAST({lineage}.depth, EXCLUDED.depth)
+        """.format(**cls._tables())
+        with connection.cursor() as cursor:
+            cursor.execute(query, [parent_ids, child_ids])
+
+    @classmethod
+    def descendant_ids(cls, transaction_ids):
+        """Returns the ids of the transactions and their descendants."""
+        return set(
+            cls.objects.filter(ancestor_id__in=transaction_ids).values_list(
+                "descendant_id", flat=True
+            )
+        ) | {int(pk) for pk in transaction_ids}
+
+    @classmethod
+    def rebuild(cls, transaction_ids=None):
+        """Rebuild the ancestors of transactions from the parents with a
+        recursive query.
+
+        Args:
+            transaction_ids: Ids of the transactions to rebuild, which
+                should include their descendants. All transactions are
+                rebuilt if None.
+        """
+        tables = cls._tables()
+        if transaction_ids is None:
+            cls.objects.all().delete()
+            condition, params = "", []
+        else:
+            transaction_ids = [int(pk) for pk in transaction_ids]
+            if not transaction_ids:
+                return
+            cls.objects.filter(descendant_id__in=transaction_ids).delete()
+            condition = "WHERE {pk} = ANY(%s)".format(**tables)
+            params = [transaction_ids]
+        query = """
+            WITH RECURSIVE up (descendant_id, ancestor_id, depth) AS (
+                SELECT {pk}, {pk}, 0 FROM {transactions} {condition}
+                UNION ALL
+                SELECT up.descendant_id, link.to_producttransaction_id,
+                       up.depth + 1
+                FROM up JOIN {parents} link
+                  ON link.from_producttransaction_id = up.ancestor_id
+            )
+            INSERT INTO {lineage} (ancestor_id, descendant_id, depth)
+            SELECT ancestor_id, descendant_id, MIN(depth) FROM up
+            GROUP BY ancestor_id, descendant_id
+        """.format(condition=condition, **tables)
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+
+    @classmethod
+    def relatives(cls, transaction_id, upstream=True):
+        """Returns the ancestors, or the descendants, of a transaction with
+        their depth.
+
+        The closure rows are used when the transaction has them, otherwise
+        the parents are walked with a recursive query.
+
+        Returns:
+            dict: Depth by transaction id, without the transaction itself.
+        """
+        transaction_id = int(transaction_id)
+        if upstream:
+            rows = cls.objects.filter(descendant_id=transaction_id)
+            rows = rows.values_list("ancestor_id", "depth")
+        else:
+            rows = cls.objects.filter(ancestor_id=transaction_id)
+            rows = rows.values_list("descendant_id", "depth")
+        relatives = {int(pk): depth for pk, depth in rows}
+        if transaction_id not in relatives:
+            relatives = cls._walk(transaction_id, upstream)
+        relatives.pop(transaction_id, None)
+        return relatives
+
+    @classmethod
+    def _walk(cls, transaction_id, upstream):
+        """Walk the parents, or the children, of a transaction with a
+        recursive query."""
+        child = "from_producttransaction_id"
+        parent = "to_producttransaction_id"
+        start, end = (child, parent) if upstream else (parent, child)
+        query = """
+            WITH RECURSIVE walk (id, depth) AS (
+                SELECT %s::bigint, 0
+                UNION ALL
+                SELECT link.{end}, walk.depth + 1
+                FROM walk JOIN {parents} link ON link.{start} = walk.id
+            )
+            SELECT id, MIN(depth) FROM walk GROUP BY id
+        """.format(start=start, end=end, **cls._tables())
+        with connection.cursor() as cursor:
+            cursor.execute(query, [transaction_id])
+            return dict(cursor.fetchall())
+
+
+class CompanyRollup(models.Model):
+    """Monthly totals of the payments made by a company.
+
+    There is a row per company, product, month, payment type, kind of
+    payee and currency. The rows are updated along with the payments and
+    the soft deletion of their transactions, so that dashboards over any
+    range of months sum a few rows instead of aggregating the payments.
+    They can be rebuilt with the rebuild_company_rollups script.
+
+    Attributes:
+        company (Entity): The company that made the payments.
+        product (Product): The product of the transactions paid for, None
+            for premiums paid without a transaction.
+        period (date): First day of the month of the payments.
+        payment_type (str): The PaymentType of the payments.
+        source_type (str): The RollupSourceType of the payees.
+        currency (str): Code of the currency of the payments.
+        transaction_count (int): Number of payments.
+        quantity (Decimal): Quantity bought, on the TRANSACTION rows.
+        amount (float): Amount paid.
+    """
+
+    company = models.ForeignKey(
+        Entity,
+        on_delete=models.CASCADE,
+        related_name="rollups",
+        verbose_name=_("Company"),
+    )
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="rollups",
+        verbose_name=_("Product"),
+    )
+    period = models.DateField(verbose_name=_("Period"))
+    payment_type = models.CharField(
+        max_length=20,
+        choices=constants.PaymentType.choices,
+        verbose_name=_("Payment Type"),
+    )
+    source_type = models.CharField(
+        max_length=10,
+        choices=constants.RollupSourceType.choices,
+        verbose_name=_("Source Type"),
+    )
+    currency = models.CharField(
+        max_length=100, blank=True, default="", verbose_name=_("Currency")
+    )
+    transaction_count = models.IntegerField(
+        default=0, verbose_name=_("Transaction Count")
+    )
+    quantity = models.DecimalField(
+        default=0,
+        max_digits=25,
+        decimal_places=3,
+        verbose_name=_("Quantity"),
+    )
+    amount = models.FloatField(default=0.0, verbose_name=_("Amount"))
+
+    KEY_FIELDS = (
+        "company_id",
+        "product_id",
+        "period",
+        "payment_type",
+        "source_type",
+        "currency",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "company",
+                    "product",
+                    "period",
+                    "payment_type",
+                    "source_type",
+                    "currency",
+                ],
+                name="unique_company_rollup",
+            ),
+            models.UniqueConstraint(
+                fields=[
+                    "company",
+                    "period",
+                    "payment_type",
+                    "source_type",
+                    "currency",
+                ],
+                condition=models.Q(product__isnull=True),
+                name="unique_company_rollup_without_product",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["company", "period"], name="company_rollup_period_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.company_id} - {self.period} | {self.payment_type}"
+
+    @staticmethod
+    def period_of(value):
+        """Returns the first day of the month of a datetime, in the current
+        time zone."""
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.date().replace(day=1)
+
+    @classmethod
+    def deltas(cls, states, transactions=None):
+        """Return the rollup increments of payments.
+
+        The payments of soft deleted transactions are not counted.
+
+        Args:
+            states: Rolled up states of payments, see
+                PaymentTransaction.rollup_state. None values are skipped.
+            transactions: Dict of the (product_id, quantity, is_deleted)
+                of transactions by id, used instead of their saved values.
+
+        Returns:
+            Counter: Increments keyed by the KEY_FIELDS values and the
+                field name.
+        """
+        deltas = Counter()
+        states = [state for state in states if state]
+        if not states:
+            return deltas
+        transactions = transactions or {}
+        transaction_ids = {
+            int(state[2]) for state in states if state[2]
+        } - set(transactions)
+        if transaction_ids:
+            transactions.update(
+                (int(pk), (product_id, quantity, is_deleted))
+                for pk, product_id, quantity, is_deleted in (
+                    ProductTransaction.objects.filter(
+                        pk__in=transaction_ids
+                    ).values_list(
+                        "pk", "product_id", "quantity", "is_deleted"
+                    )
+                )
+            )
+        farmer_ids = {
+            int(pk)
+            for pk in Entity.objects.filter(
+                pk__in={state[1] for state in states},
+                farmer__isnull=False,
+            ).values_list("pk", flat=True)
+        }
+        currencies = {
+            int(pk): code or ""
+            for pk, code in Currency.objects.filter(
+                pk__in={state[4] for state in states if state[4]}
+            ).values_list("pk", "code")
+        }
+        for state in states:
+            company_id, payee_id, transaction_id = state[:3]
+            payment_type, currency_id, date, amount = state[3:]
+            product_id, quantity, is_deleted = None, 0, False
+            if transaction_id:
+                product_id, quantity, is_deleted = transactions.get(
+                    int(transaction_id), (None, 0, False)
+                )
+            if is_deleted:
+                continue
+            key = (
+                int(company_id),
+                int(product_id) if product_id else None,
+                cls.period_of(date),
+                payment_type,
+                constants.RollupSourceType.FARMER
+                if int(payee_id) in farmer_ids
+                else constants.RollupSourceType.COMPANY,
+                currencies.get(int(currency_id), "") if currency_id else "",
+            )
+            deltas[key + ("transaction_count",)] += 1
+            deltas[key + ("amount",)] += amount or 0.0
+            if payment_type == constants.PaymentType.TRANSACTION:
+                deltas[key + ("quantity",)] += quantity or 0
+        return deltas
+
+    @classmethod
+    def apply(cls, deltas):
+        """Atomically add increments to the rollups, creating missing
+        rollups.
+
+        Args:
+            deltas(Counter): Increments as returned by deltas(). Negative
+                increments are applied too.
+        """
+        changes = {}
+        for key, delta in deltas.items():
+            if delta:
+                changes.setdefault(key[:-1], {})[key[-1]] = delta
+        for key, values in changes.items():
+            lookup = dict(zip(cls.KEY_FIELDS, key))
+            rollups = cls.objects.filter(**lookup)
+            increments = {
+                field: F(field) + delta for field, delta in values.items()
+            }
+            if rollups.update(**increments):
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(**lookup, **values)
+            except IntegrityError:
+                # Created concurrently.
+                rollups.update(**increments)
@@ -1,12 +1,15 @@
 from django.db import transaction
+from django.db.models import Sum
 from rest_framework import serializers
 
 from base.authentication import utilities as utils
 from base.drf import fields
 from base.drf.serializers import DynamicModelSerializer
 from utilities.functions import decode
+from utilities.functions import encode
 from v1.catalogs.models.common_models import Currency
 from v1.catalogs.models.product_models import PremiumOption
+from v1.catalogs.premiums import get_premium_engine
 from v1.catalogs.serializers.currency import CurrencySerializer
 from v1.catalogs.serializers.products import (
     ConnectCardSerializer, PremiumOptionSeriazer
@@ -16,7 +19,10 @@ from v1.catalogs.constants import PremiumCalculationType
 from v1.forms.serializers import SubmissionSerializer
 from v1.transactions import constants
 from v1.transactions.models.payment_models import PaymentTransaction
+from v1.supply_chains.models.farmer_models import Farmer
+from v1.transactions.models.transaction_models import CompanyRollup
 from v1.transactions.models.transaction_models import ProductTransaction
+from v1.transactions.models.transaction_models import TransactionLineage
 
 
 class PaymentTransactionsSerializer(DynamicModelSerializer):
@@ -38,6 +44,7 @@ class PaymentTransactionsSerializer(DynamicModelSerializer):
 
         model = PaymentTransaction
         fields = "__all__"
+        optimize = True
 
     def create(self, validated_data):
         """Create method for PaymentTransactionsSerializer.
@@ -117,6 +124,9 @@ class ProductTransactionSerializer(DynamicModelSerializer):
         max_digits=25, decimal_places=3, read_only=True
     )
     submissions = SubmissionSerializer(many=True, required=False)
+    calculate_premiums = serializers.BooleanField(
+        write_only=True, required=False, default=False
+    )
     card_details = ConnectCardSerializer(source="card", read_only=True)
     currency_details = CurrencySerializer(source="currency", read_only=True)
 
@@ -125,6 +135,7 @@ class ProductTransactionSerializer(DynamicModelSerializer):
 
         model = ProductTransaction
         fields = "__all__"
+        optimize = True
 
     def validate(self, data):
         """Validate method for ProductTransactionSerializer.
@@ -149,7 +160,10 @@ class ProductTransactionSerializer(DynamicModelSerializer):
         currency = validated_data.pop("currency")
         amount = validated_data.pop("amount")
         submissions = validated_data.pop("submissions", [])
+        calculate_premiums = validated_data.pop("calculate_premiums", False)
         instance = super().create(validated_data)
+        if calculate_premiums and not payments:
+            payments = self._calculate_premiums(instance, amount)
 
         try:
             currency = Currency.objects.get(id=currency)
@@ -191,6 +205,27 @@ class ProductTransactionSerializer(DynamicModelSerializer):
             payment_type=constants.PaymentType.TRANSACTION,
         )
 
+    @staticmethod
+    def _calculate_premiums(instance, amount):
+        """Derive the premium payments of a transaction with the premium
+        engine of the destination."""
+        engine = get_premium_engine(instance.destination_id)
+        premiums = engine.calculate(
+            [
+                {
+                    "product": instance.product_id,
+                    "quantity": instance.quantity,
+                    "amount": amount,
+                    "card": bool(instance.card_id),
+                    "source": instance.source_id,
+                }
+            ]
+        )[0]
+        return [
+            {"premium_id": item["premium"], "amount": item["amount"]}
+            for item in premiums
+        ]
+
     @staticmethod
     def _check_parents(data):
         """Check parents."""
@@ -209,3 +244,195 @@ class ProductTransactionSerializer(DynamicModelSerializer):
                         )
                     }
                 )
+
+
+class LineageTransactionSerializer(DynamicModelSerializer):
+    """Serializer for the transactions in the lineage of a batch, with
+    their distance from the batch."""
+
+    depth = serializers.SerializerMethodField()
+
+    class Meta:
+        """Meta class."""
+
+        model = ProductTransaction
+        fields = (
+            "id",
+            "number",
+            "date",
+            "product",
+            "quantity",
+            "source",
+            "destination",
+            "depth",
+        )
+
+    def get_depth(self, obj):
+        """Get method for the "depth" field."""
+        return self.context["depths"][int(obj.pk)]
+
+
+class TransactionLineageSerializer(serializers.Serializer):
+    """Serializer for the lineage of a transaction.
+
+    Returns the upstream and downstream transactions, the farmers of the
+    upstream transactions and the quantity they supplied, with a fixed
+    number of queries regardless of the depth of the lineage.
+    """
+
+    def to_representation(self, instance):
+        """Return the lineage of the transaction.
+
+        A lot reaches the transaction through every hop of its lineage, so
+        upstream_quantity and downstream_quantity only sum the direct
+        parents and children to count each lot once.
+        """
+        upstream = TransactionLineage.relatives(instance.pk)
+        downstream = TransactionLineage.relatives(instance.pk, upstream=False)
+        depths = {**upstream, **downstream}
+        transactions = ProductTransaction.objects.filter(
+            pk__in=list(depths), is_deleted=False
+        ).order_by("date")
+        upstream_txns = [t for t in transactions if int(t.pk) in upstream]
+        downstream_txns = [t for t in transactions if int(t.pk) in downstream]
+
+        supplied = {}
+        for txn in upstream_txns:
+            supplied[txn.source_id] = (
+                supplied.get(txn.source_id, 0) + (txn.quantity or 0)
+            )
+        farmers = Farmer.objects.filter(pk__in=list(supplied)).only(
+            "first_name", "last_name"
+        )
+        serializer = LineageTransactionSerializer
+        context = {"depths": depths}
+        return {
+            "id": instance.pk,
+            "upstream": serializer(
+                upstream_txns, many=True, context=context
+            ).data,
+            "downstream": serializer(
+                downstream_txns, many=True, context=context
+            ).data,
+            "farmers": [
+                {
+                    "id": farmer.pk,
+                    "name": farmer.name,
+                    "quantity": supplied[farmer.pk],
+                }
+                for farmer in farmers
+            ],
+            "upstream_quantity": sum(
+                t.quantity or 0
+                for t in upstream_txns
+                if upstream[int(t.pk)] == 1
+            ),
+            "downstream_quantity": sum(
+                t.quantity or 0
+                for t in downstream_txns
+                if downstream[int(t.pk)] == 1
+            ),
+        }
+
+
+class CompanyRollupSerializer(serializers.Serializer):
+    """Serializer to read the totals of the payments made by the current
+    entity from the company rollups.
+
+    The rollups are monthly, a date range selects the months containing
+    its dates. The totals are grouped by the fields listed in group_by.
+    """
+
+    GROUP_FIELDS = (
+        "product",
+        "period",
+        "payment_type",
+        "source_type",
+        "currency",
+    )
+
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    product = serializers.CharField(required=False)
+    payment_type = serializers.ChoiceField(
+        choices=constants.PaymentType.choices, required=False
+    )
+    source_type = serializers.ChoiceField(
+        choices=constants.RollupSourceType.choices, required=False
+    )
+    group_by = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        default="product,period,currency",
+    )
+
+    def validate_product(self, value):
+        """Decode the product id."""
+        try:
+            return decode(value)
+        except ValueError:
+            raise serializers.ValidationError("Invalid product.")
+
+    def validate_group_by(self, value):
+        """Returns the list of fields to group by."""
+        group_by = [field.strip() for field in value.split(",")]
+        group_by = [field for field in group_by if field]
+        invalid = set(group_by) - set(self.GROUP_FIELDS)
+        if invalid:
+            raise serializers.ValidationError(
+                f"Invalid fields {', '.join(sorted(invalid))}."
+            )
+        return group_by
+
+    def summary(self):
+        """Returns the totals of each group, summed from the rollups."""
+        data = self.validated_data
+        rollups = CompanyRollup.objects.filter(
+            company_id=utils.get_from_local("entity_id")
+        )
+        if "date_from" in data:
+            rollups = rollups.filter(
+                period__gte=data["date_from"].replace(day=1)
+            )
+        if "date_to" in data:
+            rollups = rollups.filter(period__lte=data["date_to"])
+        for field in ("product", "payment_type", "source_type"):
+            if field in data:
+                rollups = rollups.filter(**{field: data[field]})
+        totals = {
+            "transaction_count": Sum("transaction_count"),
+            "quantity": Sum("quantity"),
+            "amount": Sum("amount"),
+        }
+        group_by = data["group_by"]
+        if not group_by:
+            rows = [rollups.aggregate(**totals)]
+        else:
+            fields = list(group_by)
+            if "product" in group_by:
+                fields.append("product__name")
+            # Ordered by the product id, not by the ordering of products.
+            ordering = [
+                "product_id" if field == "product" else field
+                for field in group_by
+            ]
+            rows = (
+                rollups.values(*fields)
+                .annotate(**totals)
+                .order_by(*ordering)
+            )
+        summary = []
+        for row in rows:
+            if "product" in group_by:
+                product_id = row.pop("product")
+                row["product"] = {
+                    "id": encode(product_id) if product_id else None,
+                    "name": row.pop("product__name"),
+                }
+            if "period" in group_by:
+                row["period"] = row["period"].isoformat()
+            row["transaction_count"] = row["transaction_count"] or 0
+            row["quantity"] = float(row["quantity"] or 0)
+            row["amount"] = row["amount"] or 0.0
+            summary.append(row)
+        return summary
@@ -0,0 +1,76 @@
+"""Signals of the transactions app, maintaining the transaction lineage and
+the company rollups."""
+from collections import Counter
+
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from v1.transactions.models.payment_models import PaymentTransaction
+from v1.transactions.models.transaction_models import CompanyRollup
+from v1.transactions.models.transaction_models import ProductTransaction
+from v1.transactions.models.transaction_models import TransactionLineage
+
+
+@receiver(post_save, sender=ProductTransaction)
+def add_lineage(sender, instance, created, **kwargs):
+    """Add the lineage row of a new transaction to itself."""
+    if created:
+        TransactionLineage.add_transactions([instance.pk])
+
+
+@receiver(m2m_changed, sender=ProductTransaction.parents.through)
+def update_lineage(sender, instance, action, reverse, pk_set, **kwargs):
+    """Update the lineage when parents are linked or unlinked.
+
+    Added links only add paths. Removed links can remove paths that are
+    not known without the removed links, so the lineage of the affected
+    transactions is rebuilt.
+    """
+    if action == "post_add" and pk_set:
+        if reverse:
+            TransactionLineage.link(pk_set, [instance.pk])
+        else:
+            TransactionLineage.link([instance.pk], pk_set)
+    elif action in ("pre_remove", "pre_clear"):
+        if reverse:
+            children = pk_set or instance.children.values_list(
+                "pk", flat=True
+            )
+        else:
+            children = [instance.pk]
+        instance._lineage_affected = TransactionLineage.descendant_ids(
+            list(children)
+        )
+    elif action in ("post_remove", "post_clear"):
+        affected = getattr(instance, "_lineage_affected", None)
+        if affected:
+            TransactionLineage.rebuild(affected)
+            del instance._lineage_affected
+
+
+@receiver(pre_delete, sender=ProductTransaction)
+def collect_lineage(sender, instance, **kwargs):
+    """Collect the descendants of a transaction before it is deleted."""
+    instance._lineage_affected = TransactionLineage.descendant_ids(
+        [instance.pk]
+    ) - {int(instance.pk)}
+
+
+@receiver(post_delete, sender=ProductTransaction)
+def rebuild_lineage(sender, instance, **kwargs):
+    """Rebuild the lineage of the descendants of a deleted transaction."""
+    affected = getattr(instance, "_lineage_affected", None)
+    if affected:
+        TransactionLineage.rebuild(affected)
+
+
+@receiver(post_delete, sender=PaymentTransaction)
+def unroll_payment(sender, instance, **kwargs):
+    """Remove a deleted payment from the company rollups."""
+    state = getattr(instance, "_rollup_state", None)
+    deltas = Counter()
+    deltas.subtract(CompanyRollup.deltas([state or instance.rollup_state()]))
+    CompanyRollup.apply(deltas)
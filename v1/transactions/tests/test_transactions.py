@@ -1,6 +1,19 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
 from django.urls import reverse
+from mixer.backend.django import mixer
 
 from v1.accounts.tests.base import BaseTestCase
+from v1.transactions import constants
+from v1.transactions import exports
+from v1.transactions.exports import stream_geojson
+from v1.transactions.models.payment_models import PaymentTransaction
+from v1.transactions.models.transaction_models import CompanyRollup
+from v1.transactions.models.transaction_models import ProductTransaction
+from v1.transactions.models.transaction_models import TransactionLineage
+from v1.transactions.serializers import ProductTransactionSerializer
 
 
 class TransactionTestCase(BaseTestCase):
@@ -13,3 +26,165 @@ class TransactionTestCase(BaseTestCase):
         url = reverse("payment-transactions-list")
         response = self.client.get(url, **self.headers)
         self.assertEqual(response.status_code, 200)
+
+    def test_product_transaction_query_plan(self):
+        select, prefetch = ProductTransactionSerializer().get_query_plan()
+        self.assertIn("card", select)
+        # Only the key of the source is rendered, from its column.
+        self.assertNotIn("source", select)
+        self.assertIn("transaction_payments__premium", prefetch)
+        select, prefetch = ProductTransactionSerializer(
+            fields=("id", "number")
+        ).get_query_plan()
+        self.assertEqual((select, prefetch), ((), ()))
+
+    def test_transaction_lineage(self):
+        first, second, third = mixer.cycle(3).blend(
+            "transactions.ProductTransaction",
+            source=self.company,
+            destination=self.company,
+            creator=self.user,
+            is_deleted=False,
+        )
+        second.parents.add(first)
+        third.parents.add(second)
+        self.assertEqual(
+            TransactionLineage.relatives(third.pk),
+            {int(first.pk): 2, int(second.pk): 1},
+        )
+        self.assertEqual(
+            TransactionLineage.relatives(first.pk, upstream=False),
+            {int(second.pk): 1, int(third.pk): 2},
+        )
+        second.parents.remove(first)
+        self.assertEqual(
+            TransactionLineage.relatives(third.pk), {int(second.pk): 1}
+        )
+
+        url = reverse("product-transactions-lineage", args=(third.pk,))
+        response = self.client.get(url, **self.headers)
+        self.assertEqual(response.status_code, 200)
+
+    def test_lineage_quantities_count_each_lot_once(self):
+        first, second, third = mixer.cycle(3).blend(
+            "transactions.ProductTransaction",
+            source=self.company,
+            destination=self.company,
+            creator=self.user,
+            quantity=40,
+            is_deleted=False,
+        )
+        second.parents.add(first)
+        third.parents.add(second)
+
+        url = reverse("product-transactions-lineage", args=(third.pk,))
+        data = self.client.get(url, **self.headers).json()["data"]
+        self.assertEqual(data["upstream_quantity"], 40)
+        url = reverse("product-transactions-lineage", args=(first.pk,))
+        data = self.client.get(url, **self.headers).json()["data"]
+        self.assertEqual(data["downstream_quantity"], 40)
+
+    def test_upstream_geojson(self):
+        geometry = {
+            "type": "Polygon",
+            "coordinates": [[[10, 10], [10, 11], [11, 11], [10, 10]]],
+        }
+        farmer = mixer.blend(
+            "supply_chains.Farmer",
+            geo_json={"type": "Feature", "geometry": geometry},
+        )
+        mixer.blend(
+            "supply_chains.EntityBuyer",
+            entity=farmer,
+            buyer=self.company,
+            is_default=True,
+        )
+        purchase = mixer.blend(
+            "transactions.ProductTransaction",
+            source=farmer,
+            destination=self.company,
+            quantity=40,
+            is_deleted=False,
+        )
+        batch = mixer.blend(
+            "transactions.ProductTransaction",
+            source=self.company,
+            destination=self.company,
+            quantity=40,
+            is_deleted=False,
+        )
+        batch.parents.add(purchase)
+        collection = json.loads("".join(stream_geojson(batch)))
+        self.assertEqual(len(collection["features"]), 1)
+        feature = collection["features"][0]
+        self.assertEqual(feature["geometry"], geometry)
+        self.assertEqual(feature["properties"]["quantity"], 40.0)
+        self.assertEqual(feature["properties"]["share"], 1.0)
+
+    def test_geojson_export_status(self):
+        batch = mixer.blend(
+            "transactions.ProductTransaction",
+            source=self.company,
+            destination=self.company,
+            creator=self.user,
+            is_deleted=False,
+        )
+        cache.set(
+            exports.export_cache_key(batch.pk), "exports/geojson/a.geojson"
+        )
+        url = reverse("product-transactions-geojson-export", args=(batch.pk,))
+        response = self.client.get(url, **self.headers)
+        self.assertEqual(response.json()["data"]["status"], "ready")
+
+        with mock.patch.object(exports.export_upstream_geojson, "delay"):
+            response = self.client.post(url, **self.headers)
+        self.assertEqual(response.status_code, 202)
+        response = self.client.get(url, **self.headers)
+        self.assertEqual(response.json()["data"]["status"], "pending")
+
+    def test_company_rollups(self):
+        farmer = mixer.blend("supply_chains.Farmer")
+        mixer.blend(
+            "supply_chains.EntityBuyer",
+            entity=farmer,
+            buyer=self.company,
+            is_default=True,
+        )
+        purchase = mixer.blend(
+            "transactions.ProductTransaction",
+            source=farmer,
+            destination=self.company,
+            quantity=40,
+            is_deleted=False,
+        )
+        PaymentTransaction.objects.create(
+            transaction=purchase,
+            amount=100,
+            payment_type=constants.PaymentType.TRANSACTION,
+        )
+        rollup = CompanyRollup.objects.get(company=self.company)
+        self.assertEqual(rollup.product_id, purchase.product_id)
+        self.assertEqual(rollup.source_type, constants.RollupSourceType.FARMER)
+        self.assertEqual(rollup.transaction_count, 1)
+        self.assertEqual(rollup.quantity, 40)
+        self.assertEqual(rollup.amount, 100)
+
+        url = reverse("payment-transactions-rollups")
+        response = self.client.get(url, {"group_by": ""}, **self.headers)
+        self.assertEqual(response.status_code, 200)
+
+        # Editing the transaction moves its payments in the rollups, so
+        # that the soft deletion removes what is rolled up.
+        purchase = ProductTransaction.objects.get(pk=purchase.pk)
+        purchase.quantity = 55
+        purchase.save()
+        rollup.refresh_from_db()
+        self.assertEqual(rollup.quantity, 55)
+        self.assertEqual(rollup.transaction_count, 1)
+
+        purchase.is_deleted = True
+        purchase.save()
+        rollup.refresh_from_db()
+        self.assertEqual(rollup.transaction_count, 0)
+        self.assertEqual(rollup.quantity, 0)
+        self.assertEqual(rollup.amount, 0)
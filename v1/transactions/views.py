@@ -1,3 +1,5 @@
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.exceptions import MethodNotAllowed, ValidationError
@@ -5,12 +7,15 @@ from rest_framework.response import Response
 
 from base.request_handler.response import SuccessResponse
 from base.request_handler.views import IDDEcodeScopeViewset
+from v1.transactions import exports
 from v1.transactions.filters import (PaymentTransactionFilterSet,
                                      ProductTransactionFilterSet)
 from v1.transactions.models.payment_models import PaymentTransaction
 from v1.transactions.models.transaction_models import ProductTransaction
-from v1.transactions.serializers import (PaymentTransactionsSerializer,
-                                         ProductTransactionSerializer)
+from v1.transactions.serializers import (CompanyRollupSerializer,
+                                         PaymentTransactionsSerializer,
+                                         ProductTransactionSerializer,
+                                         TransactionLineageSerializer)
 
 # from rest_framework.response import Response
 
@@ -37,7 +42,7 @@ class ProductTransactionViewSet(IDDEcodeScopeViewset):
         queryset = ProductTransaction.objects.all()
         if not reverse_sync:
             queryset = queryset.filter(is_deleted=False)
-        return queryset
+        return self.optimize_queryset(queryset)
 
     @action(detail=True, methods=["patch"])
     def invoice(self, request, **kwargs):
@@ -65,6 +70,51 @@ class ProductTransactionViewSet(IDDEcodeScopeViewset):
             {"id": instance.id, "invoice": instance.invoice.url}
         )
 
+    @action(detail=True, methods=["get"])
+    def lineage(self, request, **kwargs):
+        """Custom action to get the lineage of a transaction.
+
+        Returns the upstream and downstream transactions, with the farmers
+        that supplied the upstream transactions.
+        """
+        instance = self.get_object()
+        return SuccessResponse(TransactionLineageSerializer(instance).data)
+
+    @action(detail=True, methods=["get"])
+    def geojson(self, request, **kwargs):
+        """Custom action to stream the plots of the farmers upstream of a
+        transaction as a GeoJSON FeatureCollection."""
+        instance = self.get_object()
+        response = StreamingHttpResponse(
+            exports.stream_geojson(instance),
+            content_type="application/geo+json",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{instance.number}.geojson"'
+        )
+        return response
+
+    @action(detail=True, methods=["get", "post"], url_path="geojson-export")
+    def geojson_export(self, request, **kwargs):
+        """Custom action to export the upstream plots of a transaction in the
+        background.
+
+        A POST starts the export, a GET returns the URL of the latest
+        export once it is ready.
+        """
+        instance = self.get_object()
+        if request.method == "POST":
+            # The previous export is stale once a new one is requested.
+            cache.delete(exports.export_cache_key(instance.pk))
+            exports.export_upstream_geojson.delay(instance.pk.id)
+            return SuccessResponse(
+                {"status": "pending"}, status=status.HTTP_202_ACCEPTED
+            )
+        url = exports.export_url(instance.pk)
+        return SuccessResponse(
+            {"status": "ready" if url else "pending", "url": url}
+        )
+
     def perform_destroy(self, instance):
         """Marks the given instance as deleted by setting the 'is_deleted'
         attribute to True and saving the instance.
@@ -113,6 +163,15 @@ class PaymentTransactionViewSet(IDDEcodeScopeViewset):
     resource_types = ["payment"]
     filterset_class = PaymentTransactionFilterSet
 
+    @action(detail=False, methods=["get"])
+    def rollups(self, request, **kwargs):
+        """Custom action to get the totals of the payments made by the
+        current entity, by product, month, payment type, payee type and
+        currency, read from the company rollups."""
+        serializer = CompanyRollupSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return SuccessResponse(serializer.summary())
+
     @action(detail=True, methods=["patch"])
     def invoice(self, request, **kwargs):
         """Custom action to upload invoice for a payment transaction.